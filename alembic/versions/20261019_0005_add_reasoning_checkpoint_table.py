@@ -0,0 +1,63 @@
+"""add reasoning checkpoint table
+
+Revision ID: 20261019_0005
+Revises: 20260219_0004
+Create Date: 2026-10-19 10:00:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261019_0005"
+down_revision = "20260219_0004"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    return table_name in set(inspector.get_table_names())
+
+
+def _index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if table_name not in set(inspector.get_table_names()):
+        return False
+    return any(idx.get("name") == index_name for idx in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    if not _table_exists("reasoning_checkpoint"):
+        op.create_table(
+            "reasoning_checkpoint",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("session_id", sa.String(length=64), sa.ForeignKey("reasoning_session.id"), nullable=False),
+            sa.Column("turn_id", sa.Integer(), sa.ForeignKey("reasoning_turn.id"), nullable=False),
+            sa.Column("checkpoint_id", sa.String(length=64), nullable=False),
+            sa.Column("resume_node", sa.String(length=64), nullable=False),
+            sa.Column("checkpoint_type", sa.String(length=32), nullable=False),
+            sa.Column("checkpoint_blob", sa.LargeBinary(), nullable=False),
+            sa.Column("metadata_type", sa.String(length=32), nullable=False),
+            sa.Column("metadata_blob", sa.LargeBinary(), nullable=False),
+            sa.Column("answer_json", sa.JSON(), nullable=False),
+            sa.Column("status", sa.String(length=32), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+    for column in ("session_id", "turn_id", "status"):
+        index_name = f"ix_reasoning_checkpoint_{column}"
+        if not _index_exists("reasoning_checkpoint", index_name):
+            op.create_index(index_name, "reasoning_checkpoint", [column])
+
+
+def downgrade() -> None:
+    for column in ("session_id", "turn_id", "status"):
+        index_name = f"ix_reasoning_checkpoint_{column}"
+        if _index_exists("reasoning_checkpoint", index_name):
+            op.drop_index(index_name, table_name="reasoning_checkpoint")
+    if _table_exists("reasoning_checkpoint"):
+        op.drop_table("reasoning_checkpoint")
@@ -0,0 +1,58 @@
+"""add reasoning context latest flag
+
+Revision ID: 20261019_0006
+Revises: 20261019_0005
+Create Date: 2026-10-19 12:00:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261019_0006"
+down_revision = "20261019_0005"
+branch_labels = None
+depends_on = None
+
+_INDEX_NAME = "ix_reasoning_context_latest"
+
+
+def _column_exists(table_name: str, column_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if table_name not in set(inspector.get_table_names()):
+        return False
+    return any(col.get("name") == column_name for col in inspector.get_columns(table_name))
+
+
+def _index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if table_name not in set(inspector.get_table_names()):
+        return False
+    return any(idx.get("name") == index_name for idx in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    if not _column_exists("reasoning_context", "is_latest"):
+        op.add_column(
+            "reasoning_context",
+            sa.Column("is_latest", sa.Boolean(), nullable=False, server_default=sa.true()),
+        )
+        # Only the newest row per (session_id, scope, key) stays flagged; the rest remain as history.
+        op.execute(
+            "UPDATE reasoning_context SET is_latest = FALSE "
+            "WHERE id NOT IN (SELECT latest.max_id FROM ("
+            "SELECT MAX(id) AS max_id FROM reasoning_context GROUP BY session_id, scope, key"
+            ") latest)"
+        )
+    if not _index_exists("reasoning_context", _INDEX_NAME):
+        op.create_index(_INDEX_NAME, "reasoning_context", ["session_id", "key", "is_latest"])
+
+
+def downgrade() -> None:
+    if _index_exists("reasoning_context", _INDEX_NAME):
+        op.drop_index(_INDEX_NAME, table_name="reasoning_context")
+    if _column_exists("reasoning_context", "is_latest"):
+        op.drop_column("reasoning_context", "is_latest")
@@ -0,0 +1,58 @@
+"""add trace payload codec and created_at index
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19 14:00:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261019_0007"
+down_revision = "20261019_0006"
+branch_labels = None
+depends_on = None
+
+_INDEX_NAME = "ix_reasoning_trace_event_created_at"
+
+
+def _column_exists(table_name: str, column_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if table_name not in set(inspector.get_table_names()):
+        return False
+    return any(col.get("name") == column_name for col in inspector.get_columns(table_name))
+
+
+def _index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if table_name not in set(inspector.get_table_names()):
+        return False
+    return any(idx.get("name") == index_name for idx in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    if not _column_exists("reasoning_trace_event", "payload_codec"):
+        op.add_column("reasoning_trace_event", sa.Column("payload_codec", sa.String(length=16), nullable=True))
+    if not _column_exists("reasoning_trace_event", "payload_blob"):
+        op.add_column("reasoning_trace_event", sa.Column("payload_blob", sa.LargeBinary(), nullable=True))
+    if not _index_exists("reasoning_trace_event", _INDEX_NAME):
+        # Rows are append-only in created_at order, so BRIN gives range pruning at a fraction of btree size.
+        op.create_index(
+            _INDEX_NAME,
+            "reasoning_trace_event",
+            ["created_at"],
+            postgresql_using="brin",
+        )
+
+
+def downgrade() -> None:
+    if _index_exists("reasoning_trace_event", _INDEX_NAME):
+        op.drop_index(_INDEX_NAME, table_name="reasoning_trace_event")
+    if _column_exists("reasoning_trace_event", "payload_blob"):
+        op.drop_column("reasoning_trace_event", "payload_blob")
+    if _column_exists("reasoning_trace_event", "payload_codec"):
+        op.drop_column("reasoning_trace_event", "payload_codec")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+
+    _BROTLI_IMPORT_ERROR = None
+except Exception:
+    brotli = None
+    _BROTLI_IMPORT_ERROR = "brotli dependency is required for br-encoded responses"
+
+# Preference order when a client accepts several.
+SUPPORTED_ENCODINGS = ("gzip",) if _BROTLI_IMPORT_ERROR else ("br", "gzip")
+_COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "application/x-msgpack", "text/", "application/javascript")
+# Incremental bodies that must reach the client chunk by chunk, even though "text/" matches them.
+_STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def accepted_encodings(header: str | None) -> set[str]:
+    accepted = set()
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        if params.replace(" ", "").lower() in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def preferred_encoding(header: str | None) -> str | None:
+    accepted = accepted_encodings(header)
+    return next((name for name in SUPPORTED_ENCODINGS if name in accepted), None)
+
+
+def compress_body(raw: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == "br":
+        return brotli.compress(raw, quality=min(max(level, 0), 11))
+    return gzip.compress(raw, compresslevel=min(max(level, 1), 9), mtime=0)
+
+
+class CompressionMiddleware:
+    # Compresses JSON/text responses under `path_prefix`. Those bodies are built in memory anyway,
+    # so chunks are collected and compressed once; other types (NDJSON trace exports, SSE runs)
+    # are passed through untouched so clients keep receiving them incrementally.
+    def __init__(self, app, path_prefix: str, minimum_size: int = 1024, level: int = 6):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.minimum_size = max(int(minimum_size), 0)
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        encoding = preferred_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "chunks": [], "passthrough": False}
+
+        async def send_compressed(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = (headers.get("content-type") or "").lower()
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(_COMPRESSIBLE_TYPES)
+                    or content_type.startswith(_STREAMING_TYPES)
+                ):
+                    state["passthrough"] = True
+                    await send(message)
+                else:
+                    state["start"] = message
+                return
+            if state["passthrough"] or message["type"] != "http.response.body" or state["start"] is None:
+                await send(message)
+                return
+            state["chunks"].append(message.get("body", b""))
+            if message.get("more_body"):
+                return
+            start = state["start"]
+            state["start"] = None
+            body = b"".join(state["chunks"])
+            state["chunks"] = []
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) >= self.minimum_size:
+                body = compress_body(body, encoding, self.level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from threading import Lock
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.app.api.compression import SUPPORTED_ENCODINGS, compress_body, preferred_encoding
+from src.app.core.config import settings
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches.
+    return any(item.strip().removeprefix("W/") == etag for item in header.split(","))
+
+
+class StaticAsset:
+    # Encoded variants are built once per file version; the file is only re-read after its
+    # mtime or size changes, so a deploy that rewrites the HTML is picked up without a restart.
+    def __init__(self, path: Path, media_type: str = "text/html; charset=utf-8"):
+        self.path = path
+        self.media_type = media_type
+        self._lock = Lock()
+        self._stamp = None
+        self._digest = ""
+        self._variants: dict[str, bytes] = {}
+
+    def _load(self) -> tuple[str, dict[str, bytes]]:
+        stat = self.path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamp != self._stamp:
+                raw = self.path.read_bytes()
+                variants = {"identity": raw}
+                for encoding in SUPPORTED_ENCODINGS:
+                    variants[encoding] = compress_body(raw, encoding, 11 if encoding == "br" else 9)
+                self._digest = hashlib.sha256(raw).hexdigest()[:32]
+                self._variants = variants
+                self._stamp = stamp
+            return self._digest, self._variants
+
+    def response(self, request: Request) -> Response:
+        digest, variants = self._load()
+        encoding = preferred_encoding(request.headers.get("accept-encoding")) or "identity"
+        # Each encoded body gets its own strong validator; the bytes differ per encoding.
+        etag = f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+        max_age = int(settings.console_asset_max_age_seconds)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=variants[encoding], media_type=self.media_type, headers=headers)
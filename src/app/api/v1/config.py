@@ -7,6 +7,7 @@ from src.app.infra.db.session import get_db
 from src.app.schemas.config import (
     LangfuseConfigUpdateRequest,
     TenantSearchConfigUpdateRequest,
+    TenantTraceRetentionConfigUpdateRequest,
     TenantLLMConfigUpsertRequest,
     TenantLLMConfigVerifyRequest,
 )
@@ -14,6 +15,7 @@ from src.app.services.active_tenant_service import ActiveTenantService
 from src.app.services.observability.langfuse_config_service import LangfuseConfigService
 from src.app.services.tenant_runtime_config_service import TenantRuntimeConfigService
 from src.app.services.tenant_llm_config_service import TenantLLMConfigService
+from src.app.services.trace_retention_service import TraceRetentionService
 
 router = APIRouter(prefix="/config", tags=["config"], dependencies=[Depends(require_auth)])
 
@@ -90,6 +92,37 @@ def update_tenant_search_config(
     return build_response(request, data)
 
 
+@router.get("/tenant-trace-retention")
+def get_tenant_trace_retention_config(
+    request: Request,
+    tenant_id: str = Depends(get_tenant_id),
+    db: Session = Depends(get_db),
+):
+    data = TenantRuntimeConfigService(db).get_trace_retention_config(tenant_id)
+    return build_response(request, data)
+
+
+@router.put("/tenant-trace-retention")
+def update_tenant_trace_retention_config(
+    req: TenantTraceRetentionConfigUpdateRequest,
+    request: Request,
+    tenant_id: str = Depends(get_tenant_id),
+    db: Session = Depends(get_db),
+):
+    data = TenantRuntimeConfigService(db).upsert_trace_retention_config(tenant_id, req.model_dump(exclude_none=True))
+    return build_response(request, data)
+
+
+@router.post("/tenant-trace-retention/run")
+def run_tenant_trace_retention(
+    request: Request,
+    tenant_id: str = Depends(get_tenant_id),
+    db: Session = Depends(get_db),
+):
+    data = TraceRetentionService(db).run(tenant_id)
+    return build_response(request, data)
+
+
 @router.get("/active-tenants")
 def list_active_tenants(
     request: Request,
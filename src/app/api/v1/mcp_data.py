@@ -2,7 +2,7 @@
 from sqlalchemy.orm import Session
 
 from src.app.api.deps import get_tenant_id, require_auth
-from src.app.core.response import build_response
+from src.app.core.response import build_response, negotiated_response
 from src.app.infra.db.session import get_db
 from src.app.schemas.mcp_data import DataQueryRequest, GroupAnalysisRequest
 from src.app.services.mcp_data_service import MCPDataService
@@ -18,7 +18,7 @@ def query_data(
     db: Session = Depends(get_db),
 ):
     data = MCPDataService(db).query(tenant_id=tenant_id, payload=req.model_dump())
-    return build_response(request, data)
+    return negotiated_response(request, build_response(request, data))
 
 
 @router.post("/group-analysis")
@@ -29,4 +29,4 @@ def group_analysis(
     db: Session = Depends(get_db),
 ):
     data = MCPDataService(db).group_analysis(tenant_id=tenant_id, payload=req.model_dump())
-    return build_response(request, data)
+    return negotiated_response(request, build_response(request, data))
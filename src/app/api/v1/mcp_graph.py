@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
 from src.app.api.deps import get_tenant_id, require_auth
-from src.app.core.response import build_response
+from src.app.core.response import build_response, negotiated_response
 from src.app.infra.db.session import get_db
 from src.app.schemas.mcp_graph import MCPGraphToolCallRequest
 from src.app.services.mcp_graph_service import MCPGraphService
@@ -11,8 +11,9 @@ router = APIRouter(prefix="/mcp/graph", tags=["mcp-graph"], dependencies=[Depend
 
 
 @router.post("/tools:list")
-def list_tools(request: Request, _tenant_id: str = Depends(get_tenant_id), db: Session = Depends(get_db)):
-    data = {"tools": MCPGraphService(db).list_tools()}
+async def list_tools(request: Request, _tenant_id: str = Depends(get_tenant_id)):
+    # Static tool catalogue: no session, no threadpool hop.
+    data = {"tools": MCPGraphService.list_tools()}
     return build_response(request, data)
 
 
@@ -29,5 +30,5 @@ def call_tool(
         "content": [{"type": "json", "json": result}],
         "isError": False,
     }
-    return build_response(request, data)
+    return negotiated_response(request, build_response(request, data))
 
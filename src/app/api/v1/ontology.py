@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 
 from src.app.api.deps import get_tenant_id, require_auth
 from src.app.core.response import build_response
+from src.app.infra.db.async_session import get_async_db
 from src.app.infra.db.session import get_db
+from src.app.repositories.ontology_repo import AsyncOntologyRepository
 from src.app.schemas.ontology import (
     BindCapabilitiesRequest,
     BackfillEmbeddingsRequest,
@@ -23,6 +25,7 @@ from src.app.schemas.ontology import (
     UpdateObjectPropertyRequest,
     UpsertClassFieldMappingRequest,
     UpsertClassTableBindingRequest,
+    WarmHybridSearchRequest,
 )
 from src.app.services.ontology_service import OntologyService
 
@@ -36,13 +39,13 @@ def create_class(req: CreateClassRequest, request: Request, tenant_id: str = Dep
 
 
 @router.get("/classes")
-def list_classes(
+async def list_classes(
     request: Request,
     status: int | None = Query(1),
     tenant_id: str = Depends(get_tenant_id),
-    db: Session = Depends(get_db),
+    db=Depends(get_async_db),
 ):
-    items = OntologyService(db).list_classes(tenant_id, status)
+    items = await AsyncOntologyRepository(db).list_classes(tenant_id, status)
     data = [
         {"id": item.id, "code": item.code, "name": item.name, "description": item.description, "status": item.status}
         for item in items
@@ -104,6 +107,29 @@ def hybrid_search(
     return build_response(request, data)
 
 
+@router.post("/hybrid-search:warmup")
+def warm_hybrid_search(
+    req: WarmHybridSearchRequest,
+    request: Request,
+    tenant_id: str = Depends(get_tenant_id),
+    db: Session = Depends(get_db),
+):
+    data = OntologyService(db).warm_hybrid_search(
+        tenant_id,
+        req.queries,
+        req.resource_types,
+        min_prefix_chars=req.min_prefix_chars,
+        max_entries=req.max_entries,
+        top_k=req.top_k,
+    )
+    return build_response(request, data)
+
+
+@router.get("/hybrid-search/cache-stats")
+async def hybrid_search_cache_stats(request: Request, _tenant_id: str = Depends(get_tenant_id)):
+    return build_response(request, OntologyService.hybrid_search_cache_stats())
+
+
 @router.post("/classes/{class_id}/inheritance")
 def create_inheritance(
     class_id: int,
@@ -131,8 +157,8 @@ def create_global_attribute(
 
 
 @router.get("/data-attributes")
-def list_global_attributes(request: Request, tenant_id: str = Depends(get_tenant_id), db: Session = Depends(get_db)):
-    items = OntologyService(db).list_global_attributes(tenant_id)
+async def list_global_attributes(request: Request, tenant_id: str = Depends(get_tenant_id), db=Depends(get_async_db)):
+    items = await AsyncOntologyRepository(db).list_all_attributes(tenant_id)
     data = [{"id": i.id, "code": i.code, "name": i.name, "data_type": i.data_type, "description": i.description} for i in items]
     return build_response(request, {"items": data, "total": len(data)})
 
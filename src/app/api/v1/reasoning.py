@@ -1,8 +1,10 @@
-﻿from fastapi import APIRouter, Depends, Request
+﻿from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from src.app.api.deps import get_tenant_id, require_auth
-from src.app.core.response import build_response
+from src.app.core.response import build_response, negotiated_response
+from src.app.infra.db.async_session import get_async_db
 from src.app.infra.db.session import get_db
 from src.app.schemas.reasoning import (
     CancelReasoningSessionRequest,
@@ -10,7 +12,9 @@ from src.app.schemas.reasoning import (
     CreateReasoningSessionRequest,
     RunReasoningSessionRequest,
 )
+from src.app.services.reasoning_read_service import ReasoningReadService
 from src.app.services.reasoning_service import ReasoningService
+from src.app.services.reasoning_stream import ReasoningRunStream, stream_trace_ndjson
 
 router = APIRouter(prefix="/reasoning", tags=["reasoning"], dependencies=[Depends(require_auth)])
 
@@ -32,14 +36,14 @@ def create_session(
 
 
 @router.get("/sessions/{session_id}")
-def get_session(
+async def get_session(
     session_id: str,
     request: Request,
     tenant_id: str = Depends(get_tenant_id),
-    db: Session = Depends(get_db),
+    db=Depends(get_async_db),
 ):
-    data = ReasoningService(db).get_session(tenant_id=tenant_id, session_id=session_id)
-    return build_response(request, data)
+    data = await ReasoningReadService(db).get_session(tenant_id=tenant_id, session_id=session_id)
+    return negotiated_response(request, build_response(request, data))
 
 
 @router.post("/sessions/{session_id}/run")
@@ -59,6 +63,28 @@ def run_session(
     return build_response(request, data)
 
 
+@router.get("/sessions/{session_id}/run:stream")
+def stream_run_session(
+    session_id: str,
+    request: Request,
+    user_input: str | None = Query(default=None, min_length=1, max_length=8000),
+    tenant_id: str = Depends(get_tenant_id),
+    db: Session = Depends(get_db),
+):
+    stream = ReasoningRunStream.start(
+        db,
+        tenant_id=tenant_id,
+        session_id=session_id,
+        user_input=user_input,
+        trace_id=getattr(request.state, "trace_id", None),
+    )
+    return StreamingResponse(
+        stream.iter_sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/sessions/{session_id}/clarify")
 def clarify_session(
     session_id: str,
@@ -77,14 +103,76 @@ def clarify_session(
 
 
 @router.get("/sessions/{session_id}/trace")
-def get_trace(
+async def get_trace(
+    session_id: str,
+    request: Request,
+    tenant_id: str = Depends(get_tenant_id),
+    db=Depends(get_async_db),
+):
+    data = await ReasoningReadService(db).list_trace(tenant_id=tenant_id, session_id=session_id)
+    return negotiated_response(request, build_response(request, data))
+
+
+@router.get("/sessions/{session_id}/trace/events")
+async def page_trace_events(
     session_id: str,
     request: Request,
+    after_id: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=500),
+    step: list[str] | None = Query(default=None),
+    event_type: list[str] | None = Query(default=None),
+    turn_id: int | None = Query(default=None),
+    fields: str | None = Query(default=None, max_length=256),
+    tenant_id: str = Depends(get_tenant_id),
+    db=Depends(get_async_db),
+):
+    data = await ReasoningReadService(db).page_trace(
+        tenant_id=tenant_id,
+        session_id=session_id,
+        after_id=after_id,
+        limit=limit,
+        steps=step,
+        event_types=event_type,
+        turn_id=turn_id,
+        fields=fields,
+    )
+    return negotiated_response(request, build_response(request, data))
+
+
+@router.get("/sessions/{session_id}/trace/events:stream")
+def stream_trace_events(
+    session_id: str,
+    after_id: int = Query(default=0, ge=0),
+    step: list[str] | None = Query(default=None),
+    event_type: list[str] | None = Query(default=None),
+    turn_id: int | None = Query(default=None),
+    fields: str | None = Query(default=None, max_length=256),
     tenant_id: str = Depends(get_tenant_id),
     db: Session = Depends(get_db),
 ):
-    data = ReasoningService(db).list_trace(tenant_id=tenant_id, session_id=session_id)
-    return build_response(request, data)
+    lines = stream_trace_ndjson(
+        db,
+        tenant_id=tenant_id,
+        session_id=session_id,
+        fields=fields,
+        after_id=after_id,
+        steps=step,
+        event_types=event_type,
+        turn_id=turn_id,
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get("/sessions/{session_id}/trace/events/{event_id}")
+async def get_trace_event(
+    session_id: str,
+    event_id: int,
+    request: Request,
+    tenant_id: str = Depends(get_tenant_id),
+    db=Depends(get_async_db),
+):
+    data = await ReasoningReadService(db).get_trace_event(tenant_id=tenant_id, session_id=session_id, event_id=event_id)
+    return negotiated_response(request, build_response(request, data))
 
 
 @router.post("/sessions/{session_id}/cancel")
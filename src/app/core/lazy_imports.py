@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from threading import Lock
+
+# Heavy SDKs are imported on first use instead of at module import time; the
+# first import of each is timed so the startup report can show what it cost.
+DEFERRED_MODULES = ("langchain_openai", "langchain_core", "langgraph", "langfuse")
+
+_lock = Lock()
+_timings_ms: dict[str, float] = {}
+
+
+def timed_import(name: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed_ms = round((time.perf_counter() - started) * 1000.0, 1)
+    with _lock:
+        _timings_ms.setdefault(name, elapsed_ms)
+    return module
+
+
+def import_timings() -> dict[str, float]:
+    with _lock:
+        return dict(_timings_ms)
+
+
+def loaded_deferred_modules() -> list[str]:
+    return [name for name in DEFERRED_MODULES if name in sys.modules]
@@ -1,4 +1,27 @@
+import json
+from datetime import date, time
+from decimal import Decimal
+
 from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+
+    _ORJSON_IMPORT_ERROR = None
+except Exception:
+    orjson = None
+    _ORJSON_IMPORT_ERROR = "orjson dependency is required for fast JSON responses"
+
+try:
+    import ormsgpack
+
+    _MSGPACK_IMPORT_ERROR = None
+except Exception:
+    ormsgpack = None
+    _MSGPACK_IMPORT_ERROR = "ormsgpack dependency is required for msgpack responses"
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
 
 
 def build_response(request: Request, data=None, code: int = 0, message: str = "ok"):
@@ -8,3 +31,54 @@ def build_response(request: Request, data=None, code: int = 0, message: str = "o
         "data": data if data is not None else {},
         "trace_id": getattr(request.state, "trace_id", ""),
     }
+
+
+def _default(value):
+    # Mirrors what jsonable_encoder would have produced for the types our services return.
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def dumps_json(content) -> bytes:
+    if not _ORJSON_IMPORT_ERROR:
+        try:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder handles them.
+            pass
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+
+class MsgpackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content) -> bytes:
+        return ormsgpack.packb(content, default=_default, option=ormsgpack.OPT_NON_STR_KEYS)
+
+
+def accepts_msgpack(request: Request) -> bool:
+    if _MSGPACK_IMPORT_ERROR:
+        return False
+    accept = (request.headers.get("accept") or "").lower()
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def negotiated_response(request: Request, payload: dict, status_code: int = 200) -> Response:
+    # Returning a Response directly skips FastAPI's jsonable_encoder pass over large payloads.
+    if accepts_msgpack(request):
+        return MsgpackResponse(payload, status_code=status_code, headers={"Vary": "Accept"})
+    return FastJSONResponse(payload, status_code=status_code, headers={"Vary": "Accept"})
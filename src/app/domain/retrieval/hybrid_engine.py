@@ -1,3 +1,6 @@
+import heapq
+from operator import itemgetter
+
 from sqlalchemy import Text as SAText, bindparam, text
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import SQLAlchemyError
@@ -68,32 +71,71 @@ class HybridRetrievalEngine:
         return output
 
     @classmethod
-    def score_records(
+    def _iter_scores(
         cls,
         query: str,
         records: list[dict],
-        w_sparse: float = 0.45,
-        w_dense: float = 0.55,
-        sparse_overrides: list[float] | None = None,
-    ) -> list[dict]:
+        w_sparse: float,
+        w_dense: float,
+        sparse_overrides: list[float] | None,
+    ):
+        # Yields (score, index) pairs so callers decide which records are worth copying.
         normalized_query = preprocess_query(query)
         query_embedding = EmbeddingService.embed(normalized_query)
-
-        scored = []
+        override_count = len(sparse_overrides) if sparse_overrides is not None else 0
         for idx, item in enumerate(records):
-            text = item.get("search_text") or item.get("name") or ""
-            embedding = item.get("embedding") or []
             sparse = (
                 max(float(sparse_overrides[idx]), 0.0)
-                if sparse_overrides is not None and idx < len(sparse_overrides)
-                else sparse_score(normalized_query, text)
+                if idx < override_count
+                else sparse_score(normalized_query, item.get("search_text") or item.get("name") or "")
             )
-            dense = cosine_similarity(query_embedding, embedding)
-            score = hybrid_score(sparse, dense, w_sparse=w_sparse, w_dense=w_dense)
-            scored.append({**item, "score": round(score, 6)})
+            dense = cosine_similarity(query_embedding, item.get("embedding") or [])
+            yield round(hybrid_score(sparse, dense, w_sparse=w_sparse, w_dense=w_dense), 6), idx
+
+    @classmethod
+    def score_records(
+        cls,
+        query: str,
+        records: list[dict],
+        w_sparse: float = 0.45,
+        w_dense: float = 0.55,
+        sparse_overrides: list[float] | None = None,
+    ) -> list[dict]:
+        scored = [
+            {**records[idx], "score": score}
+            for score, idx in cls._iter_scores(query, records, w_sparse, w_dense, sparse_overrides)
+        ]
         scored.sort(key=lambda x: x["score"], reverse=True)
         return scored
 
+    @classmethod
+    def top_scored_records(
+        cls,
+        query: str,
+        records: list[dict],
+        top_n: int,
+        score_gap: float = 0.0,
+        relative_diff: float = 0.0,
+        w_sparse: float = 0.45,
+        w_dense: float = 0.55,
+        sparse_overrides: list[float] | None = None,
+    ) -> list[dict]:
+        # Same result as score_records + apply_top_n_and_gap: the gap and relative cut-offs only
+        # ever shorten the sorted head, so the top_n best scores are all they need. nlargest
+        # keeps a bounded heap (ties stay in input order) and only the winners are copied.
+        limit = max(1, int(top_n))
+        best = heapq.nlargest(
+            limit,
+            cls._iter_scores(query, records, w_sparse, w_dense, sparse_overrides),
+            key=itemgetter(0),
+        )
+        return cls.apply_top_n_and_gap(
+            [{**records[idx], "score": score} for score, idx in best],
+            top_n=limit,
+            score_gap=score_gap,
+            relative_diff=relative_diff,
+        )
+
     @classmethod
     def score_attributes(
         cls,
@@ -0,0 +1,86 @@
+import asyncio
+from threading import Lock
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import make_url
+
+from src.app.core.config import settings
+from src.app.infra.db.session import SessionLocal
+
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _ASYNC_IMPORT_ERROR = None
+except Exception:
+    async_sessionmaker = None
+    create_async_engine = None
+    _ASYNC_IMPORT_ERROR = "sqlalchemy[asyncio] (greenlet) is required for the async database layer"
+
+_lock = Lock()
+_state = {"resolved": False, "engine": None, "factory": None}
+
+
+def async_database_url(database_url: str):
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = url.get_driver_name()
+    if backend == "postgresql" and driver in {"psycopg", "psycopg_async"}:
+        return url.set(drivername="postgresql+psycopg_async")
+    if backend == "sqlite" and driver == "aiosqlite":
+        return url
+    return None
+
+
+def _async_session_factory():
+    if _state["resolved"]:
+        return _state["factory"]
+    with _lock:
+        if not _state["resolved"]:
+            url = async_database_url(settings.database_url)
+            if settings.database_async_enabled and url is not None and not _ASYNC_IMPORT_ERROR:
+                engine = create_async_engine(url, pool_pre_ping=True)
+                _state["engine"] = engine
+                _state["factory"] = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+            _state["resolved"] = True
+    return _state["factory"]
+
+
+class ThreadedAsyncSession:
+    # Used when the configured driver has no async dialect (e.g. pysqlite): the same
+    # `run_sync` surface as AsyncSession, backed by a sync session on the threadpool.
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+def _loop_supports_async_driver() -> bool:
+    # psycopg's async mode needs a selector loop; Windows defaults to ProactorEventLoop
+    # (start_system.bat runs uvicorn that way), so those requests use the threadpool session.
+    proactor = getattr(asyncio, "ProactorEventLoop", None)
+    return proactor is None or not isinstance(asyncio.get_running_loop(), proactor)
+
+
+async def get_async_db():
+    factory = _async_session_factory() if _loop_supports_async_driver() else None
+    db = factory() if factory is not None else ThreadedAsyncSession(SessionLocal())
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def dispose_async_engine() -> None:
+    engine = _state["engine"]
+    if engine is not None:
+        await engine.dispose()
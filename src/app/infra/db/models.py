@@ -1,6 +1,18 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, SmallInteger, String, Text, UniqueConstraint
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.app.infra.db.base import Base
@@ -301,6 +313,7 @@ class ReasoningTask(Base):
 
 class ReasoningContext(Base):
     __tablename__ = "reasoning_context"
+    __table_args__ = (Index("ix_reasoning_context_latest", "session_id", "key", "is_latest"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     session_id: Mapped[str] = mapped_column(ForeignKey("reasoning_session.id"), nullable=False, index=True)
@@ -308,11 +321,15 @@ class ReasoningContext(Base):
     key: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     value_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
     version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    is_latest: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=now, nullable=False)
 
 
 class ReasoningTraceEvent(Base):
     __tablename__ = "reasoning_trace_event"
+    # created_at grows with id, so a BRIN index on PostgreSQL stays tiny and keeps
+    # retention range scans cheap; other dialects fall back to a btree.
+    __table_args__ = (Index("ix_reasoning_trace_event_created_at", "created_at", postgresql_using="brin"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     session_id: Mapped[str] = mapped_column(ForeignKey("reasoning_session.id"), nullable=False, index=True)
@@ -320,6 +337,9 @@ class ReasoningTraceEvent(Base):
     step: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     event_type: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     payload_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    # Large payloads live compressed in payload_blob; payload_json then only keeps a stub.
+    payload_codec: Mapped[str | None] = mapped_column(String(16))
+    payload_blob: Mapped[bytes | None] = mapped_column(LargeBinary)
     trace_id: Mapped[str | None] = mapped_column(String(64), index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=now, nullable=False)
 
@@ -337,6 +357,24 @@ class ReasoningClarification(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=now, onupdate=now, nullable=False)
 
 
+class ReasoningCheckpoint(Base):
+    __tablename__ = "reasoning_checkpoint"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(ForeignKey("reasoning_session.id"), nullable=False, index=True)
+    turn_id: Mapped[int] = mapped_column(ForeignKey("reasoning_turn.id"), nullable=False, index=True)
+    checkpoint_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    resume_node: Mapped[str] = mapped_column(String(64), nullable=False)
+    checkpoint_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    checkpoint_blob: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    metadata_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    metadata_blob: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    answer_json: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default="waiting", index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=now, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=now, onupdate=now, nullable=False)
+
+
 class TenantLLMConfig(Base):
     __tablename__ = "tenant_llm_config"
     __table_args__ = (UniqueConstraint("tenant_id", name="uk_tenant_llm_config_tenant"),)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from threading import Lock
+
+from src.app.core.config import settings
+
+try:
+    import redis
+
+    _REDIS_IMPORT_ERROR = None
+except Exception:  # pragma: no cover
+    redis = None
+    _REDIS_IMPORT_ERROR = "redis dependency is required"
+
+_lock = Lock()
+_client = None
+
+
+def get_redis_client():
+    # Shared lazily-built client; callers treat None as "redis unavailable".
+    global _client
+    if _REDIS_IMPORT_ERROR or not settings.redis_enabled or not settings.redis_url:
+        return None
+    with _lock:
+        if _client is None:
+            _client = redis.Redis.from_url(
+                settings.redis_url,
+                socket_timeout=settings.redis_socket_timeout_seconds,
+                socket_connect_timeout=settings.redis_socket_timeout_seconds,
+            )
+        return _client
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Event, Lock, Thread
+
+from src.app.infra.redis_client import get_redis_client
+
+ALL_TENANTS = "*"
+INVALIDATION_CHANNEL = "tw:cache:invalidate"
+_KEY_PREFIX = "tw:cache:"
+_MISSING = object()
+
+# Messages published by this process are ignored by its own listener.
+_WORKER_ID = uuid.uuid4().hex
+_lock = Lock()
+_handlers: dict[str, list] = {}
+_listener = {"thread": None, "stop": None}
+
+
+def add_invalidation_handler(namespace: str, callback) -> None:
+    with _lock:
+        callbacks = _handlers.setdefault(namespace, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+
+def _dispatch(namespace: str, tenant_id: str) -> None:
+    with _lock:
+        callbacks = list(_handlers.get(namespace) or [])
+    for callback in callbacks:
+        try:
+            callback(tenant_id)
+        except Exception:
+            pass
+
+
+def publish_invalidation(namespace: str, tenant_id: str | None) -> None:
+    # Tells the other workers; the caller is expected to have applied the change locally.
+    client = get_redis_client()
+    if client is None:
+        return
+    message = json.dumps({"namespace": namespace, "tenant_id": tenant_id or ALL_TENANTS, "origin": _WORKER_ID})
+    try:
+        client.publish(INVALIDATION_CHANNEL, message)
+    except Exception:
+        pass
+
+
+def handle_invalidation_message(raw) -> bool:
+    try:
+        message = json.loads(raw)
+    except Exception:
+        return False
+    if not isinstance(message, dict) or message.get("origin") == _WORKER_ID:
+        return False
+    namespace = str(message.get("namespace") or "")
+    if not namespace:
+        return False
+    _dispatch(namespace, str(message.get("tenant_id") or ALL_TENANTS))
+    return True
+
+
+def _listen(stop: Event) -> None:
+    backoff = 1.0
+    while not stop.is_set():
+        client = get_redis_client()
+        if client is None:
+            return
+        pubsub = None
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            backoff = 1.0
+            while not stop.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    handle_invalidation_message(message.get("data"))
+        except Exception:
+            stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+
+def start_invalidation_listener() -> bool:
+    if get_redis_client() is None:
+        return False
+    with _lock:
+        thread = _listener["thread"]
+        if thread is not None and thread.is_alive():
+            return True
+        stop = Event()
+        thread = Thread(target=_listen, args=(stop,), name="shared-cache-invalidation", daemon=True)
+        _listener["thread"] = thread
+        _listener["stop"] = stop
+    thread.start()
+    return True
+
+
+def stop_invalidation_listener(timeout: float = 2.0) -> None:
+    with _lock:
+        thread = _listener["thread"]
+        stop = _listener["stop"]
+        _listener["thread"] = None
+        _listener["stop"] = None
+    if stop is not None:
+        stop.set()
+    if thread is not None:
+        thread.join(timeout)
+
+
+class SharedCache:
+    # Per-process LRU (L1) in front of Redis (L2). Keys are namespaced per tenant; an
+    # invalidation drops both tiers and is broadcast so other workers drop their L1 too.
+    def __init__(self, namespace: str, ttl_seconds: int, max_entries: int = 1024):
+        self.namespace = namespace
+        self.ttl_seconds = max(int(ttl_seconds), 1)
+        self.max_entries = max(int(max_entries), 1)
+        self._entries: OrderedDict = OrderedDict()
+        self._entries_lock = Lock()
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+        add_invalidation_handler(namespace, self.clear_local)
+
+    def _redis_key(self, tenant_id: str, key: str) -> str:
+        return f"{_KEY_PREFIX}{self.namespace}:{tenant_id}:{key}"
+
+    def _index_key(self, tenant_id: str) -> str:
+        return f"{_KEY_PREFIX}{self.namespace}:{tenant_id}:__keys__"
+
+    def _count(self, name: str) -> None:
+        with self._entries_lock:
+            self._stats[name] += 1
+
+    def get(self, tenant_id: str, key: str, default=None):
+        local_key = (tenant_id, key)
+        now = time.monotonic()
+        with self._entries_lock:
+            entry = self._entries.get(local_key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(local_key)
+                    self._stats["l1_hits"] += 1
+                    return deepcopy(value)
+                self._entries.pop(local_key, None)
+
+        client = get_redis_client()
+        raw = None
+        if client is not None:
+            try:
+                raw = client.get(self._redis_key(tenant_id, key))
+            except Exception:
+                raw = None
+        if raw:
+            try:
+                value = json.loads(raw)
+            except Exception:
+                value = _MISSING
+            if value is not _MISSING:
+                self._count("l2_hits")
+                self._store_local(local_key, value)
+                return deepcopy(value)
+        self._count("misses")
+        return default
+
+    def get_many(self, tenant_id: str, keys: list[str]) -> dict:
+        found = {}
+        remaining = []
+        now = time.monotonic()
+        with self._entries_lock:
+            for key in keys:
+                entry = self._entries.get((tenant_id, key))
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end((tenant_id, key))
+                    self._stats["l1_hits"] += 1
+                    found[key] = deepcopy(entry[1])
+                else:
+                    remaining.append(key)
+        client = get_redis_client()
+        if remaining and client is not None:
+            try:
+                raws = client.mget([self._redis_key(tenant_id, key) for key in remaining])
+            except Exception:
+                raws = [None] * len(remaining)
+            for key, raw in zip(remaining, raws):
+                if not raw:
+                    continue
+                try:
+                    value = json.loads(raw)
+                except Exception:
+                    continue
+                self._count("l2_hits")
+                self._store_local((tenant_id, key), value)
+                found[key] = deepcopy(value)
+        misses = len(keys) - len(found)
+        if misses:
+            with self._entries_lock:
+                self._stats["misses"] += misses
+        return found
+
+    def set(self, tenant_id: str, key: str, value) -> None:
+        self.set_many(tenant_id, {key: value})
+
+    def set_many(self, tenant_id: str, values: dict) -> None:
+        for key, value in values.items():
+            self._store_local((tenant_id, key), value)
+        client = get_redis_client()
+        if client is None or not values:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.setex(self._redis_key(tenant_id, key), self.ttl_seconds, json.dumps(value, ensure_ascii=False, default=str))
+            pipe.sadd(self._index_key(tenant_id), *values.keys())
+            pipe.expire(self._index_key(tenant_id), self.ttl_seconds)
+            pipe.execute()
+        except Exception:
+            pass
+
+    def get_or_load(self, tenant_id: str, key: str, loader):
+        value = self.get(tenant_id, key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = loader()
+        if value is not None:
+            self.set(tenant_id, key, value)
+        return value
+
+    def _store_local(self, local_key: tuple, value) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._entries_lock:
+            self._entries[local_key] = (expires_at, deepcopy(value))
+            self._entries.move_to_end(local_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear_local(self, tenant_id: str | None = None) -> None:
+        with self._entries_lock:
+            if tenant_id is None or tenant_id == ALL_TENANTS:
+                self._entries.clear()
+                return
+            for local_key in [item for item in self._entries if item[0] == tenant_id]:
+                self._entries.pop(local_key, None)
+
+    def invalidate(self, tenant_id: str | None) -> None:
+        tenant = tenant_id or ALL_TENANTS
+        self.clear_local(tenant)
+        client = get_redis_client()
+        if client is not None:
+            try:
+                if tenant == ALL_TENANTS:
+                    keys = list(client.scan_iter(match=f"{_KEY_PREFIX}{self.namespace}:*", count=500))
+                else:
+                    members = client.smembers(self._index_key(tenant)) or []
+                    keys = [self._redis_key(tenant, item.decode() if isinstance(item, bytes) else item) for item in members]
+                    keys.append(self._index_key(tenant))
+                if keys:
+                    client.delete(*keys)
+            except Exception:
+                pass
+        publish_invalidation(self.namespace, tenant)
+
+    def stats(self) -> dict:
+        with self._entries_lock:
+            stats = dict(self._stats)
+            stats["l1_entries"] = len(self._entries)
+        lookups = stats["l1_hits"] + stats["l2_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["l1_hits"] + stats["l2_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
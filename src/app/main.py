@@ -1,22 +1,45 @@
+import asyncio
+import time
 import uuid
 from pathlib import Path
 
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import Depends, FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse
 from sqlalchemy import inspect, text
 
+from src.app import IMPORT_STARTED
+from src.app.api.compression import CompressionMiddleware
+from src.app.api.deps import require_auth
+from src.app.api.static_assets import StaticAsset
 from src.app.api.v1 import config, knowledge, mcp_data, mcp_graph, mcp_metadata, ontology, reasoning
 from src.app.core.config import settings
 from src.app.core.errors import AppError, ErrorCodes
-from src.app.core.response import build_response
+from src.app.core.lazy_imports import import_timings, loaded_deferred_modules
+from src.app.core.response import FastJSONResponse, build_response, negotiated_response
+from src.app.infra.db.async_session import dispose_async_engine
 from src.app.infra.db.base import Base
 from src.app.infra.db.session import SessionLocal, engine
-from src.app.services.active_tenant_service import ActiveTenantService
+from src.app.infra.shared_cache import start_invalidation_listener, stop_invalidation_listener
+from src.app.services.active_tenant_service import ActiveTenantTracker
 from src.app.services.observability.langfuse_config_service import LangfuseConfigService
+from src.app.services.observability.langfuse_sink import LangfuseSink
+from src.app.services.trace_retention_service import run_retention_for_active_tenants
 
-app = FastAPI(title=settings.app_name, version="0.1.0")
+app = FastAPI(title=settings.app_name, version="0.1.0", default_response_class=FastJSONResponse)
+alembic_script_path = Path(__file__).resolve().parents[2] / "alembic"
 console_html_path = Path(__file__).parent / "ui" / "m1_console.html"
 graph_workspace_html_path = Path(__file__).parent / "ui" / "graph_workspace.html"
+console_asset = StaticAsset(console_html_path)
+graph_workspace_asset = StaticAsset(graph_workspace_html_path)
+
+
+_CONTEXT_LATEST_BACKFILL_SQL = (
+    "UPDATE reasoning_context SET is_latest = FALSE "
+    "WHERE id NOT IN (SELECT latest.max_id FROM ("
+    "SELECT MAX(id) AS max_id FROM reasoning_context GROUP BY session_id, scope, key"
+    ") latest)"
+)
 
 
 def _ensure_runtime_schema() -> None:
@@ -57,45 +80,170 @@ def _ensure_runtime_schema() -> None:
                         )
                     )
 
+        if "reasoning_context" in table_names:
+            context_columns = {col["name"] for col in inspector.get_columns("reasoning_context")}
+            if "is_latest" not in context_columns:
+                conn.execute(text("ALTER TABLE reasoning_context ADD COLUMN is_latest BOOLEAN NOT NULL DEFAULT TRUE"))
+                conn.execute(text(_CONTEXT_LATEST_BACKFILL_SQL))
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_reasoning_context_latest "
+                    "ON reasoning_context (session_id, key, is_latest)"
+                )
+            )
+
+        if "reasoning_trace_event" in table_names:
+            trace_columns = {col["name"] for col in inspector.get_columns("reasoning_trace_event")}
+            if "payload_codec" not in trace_columns:
+                conn.execute(text("ALTER TABLE reasoning_trace_event ADD COLUMN payload_codec VARCHAR(16)"))
+            if "payload_blob" not in trace_columns:
+                blob_sql = "BYTEA" if dialect == "postgresql" else "BLOB"
+                conn.execute(text(f"ALTER TABLE reasoning_trace_event ADD COLUMN payload_blob {blob_sql}"))
+            index_using = "USING brin " if dialect == "postgresql" else ""
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_reasoning_trace_event_created_at "
+                    f"ON reasoning_trace_event {index_using}(created_at)"
+                )
+            )
+
+
+def _alembic_head_revision() -> str | None:
+    try:
+        from alembic.script import ScriptDirectory
+
+        return ScriptDirectory(str(alembic_script_path)).get_current_head()
+    except Exception:
+        return None
+
+
+def _database_revision() -> str | None:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except Exception:
+        return None
+
+
+def _schema_at_alembic_head() -> bool:
+    head = _alembic_head_revision()
+    return head is not None and _database_revision() == head
+
 
 @app.middleware("http")
 async def trace_middleware(request: Request, call_next):
     request.state.trace_id = request.headers.get("X-Trace-Id", f"trace_{uuid.uuid4().hex[:16]}")
     tenant_id = (request.headers.get("X-Tenant-Id") or "").strip()
     if tenant_id and request.url.path.startswith(settings.api_prefix):
-        db = SessionLocal()
-        try:
-            ActiveTenantService(db).touch(tenant_id)
-        except Exception:
-            db.rollback()
-        finally:
-            db.close()
+        ActiveTenantTracker.record(tenant_id)
     response = await call_next(request)
     response.headers["X-Trace-Id"] = request.state.trace_id
     return response
 
 
+# Registered after trace_middleware so it wraps it and compresses the final response, headers included.
+if settings.response_compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        path_prefix=settings.api_prefix,
+        minimum_size=settings.response_compression_min_bytes,
+        level=settings.response_compression_level,
+    )
+
+
 @app.exception_handler(AppError)
 async def app_error_handler(request: Request, exc: AppError):
     payload = build_response(request, code=exc.code, message=exc.message)
-    return JSONResponse(payload, status_code=exc.http_status)
+    return negotiated_response(request, payload, status_code=exc.http_status)
 
 
 @app.exception_handler(Exception)
 async def unknown_error_handler(request: Request, exc: Exception):
     payload = build_response(request, code=ErrorCodes.INTERNAL, message=f"internal error: {exc}")
-    return JSONResponse(payload, status_code=500)
+    return negotiated_response(request, payload, status_code=500)
+
+
+_APP_IMPORT_MS = round((time.perf_counter() - IMPORT_STARTED) * 1000.0, 1)
 
 
 @app.on_event("startup")
 def startup() -> None:
-    Base.metadata.create_all(bind=engine)
-    _ensure_runtime_schema()
+    started = time.perf_counter()
+    # A database already migrated to the alembic head needs none of the runtime DDL below.
+    schema_mode = "alembic_head" if settings.fast_start_enabled and _schema_at_alembic_head() else "runtime_ddl"
+    if schema_mode == "runtime_ddl":
+        Base.metadata.create_all(bind=engine)
+        _ensure_runtime_schema()
+    schema_ms = round((time.perf_counter() - started) * 1000.0, 1)
+
+    started = time.perf_counter()
     db = SessionLocal()
     try:
         LangfuseConfigService(db).bootstrap_runtime_from_db()
     finally:
         db.close()
+    start_invalidation_listener()
+    bootstrap_ms = round((time.perf_counter() - started) * 1000.0, 1)
+
+    app.state.startup_report = {
+        "app_import_ms": _APP_IMPORT_MS,
+        "schema_mode": schema_mode,
+        "schema_ms": schema_ms,
+        "bootstrap_ms": bootstrap_ms,
+        "deferred_imports_loaded": loaded_deferred_modules(),
+    }
+
+
+async def _flush_active_tenants_periodically() -> None:
+    interval = max(float(settings.active_tenant_flush_interval_seconds), 0.5)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(ActiveTenantTracker.flush)
+        except Exception:
+            # Entries stay pending after a failed flush and go out with the next one.
+            pass
+
+
+@app.on_event("startup")
+async def start_active_tenant_flusher() -> None:
+    app.state.active_tenant_flusher = asyncio.create_task(_flush_active_tenants_periodically())
+
+
+async def _run_trace_retention_periodically(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(run_retention_for_active_tenants)
+        except Exception:
+            pass
+
+
+@app.on_event("startup")
+async def start_trace_retention() -> None:
+    interval = float(settings.trace_retention_interval_seconds)
+    if interval > 0:
+        app.state.trace_retention_task = asyncio.create_task(_run_trace_retention_periodically(interval))
+
+
+@app.on_event("shutdown")
+async def dispose_async_db() -> None:
+    await dispose_async_engine()
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    for name in ("active_tenant_flusher", "trace_retention_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    try:
+        ActiveTenantTracker.flush()
+    except Exception:
+        pass
+    stop_invalidation_listener()
+    if LangfuseSink._instance is not None:
+        LangfuseSink._instance.shutdown()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -121,14 +269,23 @@ def index() -> str:
     """
 
 
+@app.get(f"{settings.api_prefix}/startup-report", dependencies=[Depends(require_auth)])
+def startup_report(request: Request):
+    report = dict(getattr(app.state, "startup_report", None) or {"app_import_ms": _APP_IMPORT_MS})
+    # SDKs imported on first use since startup, with what each import cost.
+    report["lazy_import_ms"] = import_timings()
+    report["deferred_imports_loaded"] = loaded_deferred_modules()
+    return build_response(request, report)
+
+
 @app.get("/theworld/v1/console", response_class=HTMLResponse)
-def m1_console() -> str:
-    return console_html_path.read_text(encoding="utf-8")
+def m1_console(request: Request):
+    return console_asset.response(request)
 
 
 @app.get("/theworld/v1/console/graph", response_class=HTMLResponse)
-def graph_workspace() -> str:
-    return graph_workspace_html_path.read_text(encoding="utf-8")
+def graph_workspace(request: Request):
+    return graph_workspace_asset.response(request)
 
 
 app.include_router(ontology.router, prefix=settings.api_prefix)
@@ -1,4 +1,8 @@
-﻿from sqlalchemy import and_, select
+﻿from datetime import datetime
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from src.app.infra.db import models
@@ -86,6 +90,40 @@ class ActiveTenantRepository:
         self.db.flush()
         return obj
 
+    def bulk_touch(self, last_seen: dict[str, datetime]) -> None:
+        if not last_seen:
+            return
+        dialect = self.db.get_bind().dialect.name
+        if dialect not in {"postgresql", "sqlite"}:
+            for tenant_id, seen_at in last_seen.items():
+                obj = self.get(tenant_id)
+                if not obj:
+                    self.db.add(
+                        models.ActiveTenant(
+                            tenant_id=tenant_id, is_active=True, first_seen_at=seen_at, last_seen_at=seen_at
+                        )
+                    )
+                    continue
+                obj.is_active = True
+                obj.last_seen_at = max(obj.last_seen_at, seen_at) if obj.last_seen_at else seen_at
+            self.db.flush()
+            return
+        insert_fn = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert_fn(models.ActiveTenant).values(
+            [
+                {"tenant_id": tenant_id, "is_active": True, "first_seen_at": seen_at, "last_seen_at": seen_at}
+                for tenant_id, seen_at in last_seen.items()
+            ]
+        )
+        # Another worker may already have flushed a newer timestamp; never move last_seen_at back.
+        latest = func.greatest if dialect == "postgresql" else func.max
+        last_seen_at = latest(models.ActiveTenant.last_seen_at, stmt.excluded.last_seen_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.ActiveTenant.tenant_id],
+            set_={"is_active": True, "last_seen_at": last_seen_at},
+        )
+        self.db.execute(stmt)
+
     def list_active(self, limit: int = 200):
         stmt = (
             select(models.ActiveTenant)
@@ -721,3 +721,36 @@ class OntologyRepository:
             )
         )
         return list(self.db.scalars(stmt))
+
+
+class AsyncOntologyRepository:
+    # Read paths for async endpoints; see AsyncReasoningRepository.
+    def __init__(self, db):
+        self.db = db
+
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.db.run_sync(lambda session: getattr(OntologyRepository(session), method)(*args, **kwargs))
+
+    async def get_class(self, tenant_id: str, class_id: int):
+        return await self._run("get_class", tenant_id, class_id)
+
+    async def get_class_by_code(self, tenant_id: str, code: str):
+        return await self._run("get_class_by_code", tenant_id, code)
+
+    async def list_classes(self, tenant_id: str, status: int | None = 1):
+        return await self._run("list_classes", tenant_id, status)
+
+    async def list_inheritance_edges(self, tenant_id: str):
+        return await self._run("list_inheritance_edges", tenant_id)
+
+    async def list_all_attributes(self, tenant_id: str):
+        return await self._run("list_all_attributes", tenant_id)
+
+    async def get_attribute(self, tenant_id: str, attribute_id: int):
+        return await self._run("get_attribute", tenant_id, attribute_id)
+
+    async def list_all_relations(self, tenant_id: str):
+        return await self._run("list_all_relations", tenant_id)
+
+    async def list_all_capabilities(self, tenant_id: str):
+        return await self._run("list_all_capabilities", tenant_id)
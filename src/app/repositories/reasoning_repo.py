@@ -1,7 +1,7 @@
 ﻿import uuid
 from datetime import datetime
 
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import and_, delete, desc, func, insert, or_, select
 from sqlalchemy.orm import Session
 
 from src.app.infra.db import models
@@ -98,16 +98,34 @@ class ReasoningRepository:
         return task_obj
 
     def set_context(self, session_id: str, scope: str, key: str, value_json: dict):
+        previous = self.latest_context(session_id, key, [scope])
+        if previous is not None:
+            previous.is_latest = False
         obj = models.ReasoningContext(
             session_id=session_id,
             scope=scope,
             key=key,
             value_json=value_json,
+            version=(previous.version + 1) if previous is not None else 1,
+            is_latest=True,
         )
         self.db.add(obj)
         self.db.flush()
         return obj
 
+    def latest_context(self, session_id: str, key: str, scopes: list[str] | None = None):
+        stmt = select(models.ReasoningContext).where(
+            and_(
+                models.ReasoningContext.session_id == session_id,
+                models.ReasoningContext.key == key,
+                models.ReasoningContext.is_latest.is_(True),
+            )
+        )
+        if scopes:
+            stmt = stmt.where(models.ReasoningContext.scope.in_(scopes))
+        stmt = stmt.order_by(models.ReasoningContext.id.desc()).limit(1)
+        return self.db.scalar(stmt)
+
     def list_context(self, session_id: str, scopes: list[str] | None = None):
         stmt = select(models.ReasoningContext).where(models.ReasoningContext.session_id == session_id)
         if scopes:
@@ -123,6 +141,8 @@ class ReasoningRepository:
         event_type: str,
         payload_json: dict,
         trace_id: str | None,
+        payload_codec: str | None = None,
+        payload_blob: bytes | None = None,
     ):
         obj = models.ReasoningTraceEvent(
             session_id=session_id,
@@ -130,12 +150,51 @@ class ReasoningRepository:
             step=step,
             event_type=event_type,
             payload_json=payload_json,
+            payload_codec=payload_codec,
+            payload_blob=payload_blob,
             trace_id=trace_id,
         )
         self.db.add(obj)
         self.db.flush()
         return obj
 
+    def bulk_create_trace_events(self, rows: list[dict]) -> None:
+        if rows:
+            self.db.execute(insert(models.ReasoningTraceEvent), rows)
+
+    def page_trace_events(
+        self,
+        session_id: str,
+        after_id: int = 0,
+        limit: int = 100,
+        steps: list[str] | None = None,
+        event_types: list[str] | None = None,
+        turn_id: int | None = None,
+        include_payload: bool = False,
+    ):
+        event = models.ReasoningTraceEvent
+        columns = [event.id, event.session_id, event.turn_id, event.step, event.event_type, event.trace_id, event.created_at]
+        if include_payload:
+            columns.extend([event.payload_json, event.payload_codec, event.payload_blob])
+        stmt = select(*columns).where(and_(event.session_id == session_id, event.id > int(after_id or 0)))
+        if steps:
+            stmt = stmt.where(event.step.in_(steps))
+        if event_types:
+            stmt = stmt.where(event.event_type.in_(event_types))
+        if turn_id is not None:
+            stmt = stmt.where(event.turn_id == turn_id)
+        stmt = stmt.order_by(event.id.asc()).limit(limit)
+        return list(self.db.execute(stmt).mappings())
+
+    def get_trace_event(self, session_id: str, event_id: int):
+        stmt = select(models.ReasoningTraceEvent).where(
+            and_(
+                models.ReasoningTraceEvent.session_id == session_id,
+                models.ReasoningTraceEvent.id == event_id,
+            )
+        )
+        return self.db.scalar(stmt)
+
     def list_trace_events(self, session_id: str):
         stmt = (
             select(models.ReasoningTraceEvent)
@@ -144,6 +203,36 @@ class ReasoningRepository:
         )
         return list(self.db.scalars(stmt))
 
+    def trace_event_ids_before(
+        self,
+        tenant_id: str,
+        before: datetime,
+        limit: int,
+        exclude_codec: str | None = None,
+    ) -> list[int]:
+        event = models.ReasoningTraceEvent
+        stmt = (
+            select(event.id)
+            .join(models.ReasoningSession, models.ReasoningSession.id == event.session_id)
+            .where(and_(models.ReasoningSession.tenant_id == tenant_id, event.created_at < before))
+        )
+        if exclude_codec:
+            stmt = stmt.where(or_(event.payload_codec.is_(None), event.payload_codec != exclude_codec))
+        stmt = stmt.order_by(event.id.asc()).limit(limit)
+        return list(self.db.scalars(stmt))
+
+    def list_trace_events_by_ids(self, event_ids: list[int]):
+        if not event_ids:
+            return []
+        stmt = select(models.ReasoningTraceEvent).where(models.ReasoningTraceEvent.id.in_(event_ids))
+        return list(self.db.scalars(stmt))
+
+    def delete_trace_events(self, event_ids: list[int]) -> int:
+        if not event_ids:
+            return 0
+        result = self.db.execute(delete(models.ReasoningTraceEvent).where(models.ReasoningTraceEvent.id.in_(event_ids)))
+        return int(result.rowcount or 0)
+
     def create_clarification(self, session_id: str, turn_id: int | None, question_json: dict):
         obj = models.ReasoningClarification(
             session_id=session_id,
@@ -174,3 +263,86 @@ class ReasoningRepository:
         clarification_obj.status = "answered"
         self.db.flush()
         return clarification_obj
+
+    def create_checkpoint(
+        self,
+        session_id: str,
+        turn_id: int,
+        checkpoint_id: str,
+        resume_node: str,
+        checkpoint_typed: tuple[str, bytes],
+        metadata_typed: tuple[str, bytes],
+    ):
+        obj = models.ReasoningCheckpoint(
+            session_id=session_id,
+            turn_id=turn_id,
+            checkpoint_id=checkpoint_id,
+            resume_node=resume_node,
+            checkpoint_type=checkpoint_typed[0],
+            checkpoint_blob=checkpoint_typed[1],
+            metadata_type=metadata_typed[0],
+            metadata_blob=metadata_typed[1],
+            answer_json={},
+            status="waiting",
+        )
+        self.db.add(obj)
+        self.db.flush()
+        return obj
+
+    def latest_checkpoint(self, session_id: str, turn_id: int, status: str):
+        stmt = (
+            select(models.ReasoningCheckpoint)
+            .where(
+                and_(
+                    models.ReasoningCheckpoint.session_id == session_id,
+                    models.ReasoningCheckpoint.turn_id == turn_id,
+                    models.ReasoningCheckpoint.status == status,
+                )
+            )
+            .order_by(desc(models.ReasoningCheckpoint.id))
+            .limit(1)
+        )
+        return self.db.scalar(stmt)
+
+    def update_checkpoint(self, checkpoint_obj: models.ReasoningCheckpoint, payload: dict):
+        for key, value in payload.items():
+            setattr(checkpoint_obj, key, value)
+        self.db.flush()
+        return checkpoint_obj
+
+
+class AsyncReasoningRepository:
+    # Read paths for async endpoints. Statements are shared with ReasoningRepository through
+    # `run_sync`, which executes them on the async driver (or the threadpool fallback).
+    def __init__(self, db):
+        self.db = db
+
+    async def _run(self, method: str, *args, **kwargs):
+        return await self.db.run_sync(lambda session: getattr(ReasoningRepository(session), method)(*args, **kwargs))
+
+    async def get_session(self, tenant_id: str, session_id: str):
+        return await self._run("get_session", tenant_id, session_id)
+
+    async def latest_turn(self, session_id: str):
+        return await self._run("latest_turn", session_id)
+
+    async def latest_pending_clarification(self, session_id: str):
+        return await self._run("latest_pending_clarification", session_id)
+
+    async def list_tasks(self, session_id: str, turn_id: int | None = None):
+        return await self._run("list_tasks", session_id, turn_id=turn_id)
+
+    async def latest_context(self, session_id: str, key: str, scopes: list[str] | None = None):
+        return await self._run("latest_context", session_id, key, scopes)
+
+    async def list_context(self, session_id: str, scopes: list[str] | None = None):
+        return await self._run("list_context", session_id, scopes)
+
+    async def page_trace_events(self, session_id: str, **filters):
+        return await self._run("page_trace_events", session_id, **filters)
+
+    async def get_trace_event(self, session_id: str, event_id: int):
+        return await self._run("get_trace_event", session_id, event_id)
+
+    async def list_trace_events(self, session_id: str):
+        return await self._run("list_trace_events", session_id)
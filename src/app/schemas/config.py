@@ -42,3 +42,9 @@ class TenantSearchConfigUpdateRequest(BaseModel):
     score_gap: float | None = Field(default=None, ge=0)
     relative_diff: float | None = Field(default=None, ge=0)
     backfill_batch_size: int | None = Field(default=None, ge=1, le=5000)
+
+
+class TenantTraceRetentionConfigUpdateRequest(BaseModel):
+    summarize_after_days: int | None = Field(default=None, ge=0, le=3650)
+    delete_after_days: int | None = Field(default=None, ge=0, le=3650)
+    batch_size: int | None = Field(default=None, ge=1, le=5000)
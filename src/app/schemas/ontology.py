@@ -119,3 +119,13 @@ class BackfillEmbeddingsRequest(BaseModel):
         default_factory=lambda: ["ontology", "obj-prop", "capability"]
     )
     batch_size: int = Field(default=100, ge=1, le=5000)
+
+
+class WarmHybridSearchRequest(BaseModel):
+    queries: list[str] = Field(default_factory=list, max_length=100)
+    resource_types: list[Literal["ontology", "data-attr", "obj-prop", "capability"]] = Field(
+        default_factory=lambda: ["ontology", "data-attr", "obj-prop", "capability"]
+    )
+    min_prefix_chars: int = Field(default=1, ge=1, le=32)
+    max_entries: int = Field(default=200, ge=1, le=2000)
+    top_k: int = Field(default=80, ge=1, le=500)
@@ -1,8 +1,61 @@
 from __future__ import annotations
 
+from threading import Lock
+
+from src.app.infra.db.models import now
+from src.app.infra.db.session import SessionLocal
 from src.app.repositories.config_repo import ActiveTenantRepository
 
 
+class ActiveTenantTracker:
+    # Per-worker last-seen map; requests only record here and a periodic task persists it.
+    _lock = Lock()
+    _pending: dict = {}
+
+    @classmethod
+    def record(cls, tenant_id: str) -> None:
+        value = str(tenant_id or "").strip()
+        if not value:
+            return
+        seen_at = now()
+        with cls._lock:
+            cls._pending[value] = seen_at
+
+    @classmethod
+    def drain(cls) -> dict:
+        with cls._lock:
+            pending = cls._pending
+            cls._pending = {}
+        return pending
+
+    @classmethod
+    def restore(cls, pending: dict) -> None:
+        with cls._lock:
+            for tenant_id, seen_at in pending.items():
+                current = cls._pending.get(tenant_id)
+                if current is None or current < seen_at:
+                    cls._pending[tenant_id] = seen_at
+
+    @classmethod
+    def flush(cls, db=None) -> int:
+        pending = cls.drain()
+        if not pending:
+            return 0
+        owns_session = db is None
+        session = SessionLocal() if owns_session else db
+        try:
+            ActiveTenantRepository(session).bulk_touch(pending)
+            session.commit()
+        except Exception:
+            session.rollback()
+            cls.restore(pending)
+            raise
+        finally:
+            if owns_session:
+                session.close()
+        return len(pending)
+
+
 class ActiveTenantService:
     def __init__(self, db):
         self.db = db
@@ -16,6 +69,7 @@ class ActiveTenantService:
         self.db.commit()
 
     def list_active(self, limit: int = 200) -> dict:
+        ActiveTenantTracker.flush(self.db)
         size = max(1, min(int(limit or 200), 2000))
         rows = self.repo.list_active(limit=size)
         return {
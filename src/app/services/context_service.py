@@ -28,7 +28,25 @@ class ContextService:
                 "key": item.key,
                 "value": item.value_json,
                 "version": item.version,
+                "is_latest": bool(item.is_latest),
                 "created_at": item.created_at.isoformat(),
             }
             for item in items
         ]
+
+    def read_latest(self, session_id: str, key: str, scopes: list[str] | None = None):
+        scopes = scopes or ["session", "artifact", "global"]
+        for scope in scopes:
+            if scope not in ALLOWED_SCOPES:
+                raise AppError(ErrorCodes.VALIDATION, "invalid context scope")
+        item = self.repo.latest_context(session_id, key, scopes)
+        if item is None:
+            return None
+        return {
+            "id": item.id,
+            "scope": item.scope,
+            "key": item.key,
+            "value": item.value_json,
+            "version": item.version,
+            "created_at": item.created_at.isoformat(),
+        }
@@ -4,6 +4,14 @@ import math
 import httpx
 
 from src.app.core.config import settings
+from src.app.infra.shared_cache import ALL_TENANTS, SharedCache
+
+# Embeddings depend only on the text and the model endpoint, so they are shared across tenants.
+_embedding_cache = SharedCache(
+    "embedding",
+    ttl_seconds=settings.embedding_cache_ttl_seconds,
+    max_entries=settings.embedding_cache_max_entries,
+)
 
 
 class EmbeddingService:
@@ -15,6 +23,10 @@ class EmbeddingService:
         norm = math.sqrt(sum(v * v for v in values)) or 1.0
         return [v / norm for v in values]
 
+    @staticmethod
+    def _cache_key(endpoint: str, text: str) -> str:
+        return hashlib.sha256(f"{endpoint}|{text}".encode("utf-8")).hexdigest()
+
     @classmethod
     def embed_batch(cls, texts: list[str]) -> list[list[float]]:
         normalized = [(text or "").strip() for text in (texts or [])]
@@ -25,17 +37,30 @@ class EmbeddingService:
         if not endpoint:
             return [cls._fallback_embed(text) for text in normalized]
 
-        try:
-            with httpx.Client(timeout=settings.embedding_timeout_seconds) as client:
-                resp = client.post(f"{endpoint}/embed", json={"texts": normalized})
-                resp.raise_for_status()
-                payload = resp.json()
-            embeddings = payload.get("embeddings") or []
-            if not isinstance(embeddings, list) or len(embeddings) != len(normalized):
-                raise ValueError("invalid embeddings response length")
-            return [[float(v) for v in (item or [])] for item in embeddings]
-        except Exception:
-            return [cls._fallback_embed(text) for text in normalized]
+        use_cache = bool(settings.embedding_cache_enabled)
+        keys = [cls._cache_key(endpoint, text) for text in normalized]
+        cached = _embedding_cache.get_many(ALL_TENANTS, list(dict.fromkeys(keys))) if use_cache else {}
+        missing = list(dict.fromkeys(text for text, key in zip(normalized, keys) if key not in cached))
+        if missing:
+            try:
+                with httpx.Client(timeout=settings.embedding_timeout_seconds) as client:
+                    resp = client.post(f"{endpoint}/embed", json={"texts": missing})
+                    resp.raise_for_status()
+                    payload = resp.json()
+                embeddings = payload.get("embeddings") or []
+                if not isinstance(embeddings, list) or len(embeddings) != len(missing):
+                    raise ValueError("invalid embeddings response length")
+            except Exception:
+                # Fallback vectors are never cached, so a transient outage does not stick.
+                return [cached.get(key) or cls._fallback_embed(text) for text, key in zip(normalized, keys)]
+            fetched = {
+                cls._cache_key(endpoint, text): [float(v) for v in (item or [])]
+                for text, item in zip(missing, embeddings)
+            }
+            if use_cache:
+                _embedding_cache.set_many(ALL_TENANTS, fetched)
+            cached = {**cached, **fetched}
+        return [cached[key] for key in keys]
 
     @classmethod
     def embed(cls, text: str) -> list[float]:
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from threading import Lock
+
+import httpx
+
+from src.app.core.config import settings
+from src.app.core.lazy_imports import timed_import
+from src.app.infra.shared_cache import add_invalidation_handler
+
+ChatOpenAI = None
+_LANGCHAIN_IMPORT_ERROR = None
+
+
+def _load_chat_openai() -> str | None:
+    # langchain_openai pulls in openai and tiktoken; import it when the first model is built.
+    global ChatOpenAI, _LANGCHAIN_IMPORT_ERROR
+    if ChatOpenAI is None and _LANGCHAIN_IMPORT_ERROR is None:
+        try:
+            ChatOpenAI = timed_import("langchain_openai").ChatOpenAI
+        except Exception:
+            _LANGCHAIN_IMPORT_ERROR = "langchain-openai dependency is required"
+    return _LANGCHAIN_IMPORT_ERROR
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except Exception:
+    _HTTP2_AVAILABLE = False
+
+
+class LLMClientRegistry:
+    # Keep-alive pools are shared per endpoint; chat models are cached per tenant route.
+    _lock = Lock()
+    _http_clients: dict[str, httpx.Client] = {}
+    _chat_models: dict[tuple, tuple[str, object]] = {}
+
+    @staticmethod
+    def _endpoint_key(base_url: str | None) -> str:
+        return str(base_url or "").strip().rstrip("/") or "default"
+
+    @classmethod
+    def get_http_client(cls, base_url: str | None) -> httpx.Client:
+        key = cls._endpoint_key(base_url)
+        with cls._lock:
+            client = cls._http_clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.Client(
+                    http2=bool(settings.llm_http2_enabled and _HTTP2_AVAILABLE),
+                    timeout=max(int(settings.default_llm_timeout_ms), 1000) / 1000.0,
+                    limits=httpx.Limits(
+                        max_connections=max(int(settings.llm_http_max_connections), 1),
+                        max_keepalive_connections=max(int(settings.llm_http_max_keepalive_connections), 1),
+                        keepalive_expiry=float(settings.llm_http_keepalive_expiry_seconds),
+                    ),
+                )
+                cls._http_clients[key] = client
+            return client
+
+    @staticmethod
+    def _fingerprint(runtime_cfg: dict, timeout_seconds: float, model_kwargs: dict) -> str:
+        material = json.dumps(
+            {
+                "api_key": runtime_cfg.get("api_key") or "",
+                "timeout": timeout_seconds,
+                "model_kwargs": model_kwargs,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_chat_model(cls, runtime_cfg: dict, model_kwargs: dict):
+        error = _load_chat_openai()
+        if error:
+            raise RuntimeError(error)
+        base_url = runtime_cfg.get("base_url") or None
+        timeout_seconds = max(int(runtime_cfg.get("timeout_ms", 30000)), 1000) / 1000.0
+        key = (
+            str(runtime_cfg.get("tenant_id") or ""),
+            str(runtime_cfg.get("provider") or ""),
+            str(runtime_cfg.get("model") or ""),
+            cls._endpoint_key(base_url),
+        )
+        fingerprint = cls._fingerprint(runtime_cfg, timeout_seconds, model_kwargs)
+        with cls._lock:
+            cached = cls._chat_models.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+
+        llm = ChatOpenAI(
+            api_key=runtime_cfg["api_key"],
+            model=runtime_cfg["model"],
+            base_url=base_url,
+            timeout=timeout_seconds,
+            model_kwargs=dict(model_kwargs),
+            http_client=cls.get_http_client(base_url),
+        )
+        with cls._lock:
+            cls._chat_models[key] = (fingerprint, llm)
+        return llm
+
+    @classmethod
+    def invalidate_tenant(cls, tenant_id: str) -> None:
+        with cls._lock:
+            for key in [item for item in cls._chat_models if item[0] == tenant_id]:
+                cls._chat_models.pop(key, None)
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            clients = list(cls._http_clients.values())
+            cls._http_clients.clear()
+            cls._chat_models.clear()
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+# Config changes made on another worker drop this worker's cached chat models for the tenant.
+add_invalidation_handler("tenant_llm_config", LLMClientRegistry.invalidate_tenant)
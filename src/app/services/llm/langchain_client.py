@@ -2,26 +2,98 @@ from __future__ import annotations
 
 import json
 import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 
+from src.app.core.config import settings
 from src.app.core.errors import AppError, ErrorCodes
+from src.app.core.lazy_imports import timed_import
+from src.app.services.llm.client_registry import LLMClientRegistry
+from src.app.services.llm.prompt_budget import compact_json
 
-try:
-    from langchain_core.messages import HumanMessage, SystemMessage
-    from langchain_openai import ChatOpenAI
+HumanMessage = None
+SystemMessage = None
+_LANGCHAIN_IMPORT_ERROR = None
 
-    _LANGCHAIN_IMPORT_ERROR = None
-except Exception:
-    HumanMessage = None
-    SystemMessage = None
-    ChatOpenAI = None
-    _LANGCHAIN_IMPORT_ERROR = "langchain/langchain-openai dependencies are required"
+
+def _load_langchain() -> str | None:
+    global HumanMessage, SystemMessage, _LANGCHAIN_IMPORT_ERROR
+    if HumanMessage is None and _LANGCHAIN_IMPORT_ERROR is None:
+        try:
+            messages = timed_import("langchain_core.messages")
+            HumanMessage = messages.HumanMessage
+            SystemMessage = messages.SystemMessage
+        except Exception:
+            _LANGCHAIN_IMPORT_ERROR = "langchain/langchain-openai dependencies are required"
+    return _LANGCHAIN_IMPORT_ERROR
+
+
+_TOKEN_SINK: ContextVar = ContextVar("llm_token_sink", default=None)
+
+STRUCTURED_OUTPUT_MODES = {"prompt", "json_object", "json_schema", "tool"}
+_STRUCTURED_TOOL_NAME = "submit_decision"
+# route -> monotonic time until which the route is asked in prose instead.
+_STRUCTURED_OUTPUT_UNSUPPORTED: dict[str, float] = {}
+_STRUCTURED_OUTPUT_REJECTION = re.compile(r"response_format|json_schema|json_object|tool", re.IGNORECASE)
+
+
+def _rejects_structured_output(exc: Exception) -> bool:
+    # Only a 400 that names the structured-output parameters means the endpoint lacks them;
+    # context-length or other bad-parameter errors must not downgrade the route.
+    if getattr(exc, "status_code", None) != 400:
+        return False
+    detail = f"{exc} {getattr(exc, 'body', '') or ''}"
+    return bool(_STRUCTURED_OUTPUT_REJECTION.search(detail))
+
+
+def _schema_from_hint(value):
+    if isinstance(value, dict):
+        return {"type": "object", "properties": {key: _schema_from_hint(item) for key, item in value.items()}}
+    if isinstance(value, list):
+        return {"type": "array", "items": _schema_from_hint(value[0]) if value else {}}
+    if isinstance(value, bool):
+        return {"type": "boolean"}
+    if isinstance(value, (int, float)):
+        return {"type": "number"}
+    return {"type": "string"}
+
+
+def _shape_error(parsed: dict, schema_hint: dict) -> str | None:
+    # schema_hint is an example object: check that top-level containers keep their shape.
+    for key, example in schema_hint.items():
+        value = parsed.get(key)
+        if value is None:
+            continue
+        if isinstance(example, list) and not isinstance(value, list):
+            return f"field '{key}' must be an array"
+        if isinstance(example, dict) and not isinstance(value, dict):
+            return f"field '{key}' must be an object"
+        if not isinstance(example, (list, dict)) and isinstance(value, (list, dict)):
+            return f"field '{key}' must be a scalar"
+    return None
+
+
+def current_token_sink():
+    return _TOKEN_SINK.get()
+
+
+@contextmanager
+def llm_token_sink(sink):
+    # Calls made inside this block stream completion tokens to `sink(text)`.
+    token = _TOKEN_SINK.set(sink)
+    try:
+        yield
+    finally:
+        _TOKEN_SINK.reset(token)
 
 
 class LangChainLLMClient:
     @staticmethod
     def ensure_dependencies() -> None:
-        if _LANGCHAIN_IMPORT_ERROR:
-            raise AppError(ErrorCodes.INTERNAL, _LANGCHAIN_IMPORT_ERROR)
+        error = _load_langchain()
+        if error:
+            raise AppError(ErrorCodes.INTERNAL, error)
 
     @staticmethod
     def summarize_with_context(
@@ -62,8 +134,8 @@ class LangChainLLMClient:
     ) -> dict:
         LangChainLLMClient.ensure_dependencies()
         llm, model_kwargs = LangChainLLMClient._build_llm(runtime_cfg)
-        schema_text = json.dumps(schema_hint or {}, ensure_ascii=False)
-        payload_text = json.dumps(user_payload or {}, ensure_ascii=False)
+        schema_text = compact_json(schema_hint or {})
+        payload_text = compact_json(user_payload or {})
         messages = [
             SystemMessage(content=system_prompt),
             HumanMessage(
@@ -74,14 +146,127 @@ class LangChainLLMClient:
                 )
             ),
         ]
-        text = LangChainLLMClient._invoke_text(
+        mode = LangChainLLMClient._structured_output_mode(runtime_cfg)
+        try:
+            text = LangChainLLMClient._invoke_text(
+                llm=LangChainLLMClient._bind_structured_output(llm, mode, schema_hint),
+                runtime_cfg=runtime_cfg,
+                model_kwargs=model_kwargs,
+                messages=messages,
+                audit_callback=audit_callback,
+                structured_output_mode=mode,
+            )
+        except Exception as exc:
+            if mode == "prompt" or not _rejects_structured_output(exc):
+                raise
+            # The endpoint rejected response_format/tools: ask in prose for a while instead.
+            _STRUCTURED_OUTPUT_UNSUPPORTED[LangChainLLMClient._structured_output_route(runtime_cfg)] = (
+                time.monotonic() + max(float(settings.llm_structured_output_downgrade_seconds), 0.0)
+            )
+            text = LangChainLLMClient._invoke_text(
+                llm=llm,
+                runtime_cfg=runtime_cfg,
+                model_kwargs=model_kwargs,
+                messages=messages,
+                audit_callback=audit_callback,
+                structured_output_mode="prompt",
+            )
+        try:
+            return LangChainLLMClient._parse_and_validate(text, schema_hint)
+        except ValueError as exc:
+            if not settings.llm_json_repair_enabled:
+                raise
+            return LangChainLLMClient._repair_json(llm, runtime_cfg, model_kwargs, text, schema_hint, str(exc), audit_callback)
+
+    @staticmethod
+    def _structured_output_route(runtime_cfg: dict) -> str:
+        return f"{runtime_cfg.get('provider') or ''}|{runtime_cfg.get('base_url') or ''}|{runtime_cfg.get('model') or ''}"
+
+    @staticmethod
+    def _structured_output_mode(runtime_cfg: dict) -> str:
+        mode = str(settings.llm_structured_output_mode or "prompt").strip().lower()
+        if mode not in STRUCTURED_OUTPUT_MODES:
+            return "prompt"
+        route = LangChainLLMClient._structured_output_route(runtime_cfg)
+        downgraded_until = _STRUCTURED_OUTPUT_UNSUPPORTED.get(route)
+        if downgraded_until is not None:
+            if downgraded_until > time.monotonic():
+                return "prompt"
+            _STRUCTURED_OUTPUT_UNSUPPORTED.pop(route, None)
+        return mode
+
+    @staticmethod
+    def _bind_structured_output(llm, mode: str, schema_hint: dict | None):
+        if mode == "json_object":
+            return llm.bind(response_format={"type": "json_object"})
+        if mode == "json_schema":
+            return llm.bind(
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {"name": _STRUCTURED_TOOL_NAME, "schema": _schema_from_hint(schema_hint or {})},
+                }
+            )
+        if mode == "tool":
+            return llm.bind_tools(
+                [
+                    {
+                        "type": "function",
+                        "function": {
+                            "name": _STRUCTURED_TOOL_NAME,
+                            "description": "Submit the decision as structured arguments.",
+                            "parameters": _schema_from_hint(schema_hint or {}),
+                        },
+                    }
+                ],
+                tool_choice={"type": "function", "function": {"name": _STRUCTURED_TOOL_NAME}},
+            )
+        return llm
+
+    @staticmethod
+    def _parse_and_validate(text: str, schema_hint: dict | None) -> dict:
+        parsed = LangChainLLMClient._parse_json_text(text)
+        error = _shape_error(parsed, schema_hint or {})
+        if error:
+            raise ValueError(error)
+        return parsed
+
+    @staticmethod
+    def _repair_json(
+        llm,
+        runtime_cfg: dict,
+        model_kwargs: dict,
+        text: str,
+        schema_hint: dict | None,
+        error: str,
+        audit_callback=None,
+    ) -> dict:
+        # Single bounded retry: only the broken output and the parse error, not the original input.
+        schema_text = compact_json(schema_hint or {})
+        limit = max(int(settings.llm_json_repair_max_chars), 256)
+        messages = [
+            SystemMessage(content="你是 JSON 修复助手，只输出修正后的 JSON 对象。"),
+            HumanMessage(
+                content=(
+                    f"解析错误: {error}\n"
+                    f"SchemaHint: {schema_text}\n"
+                    f"原始输出: {str(text or '')[:limit]}"
+                )
+            ),
+        ]
+        if callable(audit_callback):
+            try:
+                audit_callback("llm_json_repair", {"model": runtime_cfg.get("model"), "error": error})
+            except Exception:
+                pass
+        repaired = LangChainLLMClient._invoke_text(
             llm=llm,
             runtime_cfg=runtime_cfg,
             model_kwargs=model_kwargs,
             messages=messages,
             audit_callback=audit_callback,
+            structured_output_mode="repair",
         )
-        return LangChainLLMClient._parse_json_text(text)
+        return LangChainLLMClient._parse_and_validate(repaired, schema_hint)
 
     @staticmethod
     def _build_llm(runtime_cfg: dict):
@@ -89,40 +274,48 @@ class LangChainLLMClient:
         enable_thinking = runtime_cfg.get("enable_thinking")
         if enable_thinking is not None:
             model_kwargs.setdefault("enable_thinking", bool(enable_thinking))
-        llm = ChatOpenAI(
-            api_key=runtime_cfg["api_key"],
-            model=runtime_cfg["model"],
-            base_url=runtime_cfg.get("base_url") or None,
-            timeout=max(int(runtime_cfg.get("timeout_ms", 30000)), 1000) / 1000.0,
-            model_kwargs=model_kwargs,
-        )
+        llm = LLMClientRegistry.get_chat_model(runtime_cfg, model_kwargs)
         return llm, model_kwargs
 
     @staticmethod
-    def _invoke_text(llm, runtime_cfg: dict, model_kwargs: dict, messages: list, audit_callback=None) -> str:
+    def _invoke_text(
+        llm,
+        runtime_cfg: dict,
+        model_kwargs: dict,
+        messages: list,
+        audit_callback=None,
+        structured_output_mode: str | None = None,
+    ) -> str:
         if callable(audit_callback):
+            payload = {
+                "provider": runtime_cfg.get("provider"),
+                "model": runtime_cfg.get("model"),
+                "base_url": runtime_cfg.get("base_url"),
+                "timeout_ms": runtime_cfg.get("timeout_ms"),
+                "model_kwargs": model_kwargs,
+                "messages": [
+                    {"role": "system", "content": messages[0].content},
+                    {"role": "user", "content": messages[1].content},
+                ],
+            }
+            if structured_output_mode is not None:
+                payload["structured_output_mode"] = structured_output_mode
             try:
-                audit_callback(
-                    "llm_prompt_sent",
-                    {
-                        "provider": runtime_cfg.get("provider"),
-                        "model": runtime_cfg.get("model"),
-                        "base_url": runtime_cfg.get("base_url"),
-                        "timeout_ms": runtime_cfg.get("timeout_ms"),
-                        "model_kwargs": model_kwargs,
-                        "messages": [
-                            {"role": "system", "content": messages[0].content},
-                            {"role": "user", "content": messages[1].content},
-                        ],
-                    },
-                )
+                audit_callback("llm_prompt_sent", payload)
             except Exception:
                 pass
-        result = llm.invoke(messages)
+        sink = _TOKEN_SINK.get()
+        if callable(sink):
+            result = LangChainLLMClient._stream_message(llm, messages, sink)
+        else:
+            result = llm.invoke(messages)
         content = result.content if hasattr(result, "content") else ""
         if isinstance(content, list):
             content = "".join(str(item) for item in content)
         final_content = str(content).strip()
+        tool_calls = getattr(result, "tool_calls", None) or []
+        if not final_content and tool_calls:
+            final_content = json.dumps(tool_calls[0].get("args") or {}, ensure_ascii=False)
         if callable(audit_callback):
             try:
                 audit_callback(
@@ -138,6 +331,23 @@ class LangChainLLMClient:
                 pass
         return final_content
 
+    @staticmethod
+    def _stream_message(llm, messages: list, sink):
+        aggregated = None
+        for chunk in llm.stream(messages):
+            text = chunk.content if hasattr(chunk, "content") else ""
+            if isinstance(text, list):
+                text = "".join(str(item) for item in text)
+            if text:
+                try:
+                    sink(str(text))
+                except Exception:
+                    pass
+            aggregated = chunk if aggregated is None else aggregated + chunk
+        if aggregated is None:
+            return llm.invoke(messages)
+        return aggregated
+
     @staticmethod
     def _parse_json_text(text: str) -> dict:
         raw = str(text or "").strip()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import math
+from copy import deepcopy
+
+from src.app.core.config import settings
+
+_TRUNCATED_SUFFIX = "…"
+
+
+def compact_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    # CJK characters are roughly one token each; other text averages about four characters per token.
+    raw = str(text or "")
+    wide = sum(1 for ch in raw if ord(ch) > 0x2E80)
+    return int(wide + math.ceil((len(raw) - wide) / 4.0))
+
+
+def task_token_budget(task: str) -> int:
+    budgets = settings.llm_prompt_token_budgets or {}
+    return max(int(budgets.get(task) or settings.llm_prompt_token_budget_default), 1)
+
+
+def _truncate_descriptions(value, max_chars: int, counter: list[int]):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "description" and isinstance(item, str) and len(item) > max_chars:
+                value[key] = item[:max_chars] + _TRUNCATED_SUFFIX
+                counter[0] += 1
+            else:
+                _truncate_descriptions(item, max_chars, counter)
+    elif isinstance(value, list):
+        for item in value:
+            _truncate_descriptions(item, max_chars, counter)
+
+
+def _scored_lists(value) -> list[list]:
+    output = []
+    if isinstance(value, dict):
+        for item in value.values():
+            output.extend(_scored_lists(item))
+    elif isinstance(value, list):
+        if value and all(isinstance(item, dict) and "score" in item for item in value):
+            output.append(value)
+        else:
+            for item in value:
+                output.extend(_scored_lists(item))
+    return output
+
+
+def _dedupe_context(payload: dict) -> int:
+    removed = 0
+    query = str(payload.get("query") or "").strip()
+    intent = payload.get("intent")
+    if isinstance(intent, dict) and query:
+        for key in ("query", "intent_summary"):
+            if str(intent.get(key) or "").strip() == query:
+                intent.pop(key, None)
+                removed += 1
+    # Selections carry their detail under `_detail`, which is often also passed as its own field.
+    siblings = [item for item in payload.values() if isinstance(item, dict)]
+    for item in siblings:
+        detail = item.get("_detail")
+        if detail is not None and any(other is not item and other == detail for other in siblings):
+            item.pop("_detail", None)
+            removed += 1
+    return removed
+
+
+def fit_prompt_payload(task: str, system_prompt: str, user_payload: dict, schema_hint: dict | None = None):
+    budget = task_token_budget(task)
+    payload = deepcopy(user_payload or {})
+    fixed_tokens = estimate_tokens(system_prompt) + estimate_tokens(compact_json(schema_hint or {}))
+
+    def _total() -> int:
+        return fixed_tokens + estimate_tokens(compact_json(payload))
+
+    original_tokens = _total()
+    total = original_tokens
+    deduped = 0
+    truncated = [0]
+    dropped = 0
+    # Each step runs only while the prompt is still over budget, cheapest loss first;
+    # a payload that already fits is sent exactly as built.
+    if total > budget:
+        deduped = _dedupe_context(payload)
+        total = _total()
+
+    if total > budget:
+        _truncate_descriptions(payload, max(int(settings.llm_prompt_description_max_chars), 16), truncated)
+        total = _total()
+
+    if total > budget:
+        min_keep = max(int(settings.llm_prompt_min_candidates), 1)
+        scored_lists = _scored_lists(payload)
+        for items in scored_lists:
+            items.sort(key=lambda item: float(item.get("score") or 0.0), reverse=True)
+        while total > budget:
+            longest = max(scored_lists, key=len, default=None)
+            if longest is None or len(longest) <= min_keep:
+                break
+            longest.pop()
+            dropped += 1
+            total = _total()
+
+    if total > budget:
+        # Last resort before sending over budget: shorten every description further.
+        _truncate_descriptions(payload, max(int(settings.llm_prompt_description_max_chars) // 3, 16), truncated)
+        total = _total()
+
+    return payload, {
+        "prompt_tokens_estimate": total,
+        "prompt_tokens_original": original_tokens,
+        "prompt_token_budget": budget,
+        "over_budget": total > budget,
+        "dropped_candidates": dropped,
+        "truncated_descriptions": truncated[0],
+        "deduplicated_fields": deduped,
+    }
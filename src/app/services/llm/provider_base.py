@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-import httpx
+from src.app.services.llm.client_registry import LLMClientRegistry
 
 
 class LLMProviderError(Exception):
@@ -94,15 +94,16 @@ class OpenAICompatibleProvider(BaseLLMProvider):
 
         timeout = timeout_seconds or self.timeout_seconds
         started = datetime.utcnow()
-        with httpx.Client(timeout=timeout) as client:
-            response = client.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=request_payload,
-            )
+        client = LLMClientRegistry.get_http_client(self.base_url)
+        response = client.post(
+            f"{self.base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            json=request_payload,
+            timeout=timeout,
+        )
         latency_ms = int((datetime.utcnow() - started).total_seconds() * 1000)
         if response.status_code >= 400:
             raise LLMProviderError(f"provider call failed({response.status_code}): {response.text[:300]}")
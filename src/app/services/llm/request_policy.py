@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import contextvars
+import math
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from threading import Lock
+
+from src.app.core.config import settings
+from src.app.services.llm.langchain_client import current_token_sink, llm_token_sink
+
+POLICY_MODES = {"off", "failover", "hedge"}
+PROVIDER_DEFAULT_BASE_URLS = {
+    "deepseek": "https://api.deepseek.com",
+    "qwen": "https://dashscope.aliyuncs.com/compatible-mode/v1",
+}
+
+_lock = Lock()
+_breakers: dict[str, dict] = {}
+_latencies: dict[str, deque] = {}
+_executor: ThreadPoolExecutor | None = None
+
+
+class LLMPolicyError(Exception):
+    def __init__(self, message: str, fallback_used: bool = False):
+        super().__init__(message)
+        self.fallback_used = fallback_used
+
+
+def _route_key(runtime_cfg: dict) -> str:
+    provider = str(runtime_cfg.get("provider") or "").strip().lower()
+    base_url = str(runtime_cfg.get("base_url") or PROVIDER_DEFAULT_BASE_URLS.get(provider) or "").rstrip("/")
+    return f"{provider}|{base_url}"
+
+
+def _latency_key(runtime_cfg: dict) -> str:
+    return f"{_route_key(runtime_cfg)}|{runtime_cfg.get('model') or ''}"
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(int(settings.llm_hedge_max_workers), 2),
+                    thread_name_prefix="llm-hedge",
+                )
+    return _executor
+
+
+def circuit_is_open(runtime_cfg: dict) -> bool:
+    # Read-only check: unlike circuit_allows it never claims the half-open probe.
+    with _lock:
+        state = _breakers.get(_route_key(runtime_cfg))
+        opened_at = state.get("opened_at") if state else None
+    return opened_at is not None and time.monotonic() - opened_at < float(settings.llm_circuit_reset_seconds)
+
+
+def circuit_allows(runtime_cfg: dict) -> bool:
+    key = _route_key(runtime_cfg)
+    now = time.monotonic()
+    with _lock:
+        state = _breakers.get(key)
+        if not state or state.get("opened_at") is None:
+            return True
+        if now - state["opened_at"] < float(settings.llm_circuit_reset_seconds):
+            return False
+        # Half-open: let one probe through and re-arm the window until it reports back.
+        state["opened_at"] = now
+        return True
+
+
+def record_success(runtime_cfg: dict, latency_ms: int) -> None:
+    with _lock:
+        _breakers[_route_key(runtime_cfg)] = {"failures": 0, "opened_at": None}
+        samples = _latencies.setdefault(
+            _latency_key(runtime_cfg),
+            deque(maxlen=max(int(settings.llm_latency_window_size), 1)),
+        )
+        samples.append(int(latency_ms))
+
+
+def record_failure(runtime_cfg: dict) -> None:
+    with _lock:
+        state = _breakers.setdefault(_route_key(runtime_cfg), {"failures": 0, "opened_at": None})
+        state["failures"] = int(state.get("failures") or 0) + 1
+        if state["failures"] >= max(int(settings.llm_circuit_failure_threshold), 1):
+            state["opened_at"] = time.monotonic()
+
+
+def hedge_delay_seconds(runtime_cfg: dict) -> float:
+    with _lock:
+        samples = sorted(_latencies.get(_latency_key(runtime_cfg)) or [])
+    if len(samples) < max(int(settings.llm_hedge_min_samples), 1):
+        return max(int(settings.llm_hedge_default_delay_ms), 0) / 1000.0
+    p95 = samples[min(len(samples) - 1, max(math.ceil(len(samples) * 0.95) - 1, 0))]
+    return max(p95, int(settings.llm_hedge_min_delay_ms)) / 1000.0
+
+
+def reset_policy_state() -> None:
+    with _lock:
+        _breakers.clear()
+        _latencies.clear()
+
+
+class LLMRequestPolicy:
+    @staticmethod
+    def mode() -> str:
+        mode = str(settings.llm_request_policy or "off").strip().lower()
+        return mode if mode in POLICY_MODES else "off"
+
+    @staticmethod
+    def fallback_runtime_config(runtime_cfg: dict) -> dict | None:
+        provider = str(runtime_cfg.get("fallback_provider") or "").strip().lower()
+        model = str(runtime_cfg.get("fallback_model") or "").strip()
+        if not provider or not model:
+            return None
+        base_url = runtime_cfg.get("base_url")
+        if provider != str(runtime_cfg.get("provider") or "").strip().lower():
+            # A custom base_url belongs to the primary provider; use the fallback's public endpoint.
+            base_url = PROVIDER_DEFAULT_BASE_URLS.get(provider) or base_url
+        return {
+            **runtime_cfg,
+            "provider": provider,
+            "model": model,
+            "api_key": runtime_cfg.get("fallback_api_key") or runtime_cfg.get("api_key"),
+            "base_url": base_url,
+            "fallback_provider": None,
+            "fallback_model": None,
+        }
+
+    @staticmethod
+    def _attempt(call, runtime_cfg: dict, audit_callback):
+        started = time.perf_counter()
+        try:
+            result = call(runtime_cfg, audit_callback)
+        except Exception:
+            record_failure(runtime_cfg)
+            raise
+        record_success(runtime_cfg, int((time.perf_counter() - started) * 1000))
+        return result
+
+    @classmethod
+    def invoke(cls, runtime_cfg: dict, call, audit_callback=None):
+        mode = cls.mode()
+        fallback_cfg = cls.fallback_runtime_config(runtime_cfg) if mode != "off" else None
+        if fallback_cfg is None:
+            try:
+                return cls._attempt(call, runtime_cfg, audit_callback)
+            except Exception as exc:
+                raise LLMPolicyError(str(exc)) from exc
+
+        if not circuit_allows(runtime_cfg):
+            _notify(audit_callback, runtime_cfg, fallback_cfg, mode, "circuit_open")
+            return cls._invoke_fallback(call, fallback_cfg, audit_callback)
+        if mode == "hedge" and not circuit_is_open(fallback_cfg):
+            return cls._invoke_hedged(call, runtime_cfg, fallback_cfg, audit_callback)
+
+        try:
+            return cls._attempt(call, runtime_cfg, audit_callback)
+        except Exception as exc:
+            _notify(audit_callback, runtime_cfg, fallback_cfg, mode, str(exc))
+            return cls._invoke_fallback(call, fallback_cfg, audit_callback)
+
+    @classmethod
+    def _invoke_fallback(cls, call, fallback_cfg: dict, audit_callback):
+        try:
+            return cls._attempt(call, fallback_cfg, audit_callback)
+        except Exception as exc:
+            raise LLMPolicyError(str(exc), fallback_used=True) from exc
+
+    @classmethod
+    def _invoke_hedged(cls, call, runtime_cfg: dict, fallback_cfg: dict, audit_callback):
+        # Attempts run on worker threads; their audit events and streamed tokens are buffered
+        # and only the winner's are replayed here, so trace writes stay on the caller's DB
+        # session and an SSE client never sees tokens from two routes interleaved.
+        executor = _get_executor()
+        attempts = {}
+        streaming = callable(current_token_sink())
+
+        def _submit(cfg: dict, route: str):
+            events: list = []
+            tokens: list = []
+
+            def _run():
+                with llm_token_sink(tokens.append if streaming else None):
+                    return cls._attempt(call, cfg, lambda event_type, payload: events.append((event_type, payload)))
+
+            future = executor.submit(contextvars.copy_context().run, _run)
+            attempts[future] = (route, cfg, events, tokens)
+            return future
+
+        primary = _submit(runtime_cfg, "primary")
+        delay = hedge_delay_seconds(runtime_cfg)
+        done, _ = wait([primary], timeout=delay)
+        if not done:
+            _submit(fallback_cfg, "fallback")
+
+        pending = set(attempts)
+        last_exc = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                route, cfg, events, tokens = attempts[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    last_exc = exc
+                    _replay(audit_callback, events)
+                    if route == "primary" and len(attempts) == 1:
+                        # Primary failed before the hedge fired: fail over right away.
+                        _notify(audit_callback, runtime_cfg, fallback_cfg, "hedge", str(exc))
+                        pending.add(_submit(fallback_cfg, "fallback"))
+                    continue
+                for loser in pending:
+                    # Not started yet: drop it. Already running: it finishes unobserved.
+                    loser.cancel()
+                _replay(audit_callback, events)
+                _replay_tokens(tokens)
+                if callable(audit_callback):
+                    audit_callback(
+                        "llm_hedge_resolved",
+                        {
+                            "winner": route,
+                            "provider": cfg.get("provider"),
+                            "model": cfg.get("model"),
+                            "hedged": len(attempts) > 1,
+                            "hedge_delay_ms": int(delay * 1000),
+                        },
+                    )
+                return result
+        raise LLMPolicyError(str(last_exc), fallback_used=len(attempts) > 1) from last_exc
+
+
+def _notify(audit_callback, runtime_cfg: dict, fallback_cfg: dict, mode: str, reason: str) -> None:
+    if not callable(audit_callback):
+        return
+    audit_callback(
+        "llm_fallback_triggered",
+        {
+            "mode": mode,
+            "reason": reason[:300],
+            "from_provider": runtime_cfg.get("provider"),
+            "from_model": runtime_cfg.get("model"),
+            "to_provider": fallback_cfg.get("provider"),
+            "to_model": fallback_cfg.get("model"),
+        },
+    )
+
+
+def _replay(audit_callback, events: list) -> None:
+    if not callable(audit_callback):
+        return
+    for event_type, payload in events:
+        audit_callback(event_type, payload)
+
+
+def _replay_tokens(tokens: list) -> None:
+    sink = current_token_sink()
+    if not callable(sink):
+        return
+    for token in tokens:
+        try:
+            sink(token)
+        except Exception:
+            pass
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+
+from src.app.core.config import settings
+from src.app.infra.redis_client import get_redis_client
+from src.app.services.ontology_version import ALL_TENANTS, add_ontology_change_listener, get_ontology_version
+
+_REDIS_KEY_PREFIX = "tw:llm_response:"
+
+
+class LLMResponseCache:
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._entries = OrderedDict()
+                    cls._instance._entries_lock = Lock()
+                    add_ontology_change_listener(cls._instance.invalidate_tenant)
+        return cls._instance
+
+    @staticmethod
+    def enabled_for(task: str) -> bool:
+        return bool(settings.llm_response_cache_enabled) and task in set(settings.llm_response_cache_tasks or [])
+
+    @staticmethod
+    def build_key(
+        tenant_id: str,
+        runtime_cfg: dict,
+        task: str,
+        system_prompt: str,
+        user_payload: dict,
+        schema_hint: dict | None,
+    ) -> str:
+        material = json.dumps(
+            {"system_prompt": system_prompt, "user_payload": user_payload, "schema_hint": schema_hint},
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
+        model = f"{runtime_cfg.get('provider') or ''}/{runtime_cfg.get('model') or ''}"
+        # Ontology version is part of the key so edits never serve decisions made on the old graph.
+        return f"{tenant_id}|{model}|{task}|{get_ontology_version(tenant_id)}|{digest}"
+
+    def get(self, key: str) -> dict | None:
+        now = time.monotonic()
+        with self._entries_lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return deepcopy(value)
+                self._entries.pop(key, None)
+
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(f"{_REDIS_KEY_PREFIX}{key}")
+        except Exception:
+            return None
+        if not raw:
+            return None
+        try:
+            value = json.loads(raw)
+        except Exception:
+            return None
+        if not isinstance(value, dict):
+            return None
+        self._store_local(key, value)
+        return deepcopy(value)
+
+    def put(self, key: str, value: dict) -> None:
+        if not isinstance(value, dict):
+            return
+        self._store_local(key, value)
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.setex(
+                f"{_REDIS_KEY_PREFIX}{key}",
+                max(int(settings.llm_response_cache_ttl_seconds), 1),
+                json.dumps(value, ensure_ascii=False, default=str),
+            )
+        except Exception:
+            pass
+
+    def _store_local(self, key: str, value: dict) -> None:
+        expires_at = time.monotonic() + max(int(settings.llm_response_cache_ttl_seconds), 1)
+        max_entries = max(int(settings.llm_response_cache_max_entries), 1)
+        with self._entries_lock:
+            self._entries[key] = (expires_at, deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_tenant(self, tenant_id: str) -> None:
+        with self._entries_lock:
+            if tenant_id == ALL_TENANTS:
+                self._entries.clear()
+                return
+            prefix = f"{tenant_id}|"
+            for key in [item for item in self._entries if item.startswith(prefix)]:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._entries_lock:
+            self._entries.clear()
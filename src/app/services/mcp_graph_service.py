@@ -129,18 +129,15 @@ class MCPGraphService:
                 for item in filtered_attrs
             ]
             trigram_sparse = HybridRetrievalEngine.build_pg_trgm_sparse_scores(self.repo.db, q, search_records)
-            scored = HybridRetrievalEngine.score_records(
+            scored = HybridRetrievalEngine.top_scored_records(
                 q,
                 search_records,
-                w_sparse=w_sparse,
-                w_dense=w_dense,
-                sparse_overrides=trigram_sparse,
-            )
-            scored = HybridRetrievalEngine.apply_top_n_and_gap(
-                scored,
                 top_n=top_n,
                 score_gap=score_gap,
                 relative_diff=relative_diff,
+                w_sparse=w_sparse,
+                w_dense=w_dense,
+                sparse_overrides=trigram_sparse,
             )
             item_by_code = {item["code"]: item for item in output}
             ordered = []
@@ -184,18 +181,15 @@ class MCPGraphService:
                 if not code_filter or item.code in code_filter
             ]
             trigram_sparse = HybridRetrievalEngine.build_pg_trgm_sparse_scores(self.repo.db, q, search_records)
-            scored = HybridRetrievalEngine.score_records(
+            scored = HybridRetrievalEngine.top_scored_records(
                 q,
                 search_records,
-                w_sparse=w_sparse,
-                w_dense=w_dense,
-                sparse_overrides=trigram_sparse,
-            )
-            scored = HybridRetrievalEngine.apply_top_n_and_gap(
-                scored,
                 top_n=top_n,
                 score_gap=score_gap,
                 relative_diff=relative_diff,
+                w_sparse=w_sparse,
+                w_dense=w_dense,
+                sparse_overrides=trigram_sparse,
             )
             item_by_code = {item["code"]: item for item in output}
             ordered = []
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from src.app.core.config import settings
 from src.app.core.secrets import mask_secret
+from src.app.infra.db.session import SessionLocal
+from src.app.infra.shared_cache import ALL_TENANTS, add_invalidation_handler, publish_invalidation
 from src.app.repositories.config_repo import SystemRuntimeConfigRepository
 from src.app.services.observability.runtime_config import replace_langfuse_runtime_config
 
@@ -66,6 +68,7 @@ class LangfuseConfigService:
         self.repo.upsert(LANGFUSE_CONFIG_KEY, sanitized)
         self.db.commit()
         replace_langfuse_runtime_config(sanitized)
+        publish_invalidation("langfuse_config", ALL_TENANTS)
         return {
             **sanitized,
             "secret_key_masked": mask_secret(sanitized.get("secret_key") or ""),
@@ -76,3 +79,15 @@ class LangfuseConfigService:
         payload = self._get_stored_or_default()
         replace_langfuse_runtime_config(payload)
         return payload
+
+
+def _reload_langfuse_config(_tenant_id: str) -> None:
+    # Secrets never travel over Redis: other workers re-read the stored config instead.
+    db = SessionLocal()
+    try:
+        LangfuseConfigService(db).bootstrap_runtime_from_db()
+    finally:
+        db.close()
+
+
+add_invalidation_handler("langfuse_config", _reload_langfuse_config)
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+import atexit
 import json
+import queue
+import time
 import uuid
-from threading import Lock
+from threading import Condition, Lock, Thread
 
 from src.app.core.config import settings
-from src.app.services.observability.runtime_config import get_langfuse_runtime_config
+from src.app.core.lazy_imports import timed_import
+from src.app.services.observability.runtime_config import (
+    get_langfuse_runtime_config,
+    get_langfuse_runtime_version,
+)
 
-try:
-    from langfuse import Langfuse
+Langfuse = None
+_LANGFUSE_IMPORT_ERROR = None
 
-    _LANGFUSE_IMPORT_ERROR = None
-except Exception as exc:  # pragma: no cover
-    Langfuse = None
-    _LANGFUSE_IMPORT_ERROR = str(exc)
+
+def _load_langfuse() -> str | None:
+    # Only imported once Langfuse export is actually enabled for the process.
+    global Langfuse, _LANGFUSE_IMPORT_ERROR
+    if Langfuse is None and _LANGFUSE_IMPORT_ERROR is None:
+        try:
+            Langfuse = timed_import("langfuse").Langfuse
+        except Exception as exc:  # pragma: no cover
+            _LANGFUSE_IMPORT_ERROR = str(exc)
+    return _LANGFUSE_IMPORT_ERROR
+
+
+_STOP = object()
 
 
 class LangfuseSink:
@@ -28,8 +44,17 @@ class LangfuseSink:
                     cls._instance = super().__new__(cls)
                     cls._instance._client = None
                     cls._instance._disabled = False
-                    cls._instance._fingerprint = None
-                    cls._instance._init_client()
+                    cls._instance._config_version = None
+                    cls._instance._payload_max_chars = 2000
+                    cls._instance._queue = queue.Queue(maxsize=max(int(settings.langfuse_export_queue_size), 1))
+                    cls._instance._worker = None
+                    cls._instance._worker_lock = Lock()
+                    cls._instance._flush_lock = Lock()
+                    cls._instance._unflushed = 0
+                    cls._instance._stats = {"exported": 0, "dropped": 0, "failed": 0, "flushes": 0}
+                    cls._instance._stats_lock = Lock()
+                    cls._instance._ensure_client()
+                    atexit.register(cls._instance.shutdown)
         return cls._instance
 
     def _init_client(self) -> None:
@@ -38,7 +63,7 @@ class LangfuseSink:
             self._disabled = True
             self._client = None
             return
-        if _LANGFUSE_IMPORT_ERROR or Langfuse is None:
+        if _load_langfuse() or Langfuse is None:
             self._disabled = True
             self._client = None
             return
@@ -69,33 +94,28 @@ class LangfuseSink:
             self._client = None
 
     def _ensure_client(self) -> None:
+        version = get_langfuse_runtime_version()
+        if version == self._config_version:
+            return
+        self._config_version = version
         cfg = get_langfuse_runtime_config()
-        fingerprint = (
-            bool(cfg.get("enabled")),
-            str(cfg.get("public_key") or ""),
-            str(cfg.get("secret_key") or ""),
-            str(cfg.get("host") or ""),
-            str(cfg.get("environment") or ""),
-            str(cfg.get("release") or ""),
+        self._payload_max_chars = max(
+            int(cfg.get("audit_payload_max_chars") or settings.audit_payload_max_chars or 0),
+            2000,
         )
-        if fingerprint != self._fingerprint:
-            self._fingerprint = fingerprint
-            self._init_client()
-
-    @staticmethod
-    def _trim_payload(payload: dict) -> dict:
-        runtime_cfg = get_langfuse_runtime_config()
-        max_chars = max(int(runtime_cfg.get("audit_payload_max_chars") or settings.audit_payload_max_chars or 0), 2000)
+        self._init_client()
+
+    def _trim_payload(self, payload: dict) -> dict:
         try:
             text = json.dumps(payload or {}, ensure_ascii=False, default=str)
         except Exception:
             text = str(payload)
-        if len(text) <= max_chars:
+        if len(text) <= self._payload_max_chars:
             return payload or {}
         return {
             "truncated": True,
             "size": len(text),
-            "preview": text[:max_chars],
+            "preview": text[: self._payload_max_chars],
         }
 
     def emit_event(
@@ -108,14 +128,65 @@ class LangfuseSink:
         event_type: str,
         payload: dict,
     ) -> None:
+        # Request path only enqueues; trimming and SDK calls happen on the exporter thread.
         self._ensure_client()
         if self._disabled or self._client is None:
             return
-        safe_payload = self._trim_payload(payload or {})
+        self._ensure_worker()
+        try:
+            # Shallow copy: the caller keeps using its dict after this returns.
+            self._queue.put_nowait((tenant_id, session_id, trace_id, step, event_type, dict(payload or {})))
+        except queue.Full:
+            self._count("dropped")
+
+    def _count(self, name: str) -> None:
+        # Request threads and the exporter thread both update the counters.
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = Thread(target=self._run_exporter, name="langfuse-exporter", daemon=True)
+                self._worker.start()
+
+    def _run_exporter(self) -> None:
+        batch_size = max(int(settings.langfuse_export_batch_size), 1)
+        interval = max(float(settings.langfuse_export_flush_interval_seconds), 0.05)
+        first_pending_at = None
+        while True:
+            try:
+                item = self._queue.get(timeout=interval)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._queue.task_done()
+                self._flush_client()
+                return
+            if item is not None:
+                try:
+                    self._export(*item)
+                finally:
+                    self._queue.task_done()
+                if first_pending_at is None:
+                    first_pending_at = time.monotonic()
+            if self._unflushed and (
+                self._unflushed >= batch_size or time.monotonic() - (first_pending_at or 0) >= interval
+            ):
+                self._flush_client()
+                first_pending_at = None
+
+    def _export(self, tenant_id, session_id, trace_id, step, event_type, payload) -> None:
+        client = self._client
+        if client is None:
+            return
+        safe_payload = self._trim_payload(payload)
         effective_trace_id = (str(trace_id or "").strip() or f"trace_{uuid.uuid4().hex}")
         try:
-            # SDK API may vary by version; keep best-effort and never block request path.
-            self._client.trace(
+            # SDK API may vary by version; keep best-effort.
+            client.trace(
                 id=effective_trace_id,
                 name="theworld_reasoning_audit",
                 session_id=session_id,
@@ -135,14 +206,55 @@ class LangfuseSink:
                 "session_id": session_id,
                 "payload": safe_payload,
             }
-            if hasattr(self._client, "event"):
-                self._client.event(
+            if hasattr(client, "event"):
+                client.event(
                     trace_id=effective_trace_id,
                     name=f"theworld.{event_type}",
                     metadata=event_payload,
                 )
-
-            if hasattr(self._client, "flush"):
-                self._client.flush()
+            self._count("exported")
+            with self._flush_lock:
+                self._unflushed += 1
         except Exception:
+            self._count("failed")
+
+    def _flush_client(self) -> None:
+        with self._flush_lock:
+            if not self._unflushed:
+                return
+            self._unflushed = 0
+            client = self._client
+        if client is not None and hasattr(client, "flush"):
+            try:
+                client.flush()
+                self._count("flushes")
+            except Exception:
+                self._count("failed")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        deadline = time.monotonic() + (timeout if timeout is not None else settings.langfuse_export_shutdown_timeout_seconds)
+        condition: Condition = self._queue.all_tasks_done
+        with condition:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                condition.wait(remaining)
+        self._flush_client()
+        return True
+
+    def shutdown(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._flush_client()
             return
+        self.flush()
+        try:
+            self._queue.put(_STOP, timeout=1.0)
+        except queue.Full:
+            return
+        self._worker.join(timeout=max(float(settings.langfuse_export_shutdown_timeout_seconds), 0.1))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {**stats, "queued": self._queue.qsize()}
@@ -16,6 +16,8 @@ _state = {
     "release": settings.langfuse_release or "",
     "audit_payload_max_chars": int(settings.audit_payload_max_chars or 24000),
 }
+# Bumped on every change so hot paths can detect updates without copying the config.
+_version = 0
 
 
 def get_langfuse_config(mask_secret_key: bool = True) -> dict:
@@ -27,8 +29,14 @@ def get_langfuse_config(mask_secret_key: bool = True) -> dict:
     return payload
 
 
+def get_langfuse_runtime_version() -> int:
+    return _version
+
+
 def update_langfuse_config(payload: dict) -> dict:
+    global _version
     with _lock:
+        _version += 1
         if "enabled" in payload:
             _state["enabled"] = bool(payload.get("enabled"))
         for key in ("public_key", "host", "environment", "release"):
@@ -50,7 +58,9 @@ def get_langfuse_runtime_config() -> dict:
 
 
 def replace_langfuse_runtime_config(payload: dict) -> dict:
+    global _version
     with _lock:
+        _version += 1
         _state["enabled"] = bool(payload.get("enabled"))
         _state["public_key"] = str(payload.get("public_key") or "").strip()
         _state["secret_key"] = str(payload.get("secret_key") or "").strip()
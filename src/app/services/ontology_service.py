@@ -1,4 +1,5 @@
 from collections import defaultdict, deque
+import hashlib
 import json
 import re
 
@@ -11,8 +12,31 @@ from sqlalchemy.orm import Session
 from src.app.core.config import settings
 from src.app.core.errors import AppError, ErrorCodes
 from src.app.domain.retrieval.hybrid_engine import HybridRetrievalEngine
+from src.app.infra.shared_cache import SharedCache
 from src.app.repositories.ontology_repo import OntologyRepository
 from src.app.services.embedding_service import EmbeddingService
+from src.app.services.ontology_version import add_ontology_change_listener, get_ontology_version
+
+HYBRID_SEARCH_TYPES = ("ontology", "data-attr", "obj-prop", "capability")
+
+# Scored results are keyed by the tenant's ontology version, so an edit never serves stale
+# rankings; the listener only frees the local entries that can no longer be hit.
+_hybrid_search_cache = SharedCache(
+    "hybrid_search",
+    ttl_seconds=settings.hybrid_search_cache_ttl_seconds,
+    max_entries=settings.hybrid_search_cache_max_entries,
+)
+add_ontology_change_listener(_hybrid_search_cache.clear_local)
+
+
+def hybrid_search_cache_key(tenant_id: str, query: str, resource_types: list[str], **params) -> str:
+    material = json.dumps(
+        {"query": query, "resource_types": sorted(resource_types), **params},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
+    return f"{get_ontology_version(tenant_id)}:{digest}"
 
 
 def _is_valid_json_schema(schema: dict) -> bool:
@@ -160,75 +184,118 @@ class OntologyService:
                 },
             }
 
-        type_set = set(resource_types or ["ontology", "data-attr", "obj-prop", "capability"])
+        types = sorted(set(resource_types or HYBRID_SEARCH_TYPES))
+        params = {
+            "top_k": top_k,
+            "score_gap": score_gap,
+            "relative_diff": relative_diff,
+            "w_sparse": w_sparse,
+            "w_dense": w_dense,
+        }
+        if not settings.hybrid_search_cache_enabled:
+            return self._score_search_records(q, self._search_records(tenant_id, types), **params)
+        key = hybrid_search_cache_key(tenant_id, q, types, **params)
+        return _hybrid_search_cache.get_or_load(
+            tenant_id,
+            key,
+            lambda: self._score_search_records(q, self._search_records(tenant_id, types), **params),
+        )
+
+    def warm_hybrid_search(
+        self,
+        tenant_id: str,
+        queries: list[str],
+        resource_types: list[str] | None = None,
+        min_prefix_chars: int = 1,
+        max_entries: int = 200,
+        top_k: int = 80,
+        score_gap: float = 0.0,
+        relative_diff: float = 0.0,
+        w_sparse: float = 0.45,
+        w_dense: float = 0.55,
+    ) -> dict:
+        # Typeahead issues every prefix of a query, so those are what gets warmed.
+        prefixes: list[str] = []
+        for query in queries or []:
+            text_value = (query or "").strip()
+            for end in range(max(int(min_prefix_chars), 1), len(text_value) + 1):
+                prefix = text_value[:end].strip()
+                if prefix and prefix not in prefixes:
+                    prefixes.append(prefix)
+        prefixes = prefixes[: max(int(max_entries), 0)]
+
+        types = sorted(set(resource_types or HYBRID_SEARCH_TYPES))
+        params = {
+            "top_k": top_k,
+            "score_gap": score_gap,
+            "relative_diff": relative_diff,
+            "w_sparse": w_sparse,
+            "w_dense": w_dense,
+        }
+        keys = {prefix: hybrid_search_cache_key(tenant_id, prefix, types, **params) for prefix in prefixes}
+        cached = _hybrid_search_cache.get_many(tenant_id, list(keys.values())) if keys else {}
+        missing = [prefix for prefix in prefixes if keys[prefix] not in cached]
+        if missing:
+            # One resource load serves every prefix.
+            records = self._search_records(tenant_id, types)
+            _hybrid_search_cache.set_many(
+                tenant_id,
+                {keys[prefix]: self._score_search_records(prefix, records, **params) for prefix in missing},
+            )
+        return {"prefixes": len(prefixes), "warmed": len(missing), "already_cached": len(prefixes) - len(missing)}
+
+    @staticmethod
+    def hybrid_search_cache_stats() -> dict:
+        return _hybrid_search_cache.stats()
+
+    def _search_records(self, tenant_id: str, types: list[str]) -> list[dict]:
+        type_set = set(types)
         records: list[dict] = []
         classes = self.repo.list_classes(tenant_id, status=1) if "ontology" in type_set else []
         attrs = self.repo.list_all_attributes(tenant_id) if "data-attr" in type_set else []
         relations = self.repo.list_all_relations(tenant_id) if "obj-prop" in type_set else []
         caps = self.repo.list_all_capabilities(tenant_id) if "capability" in type_set else []
 
-        for item in classes:
-            records.append(
-                {
-                    "resource_type": "ontology",
-                    "id": item.id,
-                    "code": item.code,
-                    "name": item.name,
-                    "description": item.description,
-                    "search_text": item.search_text or self._search_text(item.name, item.code, item.description),
-                    "embedding": item.embedding or [],
-                }
-            )
-        for item in attrs:
-            records.append(
-                {
-                    "resource_type": "data-attr",
-                    "id": item.id,
-                    "code": item.code,
-                    "name": item.name,
-                    "description": item.description,
-                    "search_text": item.search_text or self._search_text(item.name, item.code, item.description),
-                    "embedding": item.embedding or [],
-                }
-            )
-        for item in relations:
-            records.append(
-                {
-                    "resource_type": "obj-prop",
-                    "id": item.id,
-                    "code": item.code,
-                    "name": item.name,
-                    "description": item.description,
-                    "search_text": item.search_text or self._search_text(item.name, item.code, item.description),
-                    "embedding": item.embedding or [],
-                }
-            )
-        for item in caps:
-            records.append(
-                {
-                    "resource_type": "capability",
-                    "id": item.id,
-                    "code": item.code,
-                    "name": item.name,
-                    "description": item.description,
-                    "search_text": item.search_text or self._search_text(item.name, item.code, item.description),
-                    "embedding": item.embedding or [],
-                }
-            )
+        for resource_type, rows in (
+            ("ontology", classes),
+            ("data-attr", attrs),
+            ("obj-prop", relations),
+            ("capability", caps),
+        ):
+            for item in rows:
+                records.append(
+                    {
+                        "resource_type": resource_type,
+                        "id": item.id,
+                        "code": item.code,
+                        "name": item.name,
+                        "description": item.description,
+                        "search_text": item.search_text or self._search_text(item.name, item.code, item.description),
+                        "embedding": item.embedding or [],
+                    }
+                )
+        return records
 
+    def _score_search_records(
+        self,
+        q: str,
+        records: list[dict],
+        top_k: int,
+        score_gap: float,
+        relative_diff: float,
+        w_sparse: float,
+        w_dense: float,
+    ) -> dict:
         trigram_sparse = HybridRetrievalEngine.build_pg_trgm_sparse_scores(self.db, q, records)
-        scored = HybridRetrievalEngine.score_records(
+        scored = HybridRetrievalEngine.top_scored_records(
             q,
             records,
-            w_sparse=w_sparse,
-            w_dense=w_dense,
-            sparse_overrides=trigram_sparse,
-        )
-        scored = HybridRetrievalEngine.apply_top_n_and_gap(
-            scored,
             top_n=top_k,
             score_gap=score_gap,
             relative_diff=relative_diff,
+            w_sparse=w_sparse,
+            w_dense=w_dense,
+            sparse_overrides=trigram_sparse,
         )
         grouped: dict[str, list[int]] = {"ontology": [], "data-attr": [], "obj-prop": [], "capability": []}
         for item in scored:
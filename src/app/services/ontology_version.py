@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.app.infra.redis_client import get_redis_client
+from src.app.infra.shared_cache import ALL_TENANTS, add_invalidation_handler, publish_invalidation
+
+_PENDING_KEY = "ontology_changed_tenants"
+_REDIS_KEY_PREFIX = "tw:ontology_version:"
+
+_lock = Lock()
+_versions: dict[str, int] = {}
+_listeners: list = []
+
+
+def _is_ontology_table(table_name: str | None) -> bool:
+    name = str(table_name or "")
+    return name.startswith("ontology_") and name != "ontology_export_task"
+
+
+def add_ontology_change_listener(callback) -> None:
+    with _lock:
+        if callback not in _listeners:
+            _listeners.append(callback)
+
+
+def get_ontology_version(tenant_id: str) -> str:
+    client = get_redis_client()
+    if client is not None:
+        try:
+            global_value, tenant_value = client.mget(
+                f"{_REDIS_KEY_PREFIX}{ALL_TENANTS}",
+                f"{_REDIS_KEY_PREFIX}{tenant_id}",
+            )
+            return f"{int(global_value or 0)}.{int(tenant_value or 0)}"
+        except Exception:
+            pass
+    with _lock:
+        return f"{_versions.get(ALL_TENANTS, 0)}.{_versions.get(tenant_id, 0)}"
+
+
+def _apply_ontology_change(key: str) -> None:
+    with _lock:
+        _versions[key] = int(_versions.get(key) or 0) + 1
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(key)
+        except Exception:
+            pass
+
+
+def bump_ontology_version(tenant_id: str | None) -> None:
+    key = tenant_id or ALL_TENANTS
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.incr(f"{_REDIS_KEY_PREFIX}{key}")
+        except Exception:
+            pass
+    _apply_ontology_change(key)
+    publish_invalidation("ontology", key)
+
+
+# Other workers only need their local caches dropped; the shared counter is already bumped.
+add_invalidation_handler("ontology", _apply_ontology_change)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session, flush_context) -> None:
+    changed = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not _is_ontology_table(getattr(obj, "__tablename__", None)):
+            continue
+        if changed is None:
+            changed = session.info.setdefault(_PENDING_KEY, set())
+        changed.add(getattr(obj, "tenant_id", None) or ALL_TENANTS)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    table = getattr(mapper, "local_table", None) if mapper is not None else None
+    if _is_ontology_table(getattr(table, "name", None)):
+        # The WHERE clause is opaque here, so treat bulk statements as touching every tenant.
+        orm_execute_state.session.info.setdefault(_PENDING_KEY, set()).add(ALL_TENANTS)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session) -> None:
+    changed = session.info.pop(_PENDING_KEY, None)
+    for tenant_id in sorted(changed or []):
+        bump_ontology_version(tenant_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import uuid
+from threading import Lock
+
+from src.app.core.lazy_imports import timed_import
+from src.app.repositories.reasoning_repo import ReasoningRepository
+
+_CHECKPOINT_IMPORT_ERROR = None
+_checkpoint_lock = Lock()
+_checkpoint_saver = None
+
+
+def get_checkpoint_saver():
+    # LangGraph writes checkpoints from its own background threads, so node-level
+    # checkpoints stay in this thread-safe in-process saver while a run is active.
+    # Only the checkpoint a run stops on is persisted, through the run's DB session.
+    global _checkpoint_saver, _CHECKPOINT_IMPORT_ERROR
+    if _checkpoint_saver is None and _CHECKPOINT_IMPORT_ERROR is None:
+        with _checkpoint_lock:
+            if _checkpoint_saver is None and _CHECKPOINT_IMPORT_ERROR is None:
+                try:
+                    _checkpoint_saver = timed_import("langgraph.checkpoint.memory").InMemorySaver()
+                except Exception:
+                    _CHECKPOINT_IMPORT_ERROR = "langgraph checkpoint dependency is required"
+    return _checkpoint_saver
+
+
+class ReasoningCheckpointStore:
+    def __init__(self, db):
+        self.repo = ReasoningRepository(db)
+
+    @staticmethod
+    def new_thread_config(session_id: str) -> dict:
+        return {"configurable": {"thread_id": f"{session_id}:{uuid.uuid4().hex}", "checkpoint_ns": ""}}
+
+    @staticmethod
+    def release(thread_config: dict) -> None:
+        saver = get_checkpoint_saver()
+        if saver is None:
+            return
+        saver.delete_thread(thread_config["configurable"]["thread_id"])
+
+    def save(self, session_id: str, turn_id: int, thread_config: dict, resume_node: str):
+        saver = get_checkpoint_saver()
+        if saver is None:
+            return None
+        checkpoint_tuple = saver.get_tuple(thread_config)
+        if checkpoint_tuple is None:
+            return None
+        # `writes` repeats the full state already held in the checkpoint.
+        metadata = {key: value for key, value in (checkpoint_tuple.metadata or {}).items() if key != "writes"}
+        return self.repo.create_checkpoint(
+            session_id=session_id,
+            turn_id=turn_id,
+            checkpoint_id=str(checkpoint_tuple.checkpoint["id"]),
+            resume_node=resume_node,
+            checkpoint_typed=saver.serde.dumps_typed(checkpoint_tuple.checkpoint),
+            metadata_typed=saver.serde.dumps_typed(metadata),
+        )
+
+    def restore(self, checkpoint_obj, thread_config: dict) -> bool:
+        saver = get_checkpoint_saver()
+        if saver is None:
+            return False
+        try:
+            checkpoint = saver.serde.loads_typed(
+                (checkpoint_obj.checkpoint_type, checkpoint_obj.checkpoint_blob)
+            )
+            metadata = saver.serde.loads_typed((checkpoint_obj.metadata_type, checkpoint_obj.metadata_blob))
+        except Exception:
+            return False
+        saver.put(thread_config, checkpoint, metadata, checkpoint.get("channel_versions") or {})
+        return True
+
+    def find_resumable(self, session_id: str, turn_id: int):
+        return self.repo.latest_checkpoint(session_id, turn_id, "answered")
+
+    def mark_answered(self, session_id: str, turn_id: int, answer: dict):
+        checkpoint_obj = self.repo.latest_checkpoint(session_id, turn_id, "waiting")
+        if checkpoint_obj is None:
+            return None
+        return self.repo.update_checkpoint(checkpoint_obj, {"status": "answered", "answer_json": answer or {}})
+
+    def mark_consumed(self, checkpoint_obj) -> None:
+        self.repo.update_checkpoint(checkpoint_obj, {"status": "consumed"})
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from src.app.core.errors import AppError, ErrorCodes
+from src.app.repositories.reasoning_repo import AsyncReasoningRepository
+from src.app.services.reasoning_service import ReasoningService
+from src.app.services.trace_service import TraceService, parse_trace_fields
+
+
+class ReasoningReadService:
+    # Async counterpart of the read-only ReasoningService endpoints. Trace events written by
+    # other requests are committed before they become visible, so no buffer flush is needed.
+    def __init__(self, db):
+        self.repo = AsyncReasoningRepository(db)
+
+    async def _require_session(self, tenant_id: str, session_id: str):
+        session = await self.repo.get_session(tenant_id, session_id)
+        if not session:
+            raise AppError(ErrorCodes.NOT_FOUND, "reasoning session not found")
+        return session
+
+    async def get_session(self, tenant_id: str, session_id: str) -> dict:
+        session = await self._require_session(tenant_id, session_id)
+        latest_turn = await self.repo.latest_turn(session_id)
+        pending_clarification = await self.repo.latest_pending_clarification(session_id)
+        tasks = await self.repo.list_tasks(session_id, turn_id=latest_turn.id if latest_turn else None)
+        return ReasoningService.session_view(session, latest_turn, pending_clarification, tasks)
+
+    async def list_trace(self, tenant_id: str, session_id: str) -> dict:
+        await self._require_session(tenant_id, session_id)
+        items = await self.repo.list_trace_events(session_id)
+        return {"items": [TraceService.event_view(item) for item in items]}
+
+    async def page_trace(
+        self,
+        tenant_id: str,
+        session_id: str,
+        after_id: int = 0,
+        limit: int = 100,
+        steps: list[str] | None = None,
+        event_types: list[str] | None = None,
+        turn_id: int | None = None,
+        fields: str | None = None,
+    ) -> dict:
+        projected = parse_trace_fields(fields)
+        await self._require_session(tenant_id, session_id)
+        rows = await self.repo.page_trace_events(
+            session_id,
+            after_id=after_id,
+            limit=limit + 1,
+            steps=steps,
+            event_types=event_types,
+            turn_id=turn_id,
+            include_payload="payload" in projected,
+        )
+        return TraceService.page_view(rows, limit, projected)
+
+    async def get_trace_event(self, tenant_id: str, session_id: str, event_id: int) -> dict:
+        await self._require_session(tenant_id, session_id)
+        item = await self.repo.get_trace_event(session_id, event_id)
+        if item is None:
+            raise AppError(ErrorCodes.NOT_FOUND, "trace event not found")
+        return TraceService.event_view(item)
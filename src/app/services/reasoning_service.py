@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from threading import Lock
 
+from src.app.core.config import settings
 from src.app.core.errors import AppError, ErrorCodes
+from src.app.core.lazy_imports import timed_import
+from src.app.infra.db.session import SessionLocal
 from src.app.repositories.ontology_repo import OntologyRepository
 from src.app.repositories.reasoning_repo import ReasoningRepository
 from src.app.services.context_service import ContextService
 from src.app.services.graph_tool_agent import GraphToolAgent
 from src.app.services.llm.langchain_client import LangChainLLMClient
+from src.app.services.llm.prompt_budget import fit_prompt_payload
+from src.app.services.llm.request_policy import LLMRequestPolicy
+from src.app.services.llm.response_cache import LLMResponseCache
 from src.app.services.mcp_data_service import MCPDataService
+from src.app.services.reasoning_checkpoint import ReasoningCheckpointStore, get_checkpoint_saver
 from src.app.services.reasoning_executors import (
     LLMCapabilityExecutor,
     LLMObjectPropertyExecutor,
@@ -16,33 +27,119 @@ from src.app.services.reasoning_executors import (
 from src.app.services.tenant_llm_config_service import TenantLLMConfigService
 from src.app.services.trace_service import TraceService
 
-try:
-    from langgraph.graph import END, StateGraph
+END = None
+StateGraph = None
+_LANGGRAPH_IMPORT_ERROR = None
 
-    _LANGGRAPH_IMPORT_ERROR = None
-except Exception:
-    END = None
-    StateGraph = None
-    _LANGGRAPH_IMPORT_ERROR = "langgraph dependency is required"
+
+def _load_langgraph() -> str | None:
+    global END, StateGraph, _LANGGRAPH_IMPORT_ERROR
+    if StateGraph is None and _LANGGRAPH_IMPORT_ERROR is None:
+        try:
+            graph = timed_import("langgraph.graph")
+            END = graph.END
+            StateGraph = graph.StateGraph
+        except Exception:
+            _LANGGRAPH_IMPORT_ERROR = "langgraph dependency is required"
+    return _LANGGRAPH_IMPORT_ERROR
+
+_graph_io_lock = Lock()
+_graph_io_executor: ThreadPoolExecutor | None = None
+
+
+def _get_graph_io_executor() -> ThreadPoolExecutor:
+    global _graph_io_executor
+    with _graph_io_lock:
+        if _graph_io_executor is None:
+            _graph_io_executor = ThreadPoolExecutor(
+                max_workers=max(int(settings.reasoning_graph_io_max_workers), 1),
+                thread_name_prefix="reasoning-graph-io",
+            )
+        return _graph_io_executor
+
+
+def _call_graph_tool_isolated(tenant_id: str, tool_name: str, arguments: dict):
+    # Runs on the graph io pool, so it must not share the request's session.
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = GraphToolAgent(db).call(tenant_id, tool_name, arguments)
+        return result, round((time.perf_counter() - started) * 1000, 2)
+    finally:
+        db.close()
+
+
+_DETAIL_TOOL_ARGUMENT = {
+    "graph.get_ontology_details": "ontologyCodes",
+    "graph.get_capability_details": "capabilityCodes",
+    "graph.get_object_property_details": "objectPropertyCodes",
+}
+
+
+def _prefetch_detail_bundle(tenant_id: str, ontology_codes: list[str]) -> dict:
+    # Ontology details first, then the capabilities/object properties they expose.
+    limit = max(int(settings.reasoning_prefetch_max_details), 1)
+    bundle: dict[tuple[str, str], dict] = {}
+    ontology_rows, _ = _call_graph_tool_isolated(tenant_id, "graph.get_ontology_details", {"ontologyCodes": ontology_codes})
+    capability_codes: list[str] = []
+    object_property_codes: list[str] = []
+    for row in ontology_rows or []:
+        bundle[("graph.get_ontology_details", str(row.get("code") or ""))] = row
+        capability_codes.extend(str(item.get("code") or "").strip() for item in row.get("capabilities") or [])
+        object_property_codes.extend(str(item.get("code") or "").strip() for item in row.get("objectProperties") or [])
+    for tool_name, codes in (
+        ("graph.get_capability_details", capability_codes),
+        ("graph.get_object_property_details", object_property_codes),
+    ):
+        codes = list(dict.fromkeys(code for code in codes if code))[:limit]
+        if not codes:
+            continue
+        rows, _ = _call_graph_tool_isolated(tenant_id, tool_name, {_DETAIL_TOOL_ARGUMENT[tool_name]: codes})
+        for row in rows or []:
+            bundle[(tool_name, str(row.get("code") or ""))] = row
+    return bundle
 
 
 class ReasoningService:
+    # Executors are stateless, so one instance per process is shared by every run.
+    capability_executor = LLMCapabilityExecutor()
+    object_property_executor = LLMObjectPropertyExecutor()
+
     def __init__(self, db):
-        if _LANGGRAPH_IMPORT_ERROR:
-            raise AppError(ErrorCodes.INTERNAL, _LANGGRAPH_IMPORT_ERROR)
+        error = _load_langgraph()
+        if error:
+            raise AppError(ErrorCodes.INTERNAL, error)
         LangChainLLMClient.ensure_dependencies()
 
         self.db = db
         self.repo = ReasoningRepository(db)
-        self.ontology_repo = OntologyRepository(db)
-        self.graph_agent = GraphToolAgent(db)
-        self.mcp_data_service = MCPDataService(db)
-        self.context_service = ContextService(db)
         self.trace_service = TraceService(db)
-        self.tenant_llm_service = TenantLLMConfigService(db)
-        self.capability_executor = LLMCapabilityExecutor()
-        self.object_property_executor = LLMObjectPropertyExecutor()
-        self._compiled_graph = None
+        self._detail_cache: dict[tuple[str, str], dict] = {}
+        self._detail_prefetch = None
+
+    @cached_property
+    def ontology_repo(self) -> OntologyRepository:
+        return OntologyRepository(self.db)
+
+    @cached_property
+    def graph_agent(self) -> GraphToolAgent:
+        return GraphToolAgent(self.db)
+
+    @cached_property
+    def mcp_data_service(self) -> MCPDataService:
+        return MCPDataService(self.db)
+
+    @cached_property
+    def context_service(self) -> ContextService:
+        return ContextService(self.db)
+
+    @cached_property
+    def tenant_llm_service(self) -> TenantLLMConfigService:
+        return TenantLLMConfigService(self.db)
+
+    @cached_property
+    def checkpoint_store(self) -> ReasoningCheckpointStore:
+        return ReasoningCheckpointStore(self.db)
 
     @staticmethod
     def _extract_keywords(query: str) -> list[str]:
@@ -82,11 +179,8 @@ class ReasoningService:
         return output
 
     def _read_latest_context_value(self, session_id: str, key: str, scopes: list[str] | None = None):
-        items = self.repo.list_context(session_id, scopes or ["session", "artifact", "global"])
-        for item in reversed(items):
-            if item.key == key:
-                return item.value_json or {}
-        return {}
+        item = self.repo.latest_context(session_id, key, scopes or ["session", "artifact", "global"])
+        return (item.value_json or {}) if item is not None else {}
 
     def _graph_call(
         self,
@@ -107,18 +201,143 @@ class ReasoningService:
             trace_id=trace_id,
             tenant_id=tenant_id,
         )
+        started = time.perf_counter()
         result = self.graph_agent.call(tenant_id, tool_name, arguments)
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
         self.trace_service.emit(
             session_id=session_id,
             turn_id=turn_id,
             step=step,
             event_type="mcp_call_completed",
-            payload={"method": "mcp.graph.tools:call", "tool": tool_name, "result": result},
+            payload={"method": "mcp.graph.tools:call", "tool": tool_name, "result": result, "latency_ms": latency_ms},
             trace_id=trace_id,
             tenant_id=tenant_id,
         )
         return result
 
+    def _start_detail_prefetch(self, tenant_id: str, candidates: list[dict]) -> None:
+        top_k = int(settings.reasoning_prefetch_top_k)
+        if top_k <= 0 or int(settings.reasoning_graph_io_max_workers) <= 1 or self._detail_prefetch is not None:
+            return
+        codes = [str(item.get("code") or "").strip() for item in candidates[:top_k]]
+        codes = [
+            code
+            for code in dict.fromkeys(codes)
+            if code and ("graph.get_ontology_details", code) not in self._detail_cache
+        ]
+        if not codes:
+            return
+        future = _get_graph_io_executor().submit(_prefetch_detail_bundle, tenant_id, codes)
+        self._detail_prefetch = (future, set(codes))
+
+    def _collect_detail_prefetch(self, tool_name: str, code: str) -> None:
+        if self._detail_prefetch is None:
+            return
+        future, ontology_codes = self._detail_prefetch
+        if tool_name == "graph.get_ontology_details" and code not in ontology_codes and not future.done():
+            return
+        self._detail_prefetch = None
+        try:
+            self._detail_cache.update(future.result())
+        except Exception:
+            # Speculative work only; the regular lookup below covers any failure.
+            pass
+
+    def _detail_call(
+        self,
+        tenant_id: str,
+        session_id: str,
+        turn_id: int,
+        trace_id: str | None,
+        tool_name: str,
+        code: str,
+        step: str,
+    ) -> dict:
+        arguments = {_DETAIL_TOOL_ARGUMENT[tool_name]: [code]}
+        self._collect_detail_prefetch(tool_name, code)
+        cached = self._detail_cache.get((tool_name, code))
+        if cached is None:
+            rows = self._graph_call(tenant_id, session_id, turn_id, trace_id, tool_name, arguments, step)
+            detail = (rows or [None])[0] or {}
+            if detail:
+                self._detail_cache[(tool_name, code)] = detail
+            return detail
+        self.trace_service.emit(
+            session_id=session_id,
+            turn_id=turn_id,
+            step=step,
+            event_type="mcp_call_requested",
+            payload={"method": "mcp.graph.tools:call", "tool": tool_name, "arguments": arguments},
+            trace_id=trace_id,
+            tenant_id=tenant_id,
+        )
+        self.trace_service.emit(
+            session_id=session_id,
+            turn_id=turn_id,
+            step=step,
+            event_type="mcp_call_completed",
+            payload={
+                "method": "mcp.graph.tools:call",
+                "tool": tool_name,
+                "result": [cached],
+                "latency_ms": 0.0,
+                "prefetched": True,
+            },
+            trace_id=trace_id,
+            tenant_id=tenant_id,
+        )
+        return cached
+
+    def _graph_calls_concurrently(
+        self,
+        tenant_id: str,
+        session_id: str,
+        turn_id: int,
+        trace_id: str | None,
+        calls: list[tuple[str, dict, str]],
+    ) -> list:
+        if len(calls) <= 1 or int(settings.reasoning_graph_io_max_workers) <= 1:
+            return [
+                self._graph_call(tenant_id, session_id, turn_id, trace_id, tool_name, arguments, step)
+                for tool_name, arguments, step in calls
+            ]
+
+        for tool_name, arguments, step in calls:
+            self.trace_service.emit(
+                session_id=session_id,
+                turn_id=turn_id,
+                step=step,
+                event_type="mcp_call_requested",
+                payload={"method": "mcp.graph.tools:call", "tool": tool_name, "arguments": arguments, "concurrent": True},
+                trace_id=trace_id,
+                tenant_id=tenant_id,
+            )
+        executor = _get_graph_io_executor()
+        futures = [
+            executor.submit(_call_graph_tool_isolated, tenant_id, tool_name, arguments)
+            for tool_name, arguments, _ in calls
+        ]
+        results = []
+        for (tool_name, _, step), future in zip(calls, futures):
+            result, latency_ms = future.result()
+            self.trace_service.emit(
+                session_id=session_id,
+                turn_id=turn_id,
+                step=step,
+                event_type="mcp_call_completed",
+                payload={
+                    "method": "mcp.graph.tools:call",
+                    "tool": tool_name,
+                    "result": result,
+                    "latency_ms": latency_ms,
+                    "concurrent": True,
+                },
+                trace_id=trace_id,
+                tenant_id=tenant_id,
+            )
+            results.append(result)
+        return results
+
     def _mcp_data_call(
         self,
         tenant_id: str,
@@ -138,18 +357,20 @@ class ReasoningService:
             trace_id=trace_id,
             tenant_id=tenant_id,
         )
+        started = time.perf_counter()
         if method == "mcp.data.query":
             result = self.mcp_data_service.query(tenant_id=tenant_id, payload=payload)
         elif method == "mcp.data.group-analysis":
             result = self.mcp_data_service.group_analysis(tenant_id=tenant_id, payload=payload)
         else:
             raise AppError(ErrorCodes.VALIDATION, f"unsupported mcp data method: {method}")
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
         self.trace_service.emit(
             session_id=session_id,
             turn_id=turn_id,
             step=step,
             event_type="mcp_call_completed",
-            payload={"method": method, "result": result},
+            payload={"method": method, "result": result, "latency_ms": latency_ms},
             trace_id=trace_id,
             tenant_id=tenant_id,
         )
@@ -199,15 +420,47 @@ class ReasoningService:
             step=step,
             task=task,
         )
+        user_payload, budget_stats = fit_prompt_payload(task, system_prompt, user_payload, schema_hint)
+
+        def budget_callback(event_type: str, payload: dict) -> None:
+            if event_type == "llm_prompt_sent":
+                payload = {**(payload or {}), "prompt_budget": budget_stats}
+            callback(event_type, payload)
+
         try:
             runtime_cfg = self.tenant_llm_service.get_runtime_config(tenant_id)
-            return LangChainLLMClient.invoke_json(
-                runtime_cfg=runtime_cfg,
-                system_prompt=system_prompt,
-                user_payload=user_payload,
-                schema_hint=schema_hint,
-                audit_callback=callback,
+            cache_key = None
+            audit_callback = budget_callback
+            if LLMResponseCache.enabled_for(task):
+                cache = LLMResponseCache()
+                cache_key = cache.build_key(tenant_id, runtime_cfg, task, system_prompt, user_payload, schema_hint)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    callback(
+                        "llm_response_received",
+                        {"model": runtime_cfg.get("model"), "content": cached, "cache_hit": True},
+                    )
+                    return cached
+
+                def audit_callback(event_type: str, payload: dict) -> None:
+                    if event_type == "llm_response_received":
+                        payload = {**(payload or {}), "cache_hit": False}
+                    budget_callback(event_type, payload)
+
+            result = LLMRequestPolicy.invoke(
+                runtime_cfg,
+                lambda cfg, cb: LangChainLLMClient.invoke_json(
+                    runtime_cfg=cfg,
+                    system_prompt=system_prompt,
+                    user_payload=user_payload,
+                    schema_hint=schema_hint,
+                    audit_callback=cb,
+                ),
+                audit_callback=audit_callback,
             )
+            if cache_key:
+                LLMResponseCache().put(cache_key, result)
+            return result
         except Exception as exc:
             self.trace_service.emit(
                 session_id=session_id,
@@ -217,7 +470,7 @@ class ReasoningService:
                 payload={
                     "task": task,
                     "error": str(exc),
-                    "fallback_used": False,
+                    "fallback_used": bool(getattr(exc, "fallback_used", False)),
                 },
                 trace_id=trace_id,
                 tenant_id=tenant_id,
@@ -316,7 +569,10 @@ class ReasoningService:
         latest_turn = self.repo.latest_turn(session_id)
         pending_clarification = self.repo.latest_pending_clarification(session_id)
         tasks = self.repo.list_tasks(session_id=session_id, turn_id=latest_turn.id if latest_turn else None)
+        return self.session_view(session, latest_turn, pending_clarification, tasks)
 
+    @staticmethod
+    def session_view(session, latest_turn, pending_clarification, tasks) -> dict:
         return {
             "session_id": session.id,
             "status": session.status,
@@ -466,28 +722,32 @@ class ReasoningService:
             if value:
                 business_tokens.append(value)
         queries = [state.get("query") or ""] + keywords[:4] + business_tokens[:4]
-        attr_candidates: list[dict] = []
+        search_options = {
+            "top_n": 20,
+            "score_gap": 0.0,
+            "relative_diff": 0.0,
+            "w_sparse": 0.45,
+            "w_dense": 0.55,
+        }
+        # Attribute and ontology searches are independent, so they are fanned out together.
+        calls: list[tuple[str, dict, str]] = []
         for query in queries:
             query_text = str(query or "").strip()
-            if not query_text:
-                continue
-            result = self._graph_call(
-                tenant_id,
-                session_id,
-                turn_id,
-                trace_id,
-                "graph.list_data_attributes",
-                {
-                    "query": query_text,
-                    "top_n": 20,
-                    "score_gap": 0.0,
-                    "relative_diff": 0.0,
-                    "w_sparse": 0.45,
-                    "w_dense": 0.55,
-                },
-                "discovery",
-            )
+            if query_text:
+                calls.append(("graph.list_data_attributes", {"query": query_text, **search_options}, "discovery"))
+        attribute_call_count = len(calls)
+        for query in [state.get("query") or "", " ".join((keywords + business_tokens)[:6])]:
+            query_text = str(query or "").strip()
+            if query_text:
+                calls.append(("graph.list_ontologies", {"query": query_text, **search_options}, "locating"))
+        results = self._graph_calls_concurrently(tenant_id, session_id, turn_id, trace_id, calls)
+
+        attr_candidates: list[dict] = []
+        for result in results[:attribute_call_count]:
             attr_candidates.extend(result.get("items") or [])
+        ontology_candidates: list[dict] = []
+        for result in results[attribute_call_count:]:
+            ontology_candidates.extend(result.get("items") or [])
 
         attr_candidates = self._merge_scored_items(attr_candidates)
         next_state["candidate_attributes"] = attr_candidates[:20]
@@ -535,28 +795,6 @@ class ReasoningService:
             score = round(float(count) * 0.1, 4)
             related_ontologies.append({**ontology_by_code[code], "score": score})
 
-        ontology_candidates: list[dict] = []
-        for query in [state.get("query") or "", " ".join((keywords + business_tokens)[:6])]:
-            query_text = str(query or "").strip()
-            if not query_text:
-                continue
-            result = self._graph_call(
-                tenant_id,
-                session_id,
-                turn_id,
-                trace_id,
-                "graph.list_ontologies",
-                {
-                    "query": query_text,
-                    "top_n": 20,
-                    "score_gap": 0.0,
-                    "relative_diff": 0.0,
-                    "w_sparse": 0.45,
-                    "w_dense": 0.55,
-                },
-                "locating",
-            )
-            ontology_candidates.extend(result.get("items") or [])
         ontology_candidates.extend(related_ontologies)
         ontology_candidates = self._merge_scored_items(ontology_candidates)
 
@@ -611,6 +849,8 @@ class ReasoningService:
                 }
             )
 
+        # Fetch details for the likeliest anchors while the LLM is still choosing.
+        self._start_detail_prefetch(tenant_id, ([{"code": preferred_code}] if preferred_code else []) + candidates)
         llm_selection = self._llm_json_decision(
             tenant_id=tenant_id,
             session_id=session_id,
@@ -654,16 +894,9 @@ class ReasoningService:
 
         candidate_by_code = {str(item.get("code") or "").strip(): item for item in candidates}
         selected_code = input_codes[0]
-        detail_rows = self._graph_call(
-            tenant_id,
-            session_id,
-            turn_id,
-            trace_id,
-            "graph.get_ontology_details",
-            {"ontologyCodes": [selected_code]},
-            "planning",
+        detail = self._detail_call(
+            tenant_id, session_id, turn_id, trace_id, "graph.get_ontology_details", selected_code, "planning"
         )
-        detail = (detail_rows or [None])[0] or {}
 
         class_obj = self.ontology_repo.get_class_by_code(tenant_id, selected_code)
         if not class_obj:
@@ -777,16 +1010,15 @@ class ReasoningService:
             if selected_capability_code not in capability_by_code:
                 selected_capability_code = next(iter(capability_by_code.keys()))
             selected_capability = capability_by_code[selected_capability_code]
-            capability_details = self._graph_call(
+            selected_capability_detail = self._detail_call(
                 state["tenant_id"],
                 state["session_id"],
                 state["turn_id"],
                 state.get("trace_id"),
                 "graph.get_capability_details",
-                {"capabilityCodes": [selected_capability_code]},
+                selected_capability_code,
                 "planning",
             )
-            selected_capability_detail = (capability_details or [None])[0] or {}
             selected_capability["_detail"] = selected_capability_detail
             next_state["candidate_capabilities"] = [selected_capability]
             next_state["selected_capability"] = selected_capability
@@ -816,16 +1048,15 @@ class ReasoningService:
             if selected_relation_code not in relation_by_code:
                 selected_relation_code = next(iter(relation_by_code.keys()))
             selected_relation = relation_by_code[selected_relation_code]
-            relation_details = self._graph_call(
+            selected_relation_detail = self._detail_call(
                 state["tenant_id"],
                 state["session_id"],
                 state["turn_id"],
                 state.get("trace_id"),
                 "graph.get_object_property_details",
-                {"objectPropertyCodes": [selected_relation_code]},
+                selected_relation_code,
                 "planning",
             )
-            selected_relation_detail = (relation_details or [None])[0] or {}
             selected_relation["_detail"] = selected_relation_detail
             next_state["candidate_capabilities"] = []
             next_state["selected_capability"] = {}
@@ -1022,11 +1253,15 @@ class ReasoningService:
             )
 
         try:
-            return LangChainLLMClient.summarize_with_context(
-                runtime_cfg=runtime_cfg,
-                query=query,
-                ontology=top_ontology,
-                selected_task=selected_task,
+            return LLMRequestPolicy.invoke(
+                runtime_cfg,
+                lambda cfg, cb: LangChainLLMClient.summarize_with_context(
+                    runtime_cfg=cfg,
+                    query=query,
+                    ontology=top_ontology,
+                    selected_task=selected_task,
+                    audit_callback=cb,
+                ),
                 audit_callback=_audit_callback,
             )
         except Exception as exc:
@@ -1039,7 +1274,7 @@ class ReasoningService:
                     payload={
                         "task": "summary_generation",
                         "error": str(exc),
-                        "fallback_used": False,
+                        "fallback_used": bool(getattr(exc, "fallback_used", False)),
                     },
                     trace_id=trace_id,
                     tenant_id=tenant_id,
@@ -1076,6 +1311,7 @@ class ReasoningService:
             "provider": llm_bundle["provider"],
             "model": llm_bundle["model"],
             "has_fallback": llm_bundle["fallback"] is not None,
+            "request_policy": LLMRequestPolicy.mode(),
         }
         next_state["status"] = "completed"
         next_state["model_output"] = model_output
@@ -1095,60 +1331,6 @@ class ReasoningService:
             return "waiting_clarification"
         return "continue"
 
-    def _get_compiled_graph(self):
-        if self._compiled_graph is not None:
-            return self._compiled_graph
-
-        builder = StateGraph(dict)
-        builder.add_node("understand_intent", self._node_understand_intent)
-        builder.add_node("discover_candidates", self._node_discover_candidates)
-        builder.add_node("select_anchor_ontologies", self._node_select_anchor_ontologies)
-        builder.add_node("inspect_ontology", self._node_inspect_ontology)
-        builder.add_node("execute", self._node_execute)
-        builder.add_node("finalize", self._node_finalize)
-
-        builder.set_entry_point("understand_intent")
-        builder.add_edge("understand_intent", "discover_candidates")
-        builder.add_conditional_edges(
-            "discover_candidates",
-            self._route_general,
-            {
-                "waiting_clarification": END,
-                "waiting_confirmation": END,
-                "continue": "select_anchor_ontologies",
-            },
-        )
-        builder.add_conditional_edges(
-            "select_anchor_ontologies",
-            self._route_general,
-            {
-                "waiting_clarification": END,
-                "waiting_confirmation": END,
-                "continue": "inspect_ontology",
-            },
-        )
-        builder.add_conditional_edges(
-            "inspect_ontology",
-            self._route_after_inspect,
-            {
-                "waiting_clarification": END,
-                "continue": "execute",
-            },
-        )
-        builder.add_conditional_edges(
-            "execute",
-            self._route_general,
-            {
-                "waiting_clarification": END,
-                "waiting_confirmation": END,
-                "continue": "finalize",
-            },
-        )
-        builder.add_edge("finalize", END)
-
-        self._compiled_graph = builder.compile()
-        return self._compiled_graph
-
     def _build_waiting_response(self, session_id: str, pending, status: str):
         key = "confirmation" if status == "waiting_confirmation" else "clarification"
         question = pending.question_json
@@ -1194,8 +1376,25 @@ class ReasoningService:
                 status="created",
             )
 
+        self._detail_cache = {}
+        self._detail_prefetch = None
         self.repo.update_session_status(session, "running")
         self.repo.update_turn(latest_turn, {"status": "understanding"})
+        self.trace_service.emit(
+            session_id=session_id,
+            turn_id=latest_turn.id,
+            step="session_run",
+            event_type="session_started",
+            payload={"turn_id": latest_turn.id, "turn_no": latest_turn.turn_no},
+            trace_id=trace_id,
+            tenant_id=tenant_id,
+        )
+
+        resume_checkpoint = None
+        if not user_input and settings.reasoning_checkpoint_enabled:
+            resume_checkpoint = self.checkpoint_store.find_resumable(session_id, latest_turn.id)
+        thread_config = ReasoningCheckpointStore.new_thread_config(session_id)
+        run_config = {"configurable": {**thread_config["configurable"], "reasoning_service": self}}
 
         try:
             traversal_state = self._read_latest_context_value(session_id, "traversal_state", ["session"])
@@ -1238,7 +1437,11 @@ class ReasoningService:
                 "resume_target_ontology_code": resume_target,
             }
 
-            final_state = self._get_compiled_graph().invoke(init_state)
+            if resume_checkpoint is not None:
+                final_state = self._resume_from_checkpoint(resume_checkpoint, init_state, thread_config, run_config)
+                self.checkpoint_store.mark_consumed(resume_checkpoint)
+            else:
+                final_state = _get_compiled_graph().invoke(init_state, config=run_config)
 
             if final_state.get("status") in {"waiting_clarification", "waiting_confirmation"}:
                 waiting_status = final_state["status"]
@@ -1256,6 +1459,10 @@ class ReasoningService:
                     waiting_status=waiting_status,
                 )
 
+                resume_node = _RESUME_NODE.get(final_state.get("waiting_node"))
+                if waiting_status == "waiting_clarification" and resume_node and settings.reasoning_checkpoint_enabled:
+                    self.checkpoint_store.save(session_id, latest_turn.id, thread_config, resume_node)
+
                 if waiting_status == "waiting_confirmation":
                     traversal_state = dict(final_state.get("traversal_state") or traversal_state)
                     pending = final_state.get("pending_traversal") or {}
@@ -1354,6 +1561,48 @@ class ReasoningService:
             )
             self.db.commit()
             raise AppError(ErrorCodes.INTERNAL, f"reasoning execution failed: {exc}")
+        finally:
+            ReasoningCheckpointStore.release(thread_config)
+
+    def _resume_from_checkpoint(self, checkpoint_obj, init_state: dict, thread_config: dict, run_config: dict) -> dict:
+        graph = _get_compiled_graph()
+        if not self.checkpoint_store.restore(checkpoint_obj, thread_config):
+            return graph.invoke(init_state, config=run_config)
+
+        answer = checkpoint_obj.answer_json or {}
+        answer_tokens = self._extract_keywords(" ".join(str(value) for value in answer.values() if value is not None))
+        values = dict(graph.get_state(run_config).values)
+        intent = dict(values.get("intent") or {})
+        intent["query"] = init_state["query"]
+        intent["keywords"] = self._normalize_code_list(answer_tokens + list(intent.get("keywords") or []))
+        values.update(
+            {
+                "query": init_state["query"],
+                "turn_id": init_state["turn_id"],
+                "trace_id": init_state.get("trace_id"),
+                "status": "running",
+                "intent": intent,
+                "clarification_question": None,
+                "waiting_node": None,
+                "traversal_state": init_state["traversal_state"],
+                "resume_target_ontology_code": init_state["resume_target_ontology_code"],
+            }
+        )
+        self.trace_service.emit(
+            session_id=init_state["session_id"],
+            turn_id=init_state["turn_id"],
+            step="resume",
+            event_type="recovery_triggered",
+            payload={
+                "resume_node": checkpoint_obj.resume_node,
+                "checkpoint_id": checkpoint_obj.checkpoint_id,
+                "answer_keywords": answer_tokens,
+            },
+            trace_id=init_state.get("trace_id"),
+            tenant_id=init_state["tenant_id"],
+        )
+        graph.update_state(run_config, values, as_node=_PREVIOUS_NODE[checkpoint_obj.resume_node])
+        return graph.invoke(None, config=run_config)
 
     def clarify(self, tenant_id: str, session_id: str, answer: dict, trace_id: str | None = None):
         session = self.repo.get_session(tenant_id=tenant_id, session_id=session_id)
@@ -1417,6 +1666,7 @@ class ReasoningService:
             else:
                 merged_input = f"{turn.user_input}\n[clarification] {answer}"
                 self.repo.update_turn(turn, {"user_input": merged_input, "status": "created"})
+                self.checkpoint_store.mark_answered(session_id, turn.id, answer)
 
         self.repo.update_session_status(session, "created")
         self.trace_service.emit(
@@ -1463,3 +1713,96 @@ class ReasoningService:
         )
         self.db.commit()
         return {"session_id": session_id, "status": "cancelled"}
+
+
+# A clarification raised by these nodes is answered by re-running the mapped node;
+# inspect/execute questions are about the anchor choice, so they step back to it.
+_RESUME_NODE = {
+    "discover_candidates": "discover_candidates",
+    "select_anchor_ontologies": "select_anchor_ontologies",
+    "inspect_ontology": "select_anchor_ontologies",
+    "execute": "select_anchor_ontologies",
+}
+_PREVIOUS_NODE = {
+    "discover_candidates": "understand_intent",
+    "select_anchor_ontologies": "discover_candidates",
+}
+
+
+def _bind_node(node_name: str):
+    # Nodes are shared by every run; the per-run service arrives through the run config.
+    method_name = f"_node_{node_name}"
+
+    def _node(state: dict, config) -> dict:
+        service = config["configurable"]["reasoning_service"]
+        next_state = getattr(service, method_name)(state)
+        service.trace_service.flush()
+        if next_state.get("status") in {"waiting_clarification", "waiting_confirmation"}:
+            next_state["waiting_node"] = node_name
+        return next_state
+
+    _node.__name__ = method_name
+    return _node
+
+
+_compiled_graph_lock = Lock()
+_compiled_graph = None
+
+
+def _get_compiled_graph():
+    global _compiled_graph
+    if _compiled_graph is not None:
+        return _compiled_graph
+    with _compiled_graph_lock:
+        if _compiled_graph is not None:
+            return _compiled_graph
+
+        builder = StateGraph(dict)
+        builder.add_node("understand_intent", _bind_node("understand_intent"))
+        builder.add_node("discover_candidates", _bind_node("discover_candidates"))
+        builder.add_node("select_anchor_ontologies", _bind_node("select_anchor_ontologies"))
+        builder.add_node("inspect_ontology", _bind_node("inspect_ontology"))
+        builder.add_node("execute", _bind_node("execute"))
+        builder.add_node("finalize", _bind_node("finalize"))
+
+        builder.set_entry_point("understand_intent")
+        builder.add_edge("understand_intent", "discover_candidates")
+        builder.add_conditional_edges(
+            "discover_candidates",
+            ReasoningService._route_general,
+            {
+                "waiting_clarification": END,
+                "waiting_confirmation": END,
+                "continue": "select_anchor_ontologies",
+            },
+        )
+        builder.add_conditional_edges(
+            "select_anchor_ontologies",
+            ReasoningService._route_general,
+            {
+                "waiting_clarification": END,
+                "waiting_confirmation": END,
+                "continue": "inspect_ontology",
+            },
+        )
+        builder.add_conditional_edges(
+            "inspect_ontology",
+            ReasoningService._route_after_inspect,
+            {
+                "waiting_clarification": END,
+                "continue": "execute",
+            },
+        )
+        builder.add_conditional_edges(
+            "execute",
+            ReasoningService._route_general,
+            {
+                "waiting_clarification": END,
+                "waiting_confirmation": END,
+                "continue": "finalize",
+            },
+        )
+        builder.add_edge("finalize", END)
+
+        _compiled_graph = builder.compile(checkpointer=get_checkpoint_saver())
+        return _compiled_graph
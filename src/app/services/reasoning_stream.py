@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+
+from src.app.core.errors import AppError, ErrorCodes
+from src.app.infra.db.session import SessionLocal
+from src.app.repositories.reasoning_repo import ReasoningRepository
+from src.app.services.llm.langchain_client import llm_token_sink
+from src.app.services.reasoning_service import ReasoningService
+from src.app.services.trace_service import TraceService, parse_trace_fields
+
+_STREAM_END = object()
+
+
+class ReasoningRunStream:
+    heartbeat_seconds = 15.0
+
+    def __init__(self, tenant_id: str, session_id: str, user_input: str | None = None, trace_id: str | None = None):
+        self.tenant_id = tenant_id
+        self.session_id = session_id
+        self.user_input = user_input
+        self.trace_id = trace_id
+        self._queue: queue.Queue = queue.Queue()
+        self._seq = 0
+        self._current_task = None
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def start(
+        cls,
+        db,
+        tenant_id: str,
+        session_id: str,
+        user_input: str | None = None,
+        trace_id: str | None = None,
+    ) -> "ReasoningRunStream":
+        session = ReasoningRepository(db).get_session(tenant_id=tenant_id, session_id=session_id)
+        if not session:
+            raise AppError(ErrorCodes.NOT_FOUND, "reasoning session not found")
+        # The run writes through its own session; do not keep the request transaction open meanwhile.
+        db.rollback()
+
+        stream = cls(tenant_id=tenant_id, session_id=session_id, user_input=user_input, trace_id=trace_id)
+        stream._thread = threading.Thread(target=stream._run, name=f"reasoning-stream-{session_id}", daemon=True)
+        stream._thread.start()
+        return stream
+
+    def _publish(self, event: str, data: dict) -> None:
+        self._seq += 1
+        self._queue.put((event, self._seq, data))
+
+    def _on_trace_event(self, event: dict) -> None:
+        if event.get("event_type") == "llm_prompt_sent":
+            self._current_task = (event.get("payload") or {}).get("task")
+        self._publish("trace", event)
+
+    def _on_token(self, text: str) -> None:
+        self._publish("token", {"task": self._current_task, "text": text})
+
+    def _run(self) -> None:
+        db = SessionLocal()
+        try:
+            service = ReasoningService(db)
+            service.trace_service.add_listener(self._on_trace_event)
+            with llm_token_sink(self._on_token):
+                result = service.run_session(
+                    tenant_id=self.tenant_id,
+                    session_id=self.session_id,
+                    user_input=self.user_input,
+                    trace_id=self.trace_id,
+                )
+            self._publish("result", {"data": result, "trace_id": self.trace_id})
+        except AppError as exc:
+            self._publish("error", {"code": exc.code, "message": exc.message, "trace_id": self.trace_id})
+        except Exception as exc:
+            self._publish("error", {"code": ErrorCodes.INTERNAL, "message": str(exc), "trace_id": self.trace_id})
+        finally:
+            db.close()
+            self._queue.put(_STREAM_END)
+
+    def iter_sse(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.heartbeat_seconds)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            if item is _STREAM_END:
+                return
+            event, seq, data = item
+            yield self.format_sse(event, data, seq)
+
+    @staticmethod
+    def format_sse(event: str, data: dict, event_id: int | None = None) -> str:
+        body = json.dumps(data, ensure_ascii=False, default=str)
+        head = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{head}event: {event}\ndata: {body}\n\n"
+
+
+def stream_trace_ndjson(db, tenant_id: str, session_id: str, fields: str | None = None, **filters):
+    session = ReasoningRepository(db).get_session(tenant_id=tenant_id, session_id=session_id)
+    if not session:
+        raise AppError(ErrorCodes.NOT_FOUND, "reasoning session not found")
+    projected = parse_trace_fields(fields)
+    db.rollback()
+
+    def _iter():
+        # Pages are read through a dedicated session that lives as long as the response body.
+        stream_db = SessionLocal()
+        try:
+            for item in TraceService(stream_db).iter_events(session_id, fields=projected, **filters):
+                yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        finally:
+            stream_db.close()
+
+    return _iter()
@@ -1,13 +1,39 @@
-﻿from src.app.core.config import settings
+﻿import time
+from threading import Lock
+
+from src.app.core.config import settings
 from src.app.core.errors import AppError, ErrorCodes
 from src.app.core.secrets import SecretCipher, mask_secret
+from src.app.infra.shared_cache import ALL_TENANTS, add_invalidation_handler, publish_invalidation
 from src.app.repositories.config_repo import TenantLLMConfigRepository
+from src.app.services.llm.client_registry import LLMClientRegistry
 from src.app.services.llm.provider_factory import LLMProviderFactory
+from src.app.services.llm.request_policy import LLMRequestPolicy
 
 
 ALLOWED_PROVIDERS = {"deepseek", "qwen"}
 INTERNAL_API_KEY_MAP_KEY = "__api_key_cipher_by_provider"
 
+# Resolved runtime configs (with decrypted keys) per tenant. Process memory only: this is
+# deliberately not a SharedCache namespace, so plaintext keys never reach Redis.
+_runtime_cache_lock = Lock()
+_runtime_cache: dict[str, tuple[float, dict]] = {}
+
+
+def invalidate_runtime_config(tenant_id: str | None = None) -> None:
+    with _runtime_cache_lock:
+        if tenant_id is None or tenant_id == ALL_TENANTS:
+            _runtime_cache.clear()
+        else:
+            _runtime_cache.pop(tenant_id, None)
+
+
+def _copy_runtime_config(cfg: dict) -> dict:
+    return {**cfg, "extra_json": dict(cfg.get("extra_json") or {})}
+
+
+add_invalidation_handler("tenant_llm_config", invalidate_runtime_config)
+
 
 class TenantLLMConfigService:
     def __init__(self, db):
@@ -131,6 +157,9 @@ class TenantLLMConfigService:
             },
         )
         self.db.commit()
+        invalidate_runtime_config(obj.tenant_id)
+        LLMClientRegistry.invalidate_tenant(obj.tenant_id)
+        publish_invalidation("tenant_llm_config", obj.tenant_id)
         return self.get_config(obj.tenant_id)
 
     def _resolve_runtime_config(self, tenant_id: str):
@@ -138,6 +167,7 @@ class TenantLLMConfigService:
         if not obj:
             raise AppError(ErrorCodes.NOT_FOUND, "tenant llm config not found")
         return {
+            "tenant_id": obj.tenant_id,
             "provider": obj.provider,
             "model": obj.model,
             "api_key": self._resolve_provider_api_key_plain(obj, obj.provider),
@@ -150,14 +180,28 @@ class TenantLLMConfigService:
             "status": obj.status,
         }
 
-    def get_runtime_config(self, tenant_id: str) -> dict:
+    def _cached_runtime_config(self, tenant_id: str) -> dict:
+        ttl = float(settings.llm_runtime_config_cache_ttl_seconds)
+        if ttl <= 0:
+            return self._resolve_runtime_config(tenant_id)
+        now = time.monotonic()
+        with _runtime_cache_lock:
+            entry = _runtime_cache.get(tenant_id)
+        if entry is not None and entry[0] > now:
+            return _copy_runtime_config(entry[1])
         cfg = self._resolve_runtime_config(tenant_id)
+        with _runtime_cache_lock:
+            _runtime_cache[tenant_id] = (now + ttl, _copy_runtime_config(cfg))
+        return cfg
+
+    def get_runtime_config(self, tenant_id: str) -> dict:
+        cfg = self._cached_runtime_config(tenant_id)
         if int(cfg["status"]) != 1:
             raise AppError(ErrorCodes.VALIDATION, "tenant llm config disabled")
         return cfg
 
     def get_runtime_provider_bundle(self, tenant_id: str):
-        cfg = self._resolve_runtime_config(tenant_id)
+        cfg = self._cached_runtime_config(tenant_id)
         if int(cfg["status"]) != 1:
             raise AppError(ErrorCodes.VALIDATION, "tenant llm config disabled")
         primary = LLMProviderFactory.build(
@@ -169,12 +213,13 @@ class TenantLLMConfigService:
             extra_options=cfg["extra_json"],
         )
         fallback = None
-        if cfg.get("fallback_provider") and cfg.get("fallback_model"):
+        fallback_cfg = LLMRequestPolicy.fallback_runtime_config(cfg)
+        if fallback_cfg:
             fallback = LLMProviderFactory.build(
-                provider=cfg["fallback_provider"],
-                api_key=cfg.get("fallback_api_key") or cfg["api_key"],
-                model=cfg["fallback_model"],
-                base_url=cfg["base_url"],
+                provider=fallback_cfg["provider"],
+                api_key=fallback_cfg["api_key"],
+                model=fallback_cfg["model"],
+                base_url=fallback_cfg["base_url"],
                 timeout_ms=cfg["timeout_ms"],
                 extra_options=cfg["extra_json"],
             )
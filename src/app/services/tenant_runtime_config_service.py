@@ -51,3 +51,36 @@ class TenantRuntimeConfigService:
         self.repo.upsert(tenant_id, config_json)
         self.db.commit()
         return merged
+
+    @staticmethod
+    def default_trace_retention_config() -> dict:
+        # Retention deletes data, so every tier is off until the tenant sets it.
+        return {
+            "summarize_after_days": 0,
+            "delete_after_days": 0,
+            "batch_size": 500,
+        }
+
+    def get_trace_retention_config(self, tenant_id: str) -> dict:
+        obj = self.repo.get(tenant_id)
+        defaults = self.default_trace_retention_config()
+        if not obj:
+            return defaults
+        retention = (obj.config_json or {}).get("trace_retention") or {}
+        return {**defaults, **retention}
+
+    def upsert_trace_retention_config(self, tenant_id: str, payload: dict) -> dict:
+        existing = self.repo.get(tenant_id)
+        config_json = dict((existing.config_json if existing else {}) or {})
+        defaults = self.default_trace_retention_config()
+        merged = {**defaults, **(config_json.get("trace_retention") or {}), **(payload or {})}
+
+        # 0 disables a tier; a delete window shorter than the summarize window just deletes.
+        merged["summarize_after_days"] = int(max(0, int(merged["summarize_after_days"])))
+        merged["delete_after_days"] = int(max(0, int(merged["delete_after_days"])))
+        merged["batch_size"] = int(max(1, min(5000, int(merged["batch_size"]))))
+
+        config_json["trace_retention"] = dict(merged)
+        self.repo.upsert(tenant_id, config_json)
+        self.db.commit()
+        return merged
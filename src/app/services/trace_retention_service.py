@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from src.app.infra.db.models import now
+from src.app.infra.db.session import SessionLocal, engine
+from src.app.repositories.config_repo import ActiveTenantRepository
+from src.app.repositories.reasoning_repo import ReasoningRepository
+from src.app.services.tenant_runtime_config_service import TenantRuntimeConfigService
+from src.app.services.trace_service import decode_trace_payload
+
+_SUMMARY_CODEC = "summary"
+_SUMMARY_SCALAR_MAX_CHARS = 64
+_SWEEP_LOCK_KEY = 7240401
+
+
+def summarize_trace_payload(payload: dict) -> dict:
+    # Keep the shape and the short scalar fields (model, latency, counts); drop prompts and results.
+    summary = {"_summary": True, "keys": sorted(payload)[:50]}
+    for key, value in payload.items():
+        if isinstance(value, (bool, int, float)) or (
+            isinstance(value, str) and len(value) <= _SUMMARY_SCALAR_MAX_CHARS
+        ):
+            summary[key] = value
+    return summary
+
+
+class TraceRetentionService:
+    def __init__(self, db):
+        self.db = db
+        self.repo = ReasoningRepository(db)
+        self.config_service = TenantRuntimeConfigService(db)
+
+    def run(self, tenant_id: str) -> dict:
+        config = self.config_service.get_trace_retention_config(tenant_id)
+        batch_size = int(config["batch_size"])
+        current = now()
+        deleted = 0
+        summarized = 0
+
+        delete_after_days = int(config["delete_after_days"])
+        if delete_after_days > 0:
+            cutoff = current - timedelta(days=delete_after_days)
+            while True:
+                ids = self.repo.trace_event_ids_before(tenant_id, cutoff, batch_size)
+                if not ids:
+                    break
+                deleted += self.repo.delete_trace_events(ids)
+                self.db.commit()
+
+        summarize_after_days = int(config["summarize_after_days"])
+        if summarize_after_days > 0:
+            cutoff = current - timedelta(days=summarize_after_days)
+            while True:
+                ids = self.repo.trace_event_ids_before(tenant_id, cutoff, batch_size, exclude_codec=_SUMMARY_CODEC)
+                if not ids:
+                    break
+                for item in self.repo.list_trace_events_by_ids(ids):
+                    payload = decode_trace_payload(item.payload_json, item.payload_codec, item.payload_blob)
+                    item.payload_json = summarize_trace_payload(payload)
+                    item.payload_codec = _SUMMARY_CODEC
+                    item.payload_blob = None
+                summarized += len(ids)
+                self.db.commit()
+
+        return {
+            "tenant_id": tenant_id,
+            "deleted": deleted,
+            "summarized": summarized,
+            "config": config,
+        }
+
+
+def run_retention_for_active_tenants(limit: int = 2000) -> int:
+    with engine.connect() as lock_conn:
+        # On PostgreSQL a session advisory lock keeps workers from sweeping at the same time;
+        # a worker that does not get it skips this round.
+        locking = lock_conn.dialect.name == "postgresql"
+        if locking and not lock_conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _SWEEP_LOCK_KEY}).scalar():
+            return 0
+        db = SessionLocal()
+        try:
+            tenant_ids = [row.tenant_id for row in ActiveTenantRepository(db).list_active(limit=limit)]
+            for tenant_id in tenant_ids:
+                try:
+                    TraceRetentionService(db).run(tenant_id)
+                except Exception:
+                    # One tenant's failure must not stop the sweep; it is retried on the next run.
+                    db.rollback()
+            return len(tenant_ids)
+        finally:
+            db.close()
+            if locking:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _SWEEP_LOCK_KEY})
@@ -1,6 +1,23 @@
-﻿from src.app.repositories.reasoning_repo import ReasoningRepository
+﻿import gzip
+import json
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.app.core.config import settings
+from src.app.core.errors import AppError, ErrorCodes
+from src.app.infra.db.models import now
+from src.app.repositories.reasoning_repo import ReasoningRepository
 from src.app.services.observability.langfuse_sink import LangfuseSink
 
+try:
+    import zstandard
+
+    _ZSTD_IMPORT_ERROR = None
+except Exception:
+    zstandard = None
+    _ZSTD_IMPORT_ERROR = "zstandard is required for zstd trace payloads"
+
 
 ALLOWED_EVENTS = {
     "intent_parsed",
@@ -22,13 +39,83 @@ ALLOWED_EVENTS = {
     "mcp_call_completed",
     "llm_prompt_sent",
     "llm_response_received",
+    "llm_fallback_triggered",
+    "llm_hedge_resolved",
+    "llm_json_repair",
 }
 
 
+TRACE_EVENT_FIELDS = ("id", "session_id", "turn_id", "step", "event_type", "trace_id", "created_at", "payload")
+DEFAULT_TRACE_EVENT_FIELDS = tuple(field for field in TRACE_EVENT_FIELDS if field != "payload")
+
+
+def parse_trace_fields(fields: str | None) -> tuple[str, ...]:
+    if not fields:
+        return DEFAULT_TRACE_EVENT_FIELDS
+    requested = [item.strip() for item in fields.split(",") if item.strip()]
+    unknown = [item for item in requested if item not in TRACE_EVENT_FIELDS]
+    if unknown:
+        raise AppError(ErrorCodes.VALIDATION, f"unknown trace fields: {', '.join(unknown)}")
+    # `id` is always returned because it is the pagination cursor.
+    return tuple(field for field in TRACE_EVENT_FIELDS if field == "id" or field in requested)
+
+
+def _payload_codec() -> str:
+    codec = str(settings.trace_payload_codec or "gzip").strip().lower()
+    if codec == "zstd" and _ZSTD_IMPORT_ERROR:
+        return "gzip"
+    return codec if codec in {"zstd", "gzip"} else "gzip"
+
+
+def encode_trace_payload(payload: dict) -> tuple[dict, str | None, bytes | None]:
+    raw = json.dumps(payload or {}, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    threshold = int(settings.trace_payload_compress_threshold_bytes)
+    if threshold <= 0 or len(raw) < threshold:
+        return payload or {}, None, None
+    codec = _payload_codec()
+    if codec == "zstd":
+        blob = zstandard.ZstdCompressor(level=3).compress(raw)
+    else:
+        blob = gzip.compress(raw, compresslevel=6)
+    return {"_compressed": codec, "bytes": len(raw), "keys": sorted(payload)[:50]}, codec, blob
+
+
+def decode_trace_payload(payload_json: dict, codec: str | None, blob: bytes | None) -> dict:
+    if not codec or blob is None:
+        return payload_json or {}
+    if codec == "zstd":
+        if _ZSTD_IMPORT_ERROR:
+            raise AppError(ErrorCodes.INTERNAL, _ZSTD_IMPORT_ERROR)
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    elif codec == "gzip":
+        raw = gzip.decompress(blob)
+    else:
+        return payload_json or {}
+    return json.loads(raw.decode("utf-8"))
+
+
 class TraceService:
     def __init__(self, db):
         self.repo = ReasoningRepository(db)
         self.langfuse = LangfuseSink()
+        self._listeners = []
+        # Events are inserted in bulk at node boundaries, when the buffer fills up, or right
+        # before the owning session commits. Rows inserted but not yet committed are kept so
+        # a rollback puts them back in the buffer instead of losing them.
+        self._buffer: list[dict] = []
+        self._uncommitted: list[dict] = []
+        self._buffered = bool(settings.trace_buffer_enabled) and isinstance(db, Session)
+        if self._buffered:
+            event.listen(db, "before_commit", self._on_before_commit)
+            event.listen(db, "after_commit", self._on_after_commit)
+            event.listen(db, "after_rollback", self._on_after_rollback)
+
+    def add_listener(self, callback) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
 
     def emit(
         self,
@@ -48,14 +135,34 @@ class TraceService:
                 "raw_event_type": raw_event_type,
                 **(payload or {}),
             }
-        self.repo.create_trace_event(
-            session_id=session_id,
-            turn_id=turn_id,
-            step=step,
-            event_type=event_type,
-            payload_json=payload or {},
-            trace_id=trace_id,
-        )
+        payload_json, payload_codec, payload_blob = encode_trace_payload(payload or {})
+        if self._buffered:
+            self._buffer.append(
+                {
+                    "session_id": session_id,
+                    "turn_id": turn_id,
+                    "step": step,
+                    "event_type": event_type,
+                    "payload_json": payload_json,
+                    "payload_codec": payload_codec,
+                    "payload_blob": payload_blob,
+                    "trace_id": trace_id,
+                    "created_at": now(),
+                }
+            )
+            if len(self._buffer) >= max(int(settings.trace_buffer_max_events), 1):
+                self.flush()
+        else:
+            self.repo.create_trace_event(
+                session_id=session_id,
+                turn_id=turn_id,
+                step=step,
+                event_type=event_type,
+                payload_json=payload_json,
+                trace_id=trace_id,
+                payload_codec=payload_codec,
+                payload_blob=payload_blob,
+            )
         self.langfuse.emit_event(
             tenant_id=tenant_id,
             session_id=session_id,
@@ -64,19 +171,118 @@ class TraceService:
             event_type=event_type,
             payload=payload or {},
         )
+        if self._listeners:
+            event = {
+                "session_id": session_id,
+                "turn_id": turn_id,
+                "step": step,
+                "event_type": event_type,
+                "payload": payload or {},
+                "trace_id": trace_id,
+            }
+            for listener in list(self._listeners):
+                try:
+                    listener(event)
+                except Exception:
+                    pass
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        rows = self._buffer
+        self._buffer = []
+        try:
+            self.repo.bulk_create_trace_events(rows)
+        except Exception:
+            self._buffer = rows + self._buffer
+            raise
+        self._uncommitted.extend(rows)
+
+    def _on_before_commit(self, session) -> None:
+        self.flush()
+
+    def _on_after_commit(self, session) -> None:
+        self._uncommitted = []
+
+    def _on_after_rollback(self, session) -> None:
+        if self._uncommitted:
+            self._buffer = self._uncommitted + self._buffer
+            self._uncommitted = []
+
+    @staticmethod
+    def project_event(row, fields: tuple[str, ...]) -> dict:
+        output = {}
+        for field in fields:
+            if field == "payload":
+                output["payload"] = decode_trace_payload(row["payload_json"], row["payload_codec"], row["payload_blob"])
+            elif field == "created_at":
+                output["created_at"] = row["created_at"].isoformat()
+            else:
+                output[field] = row[field]
+        return output
+
+    def page_events(
+        self,
+        session_id: str,
+        after_id: int = 0,
+        limit: int = 100,
+        steps: list[str] | None = None,
+        event_types: list[str] | None = None,
+        turn_id: int | None = None,
+        fields: tuple[str, ...] = DEFAULT_TRACE_EVENT_FIELDS,
+    ) -> dict:
+        self.flush()
+        rows = self.repo.page_trace_events(
+            session_id,
+            after_id=after_id,
+            limit=limit + 1,
+            steps=steps,
+            event_types=event_types,
+            turn_id=turn_id,
+            include_payload="payload" in fields,
+        )
+        return self.page_view(rows, limit, fields)
+
+    @classmethod
+    def page_view(cls, rows, limit: int, fields: tuple[str, ...]) -> dict:
+        # Callers fetch limit + 1 rows; the extra one only signals that another page exists.
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "items": [cls.project_event(row, fields) for row in rows],
+            "next_after_id": rows[-1]["id"] if rows else None,
+            "has_more": has_more,
+        }
+
+    def iter_events(self, session_id: str, batch_size: int = 200, **filters):
+        after_id = int(filters.pop("after_id", 0) or 0)
+        while True:
+            page = self.page_events(session_id, after_id=after_id, limit=batch_size, **filters)
+            yield from page["items"]
+            if not page["has_more"]:
+                return
+            after_id = page["next_after_id"]
+
+    def get_event(self, session_id: str, event_id: int) -> dict | None:
+        self.flush()
+        item = self.repo.get_trace_event(session_id, event_id)
+        if item is None:
+            return None
+        return self.event_view(item)
 
     def list_events(self, session_id: str):
-        items = self.repo.list_trace_events(session_id)
-        return [
-            {
-                "id": item.id,
-                "session_id": item.session_id,
-                "turn_id": item.turn_id,
-                "step": item.step,
-                "event_type": item.event_type,
-                "payload": item.payload_json,
-                "trace_id": item.trace_id,
-                "created_at": item.created_at.isoformat(),
-            }
-            for item in items
-        ]
+        self.flush()
+        return [self.event_view(item) for item in self.repo.list_trace_events(session_id)]
+
+    @staticmethod
+    def event_view(item) -> dict:
+        return {
+            "id": item.id,
+            "session_id": item.session_id,
+            "turn_id": item.turn_id,
+            "step": item.step,
+            "event_type": item.event_type,
+            "payload": decode_trace_payload(item.payload_json, item.payload_codec, item.payload_blob),
+            "trace_id": item.trace_id,
+            "created_at": item.created_at.isoformat(),
+        }
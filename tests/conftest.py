@@ -19,8 +19,15 @@ from src.app.main import app
 
 @pytest.fixture(autouse=True)
 def reset_db():
+    from src.app.services.ontology_version import bump_ontology_version
+    from src.app.services.tenant_llm_config_service import invalidate_runtime_config
+
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Resolved tenant configs and ontology-versioned caches live in process memory;
+    # the tables were just recreated.
+    invalidate_runtime_config()
+    bump_ontology_version(None)
     yield
 
 
@@ -177,3 +177,37 @@ def test_embedding_backfill_api_batches_and_fills_storage(client, headers):
 from sqlalchemy import text
 
 from src.app.infra.db.session import engine
+
+
+def test_hybrid_search_results_are_cached_per_ontology_version(client, headers):
+    resp = client.post(
+        "/api/v1/ontology/classes",
+        headers=headers,
+        json={"code": "address_entity", "name": "address entity", "description": "entity for address profile"},
+    )
+    assert resp.status_code == 200
+
+    warm = client.post(
+        "/api/v1/ontology/hybrid-search:warmup",
+        headers=headers,
+        json={"queries": ["addr"], "min_prefix_chars": 2, "top_k": 20},
+    )
+    assert warm.status_code == 200
+    assert warm.json()["data"] == {"prefixes": 3, "warmed": 3, "already_cached": 0}
+
+    before = client.get("/api/v1/ontology/hybrid-search/cache-stats", headers=headers).json()["data"]
+    params = {"q": "add", "types": "ontology,data-attr,obj-prop,capability", "top_k": 20}
+    first = client.get("/api/v1/ontology/hybrid-search", headers=headers, params=params).json()["data"]
+    after = client.get("/api/v1/ontology/hybrid-search/cache-stats", headers=headers).json()["data"]
+    assert after["l1_hits"] == before["l1_hits"] + 1
+    assert [item["code"] for item in first["items"]] == ["address_entity"]
+
+    # An ontology edit bumps the tenant version, so the next search is scored again.
+    resp = client.post(
+        "/api/v1/ontology/classes",
+        headers=headers,
+        json={"code": "address_book", "name": "address book", "description": "saved addresses"},
+    )
+    assert resp.status_code == 200
+    second = client.get("/api/v1/ontology/hybrid-search", headers=headers, params=params).json()["data"]
+    assert {item["code"] for item in second["items"]} == {"address_entity", "address_book"}
@@ -4,6 +4,56 @@ def test_m1_console_page_accessible(client):
     assert "本体管理台" in resp.text
 
 
+def test_console_page_is_compressed_and_revalidated_by_etag(client):
+    resp = client.get("/theworld/v1/console", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert "本体管理台" in resp.text
+    etag = resp.headers["etag"]
+    assert etag.endswith('-gzip"')
+
+    cached = client.get("/theworld/v1/console", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # The gzip validator must not revalidate the identity body.
+    identity = client.get("/theworld/v1/console", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert identity.status_code == 200
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == etag.replace('-gzip"', '"')
+
+    plain = client.get("/theworld/v1/console/graph", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != etag
+
+
+def test_api_responses_are_compressed_above_threshold(client, headers):
+    for index in range(8):
+        resp = client.post(
+            "/api/v1/ontology/classes",
+            headers=headers,
+            json={"code": f"customer_{index}", "name": f"客户{index}", "description": "客户主本体" * 40},
+        )
+        assert resp.status_code == 200
+
+    resp = client.get("/api/v1/ontology/classes", headers={**headers, "Accept-Encoding": "gzip", "X-Trace-Id": "trace-gz"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert resp.headers["x-trace-id"] == "trace-gz"
+    assert resp.json()["data"]["total"] == 8
+
+    plain = client.get("/api/v1/ontology/classes", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    small = client.get("/api/v1/ontology/classes?status=0", headers={**headers, "Accept-Encoding": "gzip"})
+    assert small.status_code == 200
+    assert "content-encoding" not in small.headers
+
+
 def test_list_classes_and_latest_knowledge(client, headers):
     create_resp = client.post(
         "/api/v1/ontology/classes",
@@ -1,7 +1,11 @@
-﻿import pytest
+﻿import json
+
+import pytest
 from fastapi.testclient import TestClient
 
+from src.app.core.config import settings
 from src.app.services.llm.langchain_client import LangChainLLMClient
+from src.app.services.llm.request_policy import reset_policy_state
 
 
 def _create_class(client: TestClient, headers: dict, code: str, name: str) -> int:
@@ -234,6 +238,44 @@ def test_reasoning_run_completed_flow(client: TestClient, headers: dict, mock_re
     assert "task_planned" in event_types
     assert "session_completed" in event_types
 
+    mcp_completed = [item for item in trace_body["data"]["items"] if item["event_type"] == "mcp_call_completed"]
+    assert mcp_completed
+    assert all("latency_ms" in item["payload"] for item in mcp_completed)
+    discovery_tools = {item["payload"]["tool"] for item in mcp_completed if item["payload"].get("concurrent")}
+    assert {"graph.list_data_attributes", "graph.list_ontologies"} <= discovery_tools
+    prefetched_tools = {item["payload"]["tool"] for item in mcp_completed if item["payload"].get("prefetched")}
+    assert {"graph.get_ontology_details", "graph.get_capability_details"} <= prefetched_tools
+
+
+def test_reasoning_failover_is_traced_as_fallback(client: TestClient, headers: dict, mock_reasoning_llm, monkeypatch):
+    monkeypatch.setattr(settings, "llm_request_policy", "failover")
+    mock_invoke_json = LangChainLLMClient.invoke_json
+
+    def _primary_down(runtime_cfg: dict, *args, **kwargs):
+        if runtime_cfg["provider"] == "deepseek":
+            raise TimeoutError("primary timed out")
+        return mock_invoke_json(runtime_cfg, *args, **kwargs)
+
+    monkeypatch.setattr(LangChainLLMClient, "invoke_json", staticmethod(_primary_down))
+    _upsert_tenant_llm_config(client, headers)
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "请根据手机号查询用户信息", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+    try:
+        run_resp = client.post(f"/api/v1/reasoning/sessions/{session_id}/run", headers=headers, json={})
+    finally:
+        # The primary's breaker opened during this run; later tests expect a closed circuit.
+        reset_policy_state()
+    assert run_resp.status_code == 200
+
+    trace_body = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()
+    event_types = [item["event_type"] for item in trace_body["data"]["items"]]
+    assert "llm_fallback_triggered" in event_types
+    assert "session_failed" not in event_types
+
 
 def test_reasoning_clarification_flow(client: TestClient, headers: dict, mock_reasoning_llm):
     _upsert_tenant_llm_config(client, headers)
@@ -354,3 +396,358 @@ def test_reasoning_run_fails_when_llm_unavailable(client: TestClient, headers: d
     body = run_resp.json()
     assert body["code"] == 9000
     assert "llm decision failed" in body["message"]
+
+
+def _parse_sse(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in text.split("\n\n"):
+        name = None
+        data = None
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                name = line[len("event: ") :]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: ") :])
+        if name:
+            events.append((name, data))
+    return events
+
+
+def test_reasoning_run_stream_emits_progress_events(client: TestClient, headers: dict, mock_reasoning_llm):
+    _upsert_tenant_llm_config(client, headers)
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我处理一下", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+
+    stream_resp = client.get(f"/api/v1/reasoning/sessions/{session_id}/run:stream", headers=headers)
+    assert stream_resp.status_code == 200
+    assert stream_resp.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(stream_resp.text)
+    trace_types = [data["event_type"] for name, data in events if name == "trace"]
+    assert trace_types[0] == "session_started"
+    assert "intent_parsed" in trace_types
+    assert "clarification_asked" in trace_types
+    assert events[-1][0] == "result"
+    assert events[-1][1]["data"]["status"] == "waiting_clarification"
+
+    missing_resp = client.get("/api/v1/reasoning/sessions/not-exists/run:stream", headers=headers)
+    assert missing_resp.status_code == 400
+    assert missing_resp.json()["code"] == 1002
+
+
+def test_reasoning_run_stream_is_not_compressed(client: TestClient, headers: dict, mock_reasoning_llm):
+    _upsert_tenant_llm_config(client, headers)
+    session_id = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我处理一下", "metadata": {}},
+    ).json()["data"]["session_id"]
+
+    stream_resp = client.get(
+        f"/api/v1/reasoning/sessions/{session_id}/run:stream",
+        headers={**headers, "Accept-Encoding": "gzip"},
+    )
+    assert stream_resp.status_code == 200
+    assert stream_resp.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in stream_resp.headers
+    assert len(stream_resp.content) > settings.response_compression_min_bytes
+    assert _parse_sse(stream_resp.text)[-1][0] == "result"
+
+
+def test_reasoning_llm_response_cache_hits_on_repeated_decision(
+    client: TestClient, headers: dict, mock_reasoning_llm, monkeypatch
+):
+    from src.app.core.config import settings
+    from src.app.services.llm.response_cache import LLMResponseCache
+
+    monkeypatch.setattr(settings, "llm_response_cache_enabled", True)
+    LLMResponseCache().clear()
+    _upsert_tenant_llm_config(client, headers)
+    class_id = _create_class(client, headers, "cached_profile", "缓存画像")
+    attr_id = _create_attribute(client, headers, "cached_mobile", "手机号")
+    _bind_attribute(client, headers, class_id, attr_id)
+    _create_capability(client, headers, class_id, "query_cached_user", "查询用户")
+    client.post(f"/api/v1/ontology/classes/{class_id}/table-binding:create-table", headers=headers)
+
+    anchor_events = []
+    for _ in range(2):
+        session_id = client.post(
+            "/api/v1/reasoning/sessions",
+            headers=headers,
+            json={"user_input": "请根据手机号查询用户信息", "metadata": {}},
+        ).json()["data"]["session_id"]
+        run_body = client.post(f"/api/v1/reasoning/sessions/{session_id}/run", headers=headers, json={}).json()
+        assert run_body["data"]["status"] == "completed"
+        trace_items = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()["data"]["items"]
+        anchor_events.append(
+            [
+                item["payload"]
+                for item in trace_items
+                if item["event_type"] == "llm_response_received"
+                and item["payload"].get("task") == "anchor_ontology_selection"
+            ][0]
+        )
+    LLMResponseCache().clear()
+
+    assert anchor_events[0]["cache_hit"] is False
+    assert anchor_events[1]["cache_hit"] is True
+
+
+def test_reasoning_clarification_resumes_from_checkpoint(client: TestClient, headers: dict, mock_reasoning_llm):
+    _upsert_tenant_llm_config(client, headers)
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我查一下", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+
+    run_body = client.post(f"/api/v1/reasoning/sessions/{session_id}/run", headers=headers, json={}).json()
+    assert run_body["data"]["status"] == "waiting_clarification"
+    assert run_body["data"]["clarification"]["question"]["type"] == "no_attribute_match"
+
+    class_id = _create_class(client, headers, "resume_profile", "恢复画像")
+    attr_id = _create_attribute(client, headers, "resume_mobile", "手机号")
+    _bind_attribute(client, headers, class_id, attr_id)
+    _create_capability(client, headers, class_id, "query_resume_user", "查询用户")
+    client.post(f"/api/v1/ontology/classes/{class_id}/table-binding:create-table", headers=headers)
+
+    clarify_body = client.post(
+        f"/api/v1/reasoning/sessions/{session_id}/clarify",
+        headers=headers,
+        json={"answer": {"keyword": "手机号"}},
+    ).json()
+    assert clarify_body["data"]["status"] == "created"
+
+    resumed_body = client.post(f"/api/v1/reasoning/sessions/{session_id}/run", headers=headers, json={}).json()
+    assert resumed_body["code"] == 0
+    assert resumed_body["data"]["status"] == "completed"
+
+    trace_items = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()["data"]["items"]
+    intent_prompts = [
+        item
+        for item in trace_items
+        if item["event_type"] == "llm_prompt_sent" and item["payload"].get("task") == "intent_extraction"
+    ]
+    assert len(intent_prompts) == 1
+    resume_events = [item for item in trace_items if item["step"] == "resume"]
+    assert resume_events[0]["payload"]["resume_node"] == "discover_candidates"
+    assert "手机号" in resume_events[0]["payload"]["answer_keywords"]
+
+
+def test_reasoning_context_latest_flag_tracks_newest_value(client: TestClient, headers: dict):
+    from src.app.infra.db.session import SessionLocal
+    from src.app.services.context_service import ContextService
+
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我处理一下", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+
+    db = SessionLocal()
+    try:
+        service = ContextService(db)
+        service.write(session_id, "session", "traversal_state", {"depth": 0})
+        service.write(session_id, "session", "traversal_state", {"depth": 1})
+        service.write(session_id, "artifact", "traversal_state", {"depth": 9})
+        db.commit()
+
+        latest = service.read_latest(session_id, "traversal_state", ["session"])
+        assert latest["value"] == {"depth": 1}
+        assert latest["version"] == 2
+
+        history = [item for item in service.read(session_id, ["session"]) if item["key"] == "traversal_state"]
+        assert [item["value"]["depth"] for item in history] == [0, 1]
+        assert [item["is_latest"] for item in history] == [False, True]
+    finally:
+        db.close()
+
+
+def test_trace_events_are_buffered_until_commit_and_survive_rollback(client: TestClient, headers: dict):
+    from src.app.infra.db.session import SessionLocal
+    from src.app.services.trace_service import TraceService
+
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我处理一下", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+
+    def _event_steps() -> list[str]:
+        trace_resp = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers)
+        return [item["step"] for item in trace_resp.json()["data"]["items"] if item["step"].startswith("buffer")]
+
+    db = SessionLocal()
+    try:
+        trace_service = TraceService(db)
+        trace_service.emit(session_id, None, "buffer_1", "plan_generated", {}, None)
+        trace_service.emit(session_id, None, "buffer_2", "plan_generated", {}, None)
+        trace_service.flush()
+        db.rollback()
+        trace_service.emit(session_id, None, "buffer_3", "plan_generated", {}, None)
+        assert _event_steps() == []
+        db.commit()
+    finally:
+        db.close()
+    assert _event_steps() == ["buffer_1", "buffer_2", "buffer_3"]
+
+
+def test_reasoning_trace_events_paginate_project_and_stream(client: TestClient, headers: dict, mock_reasoning_llm):
+    _upsert_tenant_llm_config(client, headers)
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我处理一下", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+    client.post(f"/api/v1/reasoning/sessions/{session_id}/run", headers=headers, json={})
+
+    full_items = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()["data"]["items"]
+    assert len(full_items) > 3
+
+    paged = []
+    after_id = 0
+    while True:
+        page = client.get(
+            f"/api/v1/reasoning/sessions/{session_id}/trace/events",
+            headers=headers,
+            params={"after_id": after_id, "limit": 3},
+        ).json()["data"]
+        assert all("payload" not in item for item in page["items"])
+        paged.extend(page["items"])
+        if not page["has_more"]:
+            break
+        after_id = page["next_after_id"]
+    assert [item["id"] for item in paged] == [item["id"] for item in full_items]
+
+    filtered = client.get(
+        f"/api/v1/reasoning/sessions/{session_id}/trace/events",
+        headers=headers,
+        params={"event_type": "llm_prompt_sent", "fields": "event_type,payload"},
+    ).json()["data"]["items"]
+    assert filtered
+    assert all(set(item) == {"id", "event_type", "payload"} for item in filtered)
+
+    detail = client.get(
+        f"/api/v1/reasoning/sessions/{session_id}/trace/events/{full_items[0]['id']}",
+        headers=headers,
+    ).json()["data"]
+    assert detail["payload"] == full_items[0]["payload"]
+
+    bad_fields = client.get(
+        f"/api/v1/reasoning/sessions/{session_id}/trace/events",
+        headers=headers,
+        params={"fields": "secret"},
+    )
+    assert bad_fields.json()["code"] != 0
+
+    stream_resp = client.get(
+        f"/api/v1/reasoning/sessions/{session_id}/trace/events:stream",
+        headers=headers,
+        params={"after_id": full_items[1]["id"]},
+    )
+    assert stream_resp.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line) for line in stream_resp.text.splitlines() if line]
+    assert [item["id"] for item in streamed] == [item["id"] for item in full_items[2:]]
+
+
+def test_trace_payloads_compress_and_retention_tiers_apply(client: TestClient, headers: dict):
+    from datetime import timedelta
+
+    from src.app.infra.db import models
+    from src.app.infra.db.session import SessionLocal
+    from src.app.services.trace_service import TraceService
+
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我处理一下", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+    large_payload = {"model": "deepseek-chat", "content": "本体" * 5000}
+
+    db = SessionLocal()
+    try:
+        trace_service = TraceService(db)
+        trace_service.emit(session_id, None, "retention_old", "llm_response_received", large_payload, None)
+        trace_service.emit(session_id, None, "retention_stale", "plan_generated", {"k": 1}, None)
+        trace_service.emit(session_id, None, "retention_new", "plan_generated", {"k": 2}, None)
+        db.commit()
+        rows = {row.step: row for row in db.query(models.ReasoningTraceEvent).filter_by(session_id=session_id)}
+        assert rows["retention_old"].payload_codec in {"zstd", "gzip"}
+        assert len(rows["retention_old"].payload_blob) < len(large_payload["content"])
+        assert rows["retention_new"].payload_codec is None
+        rows["retention_old"].created_at -= timedelta(days=10)
+        rows["retention_stale"].created_at -= timedelta(days=40)
+        db.commit()
+    finally:
+        db.close()
+
+    items = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()["data"]["items"]
+    assert {item["step"]: item["payload"] for item in items}["retention_old"] == large_payload
+
+    # Retention is opt-in: without a tenant config nothing is touched.
+    run_resp = client.post("/api/v1/config/tenant-trace-retention/run", headers=headers)
+    assert run_resp.json()["data"]["deleted"] == 0
+    assert run_resp.json()["data"]["summarized"] == 0
+
+    client.put(
+        "/api/v1/config/tenant-trace-retention",
+        headers=headers,
+        json={"summarize_after_days": 7, "delete_after_days": 30},
+    )
+    run_resp = client.post("/api/v1/config/tenant-trace-retention/run", headers=headers)
+    assert run_resp.json()["data"]["deleted"] == 1
+    assert run_resp.json()["data"]["summarized"] == 1
+
+    items = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()["data"]["items"]
+    payloads = {item["step"]: item["payload"] for item in items if item["step"].startswith("retention")}
+    assert set(payloads) == {"retention_old", "retention_new"}
+    assert payloads["retention_old"]["_summary"] is True
+    assert payloads["retention_old"]["model"] == "deepseek-chat"
+    assert "content" not in payloads["retention_old"]
+    assert payloads["retention_new"] == {"k": 2}
+
+
+def test_trace_retention_sweep_covers_active_tenants(client: TestClient, headers: dict):
+    from datetime import timedelta
+
+    from src.app.infra.db import models
+    from src.app.infra.db.session import SessionLocal
+    from src.app.services.active_tenant_service import ActiveTenantService
+    from src.app.services.trace_retention_service import run_retention_for_active_tenants
+    from src.app.services.trace_service import TraceService
+
+    create_resp = client.post(
+        "/api/v1/reasoning/sessions",
+        headers=headers,
+        json={"user_input": "帮我处理一下", "metadata": {}},
+    )
+    session_id = create_resp.json()["data"]["session_id"]
+
+    db = SessionLocal()
+    try:
+        ActiveTenantService(db).touch(headers["X-Tenant-Id"])
+        TraceService(db).emit(session_id, None, "retention_sweep", "plan_generated", {"k": 1}, None)
+        db.commit()
+        row = db.query(models.ReasoningTraceEvent).filter_by(session_id=session_id, step="retention_sweep").one()
+        row.created_at -= timedelta(days=40)
+        db.commit()
+    finally:
+        db.close()
+
+    assert run_retention_for_active_tenants() >= 1
+    items = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()["data"]["items"]
+    assert "retention_sweep" in {item["step"] for item in items}
+
+    client.put("/api/v1/config/tenant-trace-retention", headers=headers, json={"delete_after_days": 30})
+    assert run_retention_for_active_tenants() >= 1
+    items = client.get(f"/api/v1/reasoning/sessions/{session_id}/trace", headers=headers).json()["data"]["items"]
+    assert "retention_sweep" not in {item["step"] for item in items}
@@ -398,3 +398,84 @@ def test_active_tenant_registry_tracks_seen_tenants(client: TestClient, headers:
     assert "tenant-a" in tenant_ids
     assert "tenant-b" in tenant_ids
 
+
+def test_active_tenant_touch_is_deferred_until_flush(client: TestClient, headers: dict):
+    from src.app.infra.db import models
+    from src.app.infra.db.session import SessionLocal
+    from src.app.services.active_tenant_service import ActiveTenantTracker
+
+    ActiveTenantTracker.drain()
+    tenant_c = dict(headers)
+    tenant_c["X-Tenant-Id"] = "tenant-c"
+    for _ in range(3):
+        assert client.get("/api/v1/config/tenant-search-config", headers=tenant_c).status_code == 200
+
+    db = SessionLocal()
+    try:
+        assert db.query(models.ActiveTenant).filter_by(tenant_id="tenant-c").count() == 0
+        assert ActiveTenantTracker.flush() == 1
+        assert db.query(models.ActiveTenant).filter_by(tenant_id="tenant-c").count() == 1
+        assert ActiveTenantTracker.flush() == 0
+    finally:
+        db.close()
+
+    ActiveTenantTracker.record("tenant-c")
+    assert ActiveTenantTracker.flush() == 1
+
+
+def test_active_tenant_bulk_touch_never_moves_last_seen_back(client: TestClient, headers: dict):
+    from datetime import timedelta
+
+    from src.app.infra.db import models
+    from src.app.infra.db.session import SessionLocal
+    from src.app.repositories.config_repo import ActiveTenantRepository
+
+    newer = models.now()
+    db = SessionLocal()
+    try:
+        repo = ActiveTenantRepository(db)
+        repo.bulk_touch({"tenant-d": newer})
+        db.commit()
+        # A slower worker flushes an older in-memory timestamp afterwards.
+        repo.bulk_touch({"tenant-d": newer - timedelta(minutes=5)})
+        db.commit()
+        db.expire_all()
+        assert repo.get("tenant-d").last_seen_at.replace(tzinfo=None) == newer.replace(tzinfo=None)
+    finally:
+        db.close()
+
+
+def test_tenant_llm_runtime_config_is_cached_until_upsert(client: TestClient, headers: dict, monkeypatch):
+    from src.app.infra.db.session import SessionLocal
+    from src.app.services.tenant_llm_config_service import TenantLLMConfigService
+
+    def _put(model: str) -> None:
+        resp = client.put(
+            "/api/v1/config/tenant-llm",
+            headers=headers,
+            json={"provider": "deepseek", "model": model, "api_key": "sk-cache-test", "status": 1},
+        )
+        assert resp.json()["code"] == 0
+
+    _put("deepseek-chat")
+    decrypts = []
+    original_decrypt = TenantLLMConfigService._resolve_provider_api_key_plain
+
+    def _counting(self, obj, provider):
+        decrypts.append(provider)
+        return original_decrypt(self, obj, provider)
+
+    monkeypatch.setattr(TenantLLMConfigService, "_resolve_provider_api_key_plain", _counting)
+    db = SessionLocal()
+    try:
+        first = TenantLLMConfigService(db).get_runtime_config("tenant-a")
+        first["extra_json"]["mutated"] = True
+        second = TenantLLMConfigService(db).get_runtime_config("tenant-a")
+        assert second["api_key"] == "sk-cache-test"
+        assert "mutated" not in second["extra_json"]
+        assert len(decrypts) == 2
+
+        _put("deepseek-reasoner")
+        assert TenantLLMConfigService(db).get_runtime_config("tenant-a")["model"] == "deepseek-reasoner"
+    finally:
+        db.close()
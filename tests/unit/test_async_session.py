@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from src.app.core.config import settings
+from src.app.infra.db import async_session
+from src.app.infra.db.async_session import ThreadedAsyncSession, async_database_url, dispose_async_engine, get_async_db
+from src.app.repositories.ontology_repo import AsyncOntologyRepository
+
+
+def test_async_database_url_maps_only_async_capable_drivers():
+    url = async_database_url("postgresql+psycopg://user:pw@db:5432/app")
+    assert url.drivername == "postgresql+psycopg_async"
+    assert url.database == "app"
+    assert async_database_url("sqlite+aiosqlite:///./x.db").drivername == "sqlite+aiosqlite"
+    assert async_database_url("sqlite+pysqlite:///./x.db") is None
+    assert async_database_url("postgresql+psycopg2://user:pw@db/app") is None
+
+
+def test_async_session_path_reads_rows_and_proactor_loop_falls_back(client, headers, monkeypatch):
+    pytest.importorskip("greenlet")
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    attr_id = client.post(
+        "/api/v1/ontology/data-attributes",
+        headers=headers,
+        json={"code": "name", "name": "姓名", "data_type": "string"},
+    ).json()["data"]["attribute_id"]
+    monkeypatch.setattr(settings, "database_url", settings.database_url.replace("+pysqlite", "+aiosqlite"))
+    monkeypatch.setattr(async_session, "_state", {"resolved": False, "engine": None, "factory": None})
+
+    async def _sessions():
+        seen = []
+        async for db in get_async_db():
+            items = await AsyncOntologyRepository(db).list_all_attributes(headers["X-Tenant-Id"])
+            seen.append((type(db), [item.id for item in items]))
+        monkeypatch.setattr(asyncio, "ProactorEventLoop", type(asyncio.get_running_loop()), raising=False)
+        async for db in get_async_db():
+            seen.append((type(db), None))
+        await dispose_async_engine()
+        return seen
+
+    real, fallback = asyncio.run(_sessions())
+    assert real == (AsyncSession, [attr_id])
+    assert fallback == (ThreadedAsyncSession, None)
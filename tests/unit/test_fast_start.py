@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src.app import main as main_module
+from src.app.core.config import settings
+from src.app.core.lazy_imports import DEFERRED_MODULES
+from src.app.infra.db.base import Base
+
+
+def test_importing_app_does_not_load_llm_sdks():
+    code = (
+        "import sys\n"
+        "import src.app.main\n"
+        f"print(','.join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))\n"
+    )
+    env = {**os.environ, "TW_DATABASE_URL": "sqlite+pysqlite:///:memory:"}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[2],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_startup_skips_runtime_ddl_at_alembic_head(monkeypatch):
+    calls = []
+    monkeypatch.setattr(settings, "fast_start_enabled", True)
+    monkeypatch.setattr(main_module, "_database_revision", lambda: main_module._alembic_head_revision())
+    monkeypatch.setattr(main_module, "_ensure_runtime_schema", lambda: calls.append("ddl"))
+    monkeypatch.setattr(Base.metadata, "create_all", lambda **kwargs: calls.append("create_all"))
+    main_module.startup()
+    try:
+        assert calls == []
+        assert main_module.app.state.startup_report["schema_mode"] == "alembic_head"
+
+        # The test database is never stamped by alembic, so the DDL path still runs there.
+        monkeypatch.setattr(main_module, "_database_revision", lambda: None)
+        main_module.startup()
+        assert calls == ["create_all", "ddl"]
+        assert main_module.app.state.startup_report["schema_mode"] == "runtime_ddl"
+    finally:
+        main_module.stop_invalidation_listener()
+
+
+def test_startup_report_endpoint(client, headers):
+    body = client.get("/api/v1/startup-report", headers=headers).json()
+    assert body["code"] == 0
+    assert body["data"]["app_import_ms"] > 0
+    assert isinstance(body["data"]["lazy_import_ms"], dict)
+    assert client.get("/api/v1/startup-report").status_code == 422
@@ -85,3 +85,25 @@ def test_sparse_overrides_take_effect():
     ]
     result = HybridRetrievalEngine.score_records(query, data, w_sparse=1.0, w_dense=0.0, sparse_overrides=[0.1, 0.9])
     assert result[0]["attribute_id"] == 2
+
+
+def test_top_scored_records_matches_full_sort_path():
+    words = ["address", "customer", "order", "invoice", "address book", "customer address"]
+    data = [{"id": idx, "search_text": words[idx % len(words)], "embedding": []} for idx in range(40)]
+    for top_n, gap, relative in [(5, 0.0, 0.0), (12, 0.05, 0.0), (40, 0.0, 0.5), (3, 1.0, 0.9)]:
+        expected = HybridRetrievalEngine.apply_top_n_and_gap(
+            HybridRetrievalEngine.score_records("customer address", data, w_sparse=1.0, w_dense=0.0),
+            top_n=top_n,
+            score_gap=gap,
+            relative_diff=relative,
+        )
+        result = HybridRetrievalEngine.top_scored_records(
+            "customer address",
+            data,
+            top_n=top_n,
+            score_gap=gap,
+            relative_diff=relative,
+            w_sparse=1.0,
+            w_dense=0.0,
+        )
+        assert result == expected
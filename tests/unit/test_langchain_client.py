@@ -0,0 +1,150 @@
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+
+from src.app.services.llm.langchain_client import LangChainLLMClient, llm_token_sink
+
+
+class _FakeStreamingLLM:
+    def __init__(self, parts: list[str]):
+        self.parts = parts
+        self.invoke_count = 0
+
+    def stream(self, messages):
+        for part in self.parts:
+            yield AIMessageChunk(content=part)
+
+    def invoke(self, messages):
+        self.invoke_count += 1
+        return AIMessage(content="".join(self.parts))
+
+
+def _messages():
+    return [SystemMessage(content="s"), HumanMessage(content="u")]
+
+
+def test_invoke_text_streams_tokens_to_sink():
+    llm = _FakeStreamingLLM(['{"a"', ": 1}"])
+    tokens = []
+    with llm_token_sink(tokens.append):
+        text = LangChainLLMClient._invoke_text(llm=llm, runtime_cfg={}, model_kwargs={}, messages=_messages())
+    assert tokens == ['{"a"', ": 1}"]
+    assert text == '{"a": 1}'
+    assert llm.invoke_count == 0
+
+
+def test_invoke_text_without_sink_uses_invoke():
+    llm = _FakeStreamingLLM(["ok"])
+    text = LangChainLLMClient._invoke_text(llm=llm, runtime_cfg={}, model_kwargs={}, messages=_messages())
+    assert text == "ok"
+    assert llm.invoke_count == 1
+
+
+class _FakeStructuredLLM:
+    def __init__(self, replies: list):
+        self.replies = list(replies)
+        self.bound = []
+        self.prompts = []
+
+    def bind(self, **kwargs):
+        self.bound.append(kwargs)
+        return self
+
+    def bind_tools(self, tools, **kwargs):
+        self.bound.append({"tools": tools, **kwargs})
+        return self
+
+    def invoke(self, messages):
+        self.prompts.append(messages)
+        return self.replies.pop(0)
+
+
+def test_invoke_json_uses_json_object_mode_and_repairs_once(monkeypatch):
+    llm = _FakeStructuredLLM([AIMessage(content='{"keywords": "手机号"'), AIMessage(content='{"keywords": ["手机号"]}')])
+    monkeypatch.setattr(LangChainLLMClient, "_build_llm", staticmethod(lambda cfg: (llm, {})))
+    events = []
+
+    result = LangChainLLMClient.invoke_json(
+        runtime_cfg={"provider": "deepseek", "model": "m-json"},
+        system_prompt="s",
+        user_payload={"query": "q" * 50},
+        schema_hint={"keywords": ["手机号"]},
+        audit_callback=lambda event, payload: events.append(event),
+    )
+    assert result == {"keywords": ["手机号"]}
+    assert llm.bound == [{"response_format": {"type": "json_object"}}]
+    assert "llm_json_repair" in events
+    repair_prompt = llm.prompts[1][1].content
+    assert "q" * 50 not in repair_prompt
+    assert '{"keywords": "手机号"' in repair_prompt
+
+
+def test_invoke_json_tool_mode_reads_tool_call_args(monkeypatch):
+    from src.app.core.config import settings
+
+    monkeypatch.setattr(settings, "llm_structured_output_mode", "tool")
+    reply = AIMessage(content="", tool_calls=[{"name": "submit_decision", "args": {"action": "execute"}, "id": "c1"}])
+    llm = _FakeStructuredLLM([reply])
+    monkeypatch.setattr(LangChainLLMClient, "_build_llm", staticmethod(lambda cfg: (llm, {})))
+
+    result = LangChainLLMClient.invoke_json(
+        runtime_cfg={"provider": "qwen", "model": "m-tool"},
+        system_prompt="s",
+        user_payload={},
+        schema_hint={"action": "execute_capability"},
+    )
+    assert result == {"action": "execute"}
+    assert llm.bound[0]["tools"][0]["function"]["parameters"]["properties"]["action"] == {"type": "string"}
+
+
+class _BadRequest(Exception):
+    status_code = 400
+
+
+class _RejectingLLM(_FakeStructuredLLM):
+    def __init__(self, replies: list, error: Exception):
+        super().__init__(replies)
+        self.error = error
+        self._binding = False
+
+    def bind(self, **kwargs):
+        self._binding = True
+        return super().bind(**kwargs)
+
+    def invoke(self, messages):
+        if self._binding:
+            self._binding = False
+            raise self.error
+        return super().invoke(messages)
+
+
+def test_structured_output_downgrade_needs_a_matching_400_and_expires(monkeypatch):
+    from src.app.core.config import settings
+    from src.app.services.llm import langchain_client as client_module
+
+    monkeypatch.setattr(client_module, "_STRUCTURED_OUTPUT_UNSUPPORTED", {})
+    runtime_cfg = {"provider": "deepseek", "model": "m-downgrade"}
+    llm = _RejectingLLM([], _BadRequest("maximum context length exceeded"))
+    monkeypatch.setattr(LangChainLLMClient, "_build_llm", staticmethod(lambda cfg: (llm, {})))
+    with pytest.raises(_BadRequest):
+        LangChainLLMClient.invoke_json(runtime_cfg=runtime_cfg, system_prompt="s", user_payload={}, schema_hint={})
+    assert LangChainLLMClient._structured_output_mode(runtime_cfg) == "json_object"
+
+    events = []
+    llm = _RejectingLLM([AIMessage(content='{"ok": true}')], _BadRequest("'response_format' is not supported"))
+    monkeypatch.setattr(LangChainLLMClient, "_build_llm", staticmethod(lambda cfg: (llm, {"temperature": 0})))
+    result = LangChainLLMClient.invoke_json(
+        runtime_cfg=runtime_cfg,
+        system_prompt="s",
+        user_payload={},
+        schema_hint={},
+        audit_callback=lambda event, payload: events.append((event, payload)),
+    )
+    assert result == {"ok": True}
+    prompts = [payload for event, payload in events if event == "llm_prompt_sent"]
+    assert [payload["structured_output_mode"] for payload in prompts] == ["json_object", "prompt"]
+    assert all(payload["model_kwargs"] == {"temperature": 0} for payload in prompts)
+    assert LangChainLLMClient._structured_output_mode(runtime_cfg) == "prompt"
+
+    monkeypatch.setattr(settings, "llm_structured_output_downgrade_seconds", 0.0)
+    client_module._STRUCTURED_OUTPUT_UNSUPPORTED[LangChainLLMClient._structured_output_route(runtime_cfg)] = 0.0
+    assert LangChainLLMClient._structured_output_mode(runtime_cfg) == "json_object"
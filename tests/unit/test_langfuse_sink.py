@@ -1,3 +1,5 @@
+import threading
+
 from src.app.services.observability import langfuse_sink as sink_module
 from src.app.services.observability.runtime_config import replace_langfuse_runtime_config
 
@@ -45,6 +47,7 @@ def test_langfuse_sink_emits_trace_and_event(monkeypatch):
         event_type="task_planned",
         payload={"foo": "bar"},
     )
+    assert sink.flush(timeout=5)
 
     assert sink._disabled is False
     assert sink._client is not None
@@ -53,3 +56,39 @@ def test_langfuse_sink_emits_trace_and_event(monkeypatch):
     assert len(sink._client.events) == 1
     assert sink._client.events[0]["trace_id"] == "trace-1"
     assert sink._client.flush_count == 1
+
+
+def test_langfuse_sink_drops_events_when_queue_is_full(monkeypatch):
+    replace_langfuse_runtime_config({"enabled": True, "public_key": "pk-test", "secret_key": "sk-test"})
+    entered = threading.Event()
+    release = threading.Event()
+
+    class _BlockingLangfuse(_FakeLangfuse):
+        def trace(self, **kwargs):
+            entered.set()
+            release.wait(timeout=5)
+            return super().trace(**kwargs)
+
+    monkeypatch.setattr(sink_module, "Langfuse", _BlockingLangfuse)
+    monkeypatch.setattr(sink_module, "_LANGFUSE_IMPORT_ERROR", None)
+    monkeypatch.setattr(sink_module.settings, "langfuse_export_queue_size", 1)
+    sink_module.LangfuseSink._instance = None
+
+    sink = sink_module.LangfuseSink()
+    event_kwargs = {"tenant_id": "t", "session_id": "s", "trace_id": "tr", "step": "x", "event_type": "task_planned"}
+    sink.emit_event(**event_kwargs, payload={"n": 1})
+    assert entered.wait(timeout=5)
+    queued_payload = {"n": "queued"}
+    sink.emit_event(**event_kwargs, payload=queued_payload)
+    sink.emit_event(**event_kwargs, payload={"n": 3})
+    assert sink.stats()["dropped"] == 1
+    # The caller may keep mutating its dict; the queued event must not change with it.
+    queued_payload["n"] = "mutated"
+
+    release.set()
+    assert sink.flush(timeout=5)
+    assert len(sink._client.traces) == 2
+    exported = str(sink._client.traces[1]["metadata"]["payload"])
+    assert "queued" in exported
+    assert "mutated" not in exported
+    sink.shutdown()
@@ -0,0 +1,29 @@
+from src.app.services.llm.client_registry import LLMClientRegistry
+
+_RUNTIME_CFG = {
+    "tenant_id": "tenant-pool",
+    "provider": "deepseek",
+    "model": "deepseek-chat",
+    "api_key": "sk-test",
+    "base_url": "https://api.deepseek.com",
+    "timeout_ms": 30000,
+}
+
+
+def test_chat_models_are_reused_per_tenant_route():
+    LLMClientRegistry.invalidate_tenant("tenant-pool")
+    first = LLMClientRegistry.get_chat_model(_RUNTIME_CFG, {})
+    assert LLMClientRegistry.get_chat_model(dict(_RUNTIME_CFG), {}) is first
+
+    rotated = LLMClientRegistry.get_chat_model({**_RUNTIME_CFG, "api_key": "sk-rotated"}, {})
+    assert rotated is not first
+
+    LLMClientRegistry.invalidate_tenant("tenant-pool")
+    assert LLMClientRegistry.get_chat_model({**_RUNTIME_CFG, "api_key": "sk-rotated"}, {}) is not rotated
+    LLMClientRegistry.invalidate_tenant("tenant-pool")
+
+
+def test_http_client_is_shared_per_endpoint():
+    client = LLMClientRegistry.get_http_client("https://api.deepseek.com/")
+    assert LLMClientRegistry.get_http_client("https://api.deepseek.com") is client
+    assert LLMClientRegistry.get_http_client("https://dashscope.aliyuncs.com/compatible-mode/v1") is not client
@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from src.app.core.config import settings
+from src.app.services.llm.langchain_client import llm_token_sink
+from src.app.services.llm.request_policy import (
+    LLMPolicyError,
+    LLMRequestPolicy,
+    circuit_allows,
+    record_failure,
+    reset_policy_state,
+)
+
+_RUNTIME_CFG = {
+    "provider": "deepseek",
+    "model": "deepseek-reasoner",
+    "api_key": "k-primary",
+    "base_url": None,
+    "timeout_ms": 30000,
+    "fallback_provider": "qwen",
+    "fallback_model": "qwen3.5-plus",
+    "fallback_api_key": "k-fallback",
+}
+
+
+@pytest.fixture(autouse=True)
+def _reset_policy():
+    reset_policy_state()
+    yield
+    reset_policy_state()
+
+
+def test_failover_uses_fallback_and_opens_circuit(monkeypatch):
+    monkeypatch.setattr(settings, "llm_request_policy", "failover")
+    monkeypatch.setattr(settings, "llm_circuit_failure_threshold", 2)
+    calls = []
+    events = []
+
+    def _call(cfg, callback):
+        calls.append(cfg["provider"])
+        if cfg["provider"] == "deepseek":
+            raise TimeoutError("primary timed out")
+        return {"provider": cfg["provider"], "api_key": cfg["api_key"]}
+
+    for _ in range(2):
+        result = LLMRequestPolicy.invoke(_RUNTIME_CFG, _call, lambda event, payload: events.append(event))
+        assert result == {"provider": "qwen", "api_key": "k-fallback"}
+    assert calls == ["deepseek", "qwen", "deepseek", "qwen"]
+    assert events.count("llm_fallback_triggered") == 2
+
+    assert circuit_allows(_RUNTIME_CFG) is False
+    calls.clear()
+    LLMRequestPolicy.invoke(_RUNTIME_CFG, _call)
+    assert calls == ["qwen"]
+
+
+def test_failover_reports_fallback_failure(monkeypatch):
+    monkeypatch.setattr(settings, "llm_request_policy", "failover")
+
+    def _call(cfg, callback):
+        raise RuntimeError(f"{cfg['provider']} down")
+
+    with pytest.raises(LLMPolicyError) as exc_info:
+        LLMRequestPolicy.invoke(_RUNTIME_CFG, _call)
+    assert exc_info.value.fallback_used is True
+
+
+def test_hedge_takes_first_answer_and_replays_winner_events(monkeypatch):
+    monkeypatch.setattr(settings, "llm_request_policy", "hedge")
+    monkeypatch.setattr(settings, "llm_hedge_default_delay_ms", 50)
+    events = []
+
+    def _call(cfg, callback):
+        callback("llm_prompt_sent", {"provider": cfg["provider"]})
+        if cfg["provider"] == "deepseek":
+            time.sleep(0.5)
+        return {"provider": cfg["provider"]}
+
+    result = LLMRequestPolicy.invoke(_RUNTIME_CFG, _call, lambda event, payload: events.append((event, payload)))
+    assert result == {"provider": "qwen"}
+    assert events[0] == ("llm_prompt_sent", {"provider": "qwen"})
+    assert events[-1][0] == "llm_hedge_resolved"
+    assert events[-1][1]["winner"] == "fallback"
+    assert events[-1][1]["hedged"] is True
+
+
+def test_hedge_streams_only_the_winning_route_tokens(monkeypatch):
+    monkeypatch.setattr(settings, "llm_request_policy", "hedge")
+    monkeypatch.setattr(settings, "llm_hedge_default_delay_ms", 50)
+    tokens = []
+
+    def _call(cfg, callback):
+        from src.app.services.llm.langchain_client import current_token_sink
+
+        sink = current_token_sink()
+        for index in range(3):
+            sink(f"{cfg['provider']}-{index}")
+            if cfg["provider"] == "deepseek":
+                time.sleep(0.2)
+        return {"provider": cfg["provider"]}
+
+    with llm_token_sink(tokens.append):
+        result = LLMRequestPolicy.invoke(_RUNTIME_CFG, _call)
+    assert result == {"provider": "qwen"}
+    assert tokens == ["qwen-0", "qwen-1", "qwen-2"]
+
+
+def test_hedge_check_does_not_claim_fallback_half_open_probe(monkeypatch):
+    monkeypatch.setattr(settings, "llm_request_policy", "hedge")
+    monkeypatch.setattr(settings, "llm_circuit_failure_threshold", 1)
+    monkeypatch.setattr(settings, "llm_circuit_reset_seconds", 0.05)
+    monkeypatch.setattr(settings, "llm_hedge_default_delay_ms", 1000)
+    fallback_cfg = LLMRequestPolicy.fallback_runtime_config(_RUNTIME_CFG)
+    record_failure(fallback_cfg)
+    time.sleep(0.06)
+
+    result = LLMRequestPolicy.invoke(_RUNTIME_CFG, lambda cfg, callback: {"provider": cfg["provider"]})
+    assert result == {"provider": "deepseek"}
+    # The probe is still available to the first real fallback attempt.
+    assert circuit_allows(fallback_cfg) is True
+
+
+def test_policy_off_never_calls_fallback(monkeypatch):
+    monkeypatch.setattr(settings, "llm_request_policy", "off")
+
+    def _call(cfg, callback):
+        raise RuntimeError("primary down")
+
+    with pytest.raises(LLMPolicyError) as exc_info:
+        LLMRequestPolicy.invoke(_RUNTIME_CFG, _call)
+    assert exc_info.value.fallback_used is False
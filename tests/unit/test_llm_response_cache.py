@@ -0,0 +1,68 @@
+from src.app.core.config import settings
+from src.app.services.llm.response_cache import LLMResponseCache
+from src.app.services.ontology_version import get_ontology_version
+
+_RUNTIME_CFG = {"provider": "deepseek", "model": "deepseek-reasoner"}
+
+
+def _key(tenant_id: str, query: str) -> str:
+    return LLMResponseCache.build_key(
+        tenant_id,
+        _RUNTIME_CFG,
+        "anchor_ontology_selection",
+        "system",
+        {"query": query},
+        {"input_ontology_codes": []},
+    )
+
+
+def test_response_cache_hit_and_lru_eviction(monkeypatch):
+    monkeypatch.setattr(settings, "llm_response_cache_max_entries", 2)
+    cache = LLMResponseCache()
+    cache.clear()
+
+    cache.put(_key("tenant-x", "q1"), {"input_ontology_codes": ["a"]})
+    cache.put(_key("tenant-x", "q2"), {"input_ontology_codes": ["b"]})
+    hit = cache.get(_key("tenant-x", "q1"))
+    assert hit == {"input_ontology_codes": ["a"]}
+    hit["input_ontology_codes"].append("mutated")
+    assert cache.get(_key("tenant-x", "q1")) == {"input_ontology_codes": ["a"]}
+
+    cache.put(_key("tenant-x", "q3"), {"input_ontology_codes": ["c"]})
+    assert cache.get(_key("tenant-x", "q2")) is None
+    assert cache.get(_key("tenant-x", "q1")) is not None
+    cache.clear()
+
+
+def test_response_cache_ttl_expiry(monkeypatch):
+    monkeypatch.setattr(settings, "llm_response_cache_ttl_seconds", 1)
+    cache = LLMResponseCache()
+    cache.clear()
+    key = _key("tenant-x", "ttl")
+
+    clock = {"now": 1000.0}
+    monkeypatch.setattr("src.app.services.llm.response_cache.time.monotonic", lambda: clock["now"])
+    cache.put(key, {"ok": True})
+    assert cache.get(key) == {"ok": True}
+    clock["now"] += 2
+    assert cache.get(key) is None
+    cache.clear()
+
+
+def test_ontology_change_bumps_version_and_invalidates(client, headers):
+    cache = LLMResponseCache()
+    cache.clear()
+    before_version = get_ontology_version("tenant-a")
+    key = _key("tenant-a", "q")
+    cache.put(key, {"input_ontology_codes": ["a"]})
+    other_key = _key("tenant-b", "q")
+    cache.put(other_key, {"input_ontology_codes": ["b"]})
+
+    resp = client.post("/api/v1/ontology/classes", headers=headers, json={"code": "cache_probe", "name": "Probe"})
+    assert resp.json()["code"] == 0
+
+    assert get_ontology_version("tenant-a") != before_version
+    assert cache.get(key) is None
+    assert _key("tenant-a", "q") != key
+    assert cache.get(other_key) == {"input_ontology_codes": ["b"]}
+    cache.clear()
@@ -0,0 +1,55 @@
+from src.app.core.config import settings
+from src.app.services.llm.prompt_budget import compact_json, estimate_tokens, fit_prompt_payload
+
+
+def _payload(count: int) -> dict:
+    return {
+        "query": "查询手机号15191445006的自然人",
+        "intent": {"query": "查询手机号15191445006的自然人", "keywords": ["手机号"]},
+        "candidates": [
+            {"code": f"ontology_{idx}", "name": f"本体{idx}", "description": "描述" * 200, "score": idx / 100}
+            for idx in range(count)
+        ],
+    }
+
+
+def test_fit_prompt_payload_truncates_dedupes_and_drops_low_scores(monkeypatch):
+    monkeypatch.setitem(settings.llm_prompt_token_budgets, "anchor_ontology_selection", 600)
+    original = _payload(20)
+
+    payload, stats = fit_prompt_payload("anchor_ontology_selection", "system", original, {"input_ontology_codes": []})
+
+    assert "query" not in payload["intent"]
+    assert all(len(item["description"]) <= settings.llm_prompt_description_max_chars + 1 for item in payload["candidates"])
+    assert 3 <= len(payload["candidates"]) < 20
+    assert payload["candidates"][0]["code"] == "ontology_19"
+    assert stats["dropped_candidates"] == 20 - len(payload["candidates"])
+    assert stats["prompt_tokens_estimate"] < stats["prompt_tokens_original"]
+    assert len(original["candidates"]) == 20
+
+
+def test_fit_prompt_payload_keeps_small_payload_intact():
+    payload, stats = fit_prompt_payload("intent_extraction", "system", {"query": "hello"})
+    assert payload == {"query": "hello"}
+    assert stats["dropped_candidates"] == 0
+    assert stats["over_budget"] is False
+
+
+def test_fit_prompt_payload_leaves_under_budget_payload_unchanged(monkeypatch):
+    monkeypatch.setitem(settings.llm_prompt_token_budgets, "anchor_ontology_selection", 100000)
+    original = _payload(5)
+    original["candidates"].reverse()
+
+    payload, stats = fit_prompt_payload("anchor_ontology_selection", "system", original, {"input_ontology_codes": []})
+
+    assert payload == original
+    assert payload is not original
+    assert stats["deduplicated_fields"] == 0
+    assert stats["truncated_descriptions"] == 0
+    assert stats["prompt_tokens_estimate"] == stats["prompt_tokens_original"]
+
+
+def test_estimate_tokens_counts_cjk_per_char():
+    assert estimate_tokens("手机号") == 3
+    assert estimate_tokens("abcdefgh") == 2
+    assert compact_json({"a": [1, 2]}) == '{"a":[1,2]}'
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from starlette.requests import Request
+
+from src.app.core.response import dumps_json, negotiated_response
+
+
+def _request(accept: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"accept", accept.encode())]})
+
+
+def test_dumps_json_matches_stdlib_shapes():
+    payload = {
+        "created_at": datetime(2026, 10, 19, 8, 30, 1, 250000),
+        "score": Decimal("0.5"),
+        "tags": {"a"},
+        1: "non-str key",
+        "big": 2**70,
+    }
+    decoded = json.loads(dumps_json(payload))
+    assert decoded["created_at"] == "2026-10-19T08:30:01.250000"
+    assert decoded["score"] == 0.5
+    assert decoded["tags"] == ["a"]
+    assert decoded["1"] == "non-str key"
+    assert decoded["big"] == 2**70
+
+
+def test_negotiated_response_honours_msgpack_accept():
+    ormsgpack = pytest.importorskip("ormsgpack")
+    payload = {"code": 0, "message": "ok", "data": {"items": [{"id": 1, "name": "客户"}]}, "trace_id": "t"}
+
+    packed = negotiated_response(_request("application/msgpack"), payload)
+    assert packed.media_type == "application/msgpack"
+    assert ormsgpack.unpackb(packed.body) == payload
+
+    plain = negotiated_response(_request("application/json"), payload, status_code=404)
+    assert plain.status_code == 404
+    assert plain.media_type == "application/json"
+    assert json.loads(plain.body) == payload
+    assert plain.headers["vary"] == "Accept"
@@ -0,0 +1,42 @@
+import json
+
+from src.app.infra import shared_cache
+from src.app.infra.shared_cache import ALL_TENANTS, SharedCache, add_invalidation_handler, handle_invalidation_message
+
+
+def test_shared_cache_is_namespaced_per_tenant_and_lru_bounded():
+    cache = SharedCache("unit-lru", ttl_seconds=60, max_entries=2)
+    cache.set("tenant-a", "k1", {"v": 1})
+    cache.set("tenant-b", "k1", {"v": 2})
+    assert cache.get("tenant-a", "k1") == {"v": 1}
+    assert cache.get("tenant-b", "k1") == {"v": 2}
+
+    cache.set("tenant-a", "k2", {"v": 3})
+    assert cache.get("tenant-a", "k1") is None
+    assert cache.get_or_load("tenant-a", "k1", lambda: {"v": 4}) == {"v": 4}
+
+    cache.invalidate("tenant-a")
+    assert cache.get("tenant-a", "k1") is None
+    assert cache.stats()["l1_hits"] >= 2
+
+
+def test_remote_invalidation_clears_local_tier_and_runs_handlers():
+    cache = SharedCache("unit-remote", ttl_seconds=60)
+    cache.set("tenant-a", "k", [1, 2])
+    cache.set("tenant-b", "k", [3])
+    seen = []
+    add_invalidation_handler("unit-remote", seen.append)
+
+    own = json.dumps({"namespace": "unit-remote", "tenant_id": "tenant-a", "origin": shared_cache._WORKER_ID})
+    assert handle_invalidation_message(own) is False
+    assert cache.get("tenant-a", "k") == [1, 2]
+
+    remote = json.dumps({"namespace": "unit-remote", "tenant_id": "tenant-a", "origin": "other-worker"})
+    assert handle_invalidation_message(remote) is True
+    assert cache.get("tenant-a", "k") is None
+    assert cache.get("tenant-b", "k") == [3]
+    assert seen == ["tenant-a"]
+
+    handle_invalidation_message(json.dumps({"namespace": "unit-remote", "origin": "other-worker"}))
+    assert cache.get("tenant-b", "k") is None
+    assert seen[-1] == ALL_TENANTS